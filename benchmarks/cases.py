@@ -0,0 +1,170 @@
+"""Serializers and payloads for the benchmarks.
+
+Every case builds ``(run, operations)``: ``run()`` validates once and is
+expected to return whether the data was valid, ``operations`` is how many
+payloads one call validates.
+"""
+from __future__ import absolute_import
+
+from request_validator.fields import (CharField, IntField, FloatField, BooleanField, RegexField, DateField,
+                                      DateTimeField)
+from request_validator.serializers import Serializer
+
+PLAN = "plan"
+CODEGEN = "codegen"
+
+
+def with_backend(serializer_class, backend):
+    if backend == PLAN:
+        return serializer_class
+    meta = type("Meta", (object,), {"backend": backend})
+    return type(serializer_class.__name__, (serializer_class,), {"Meta": meta})
+
+
+class Flat5Serializer(Serializer):
+    id = IntField(required=True, min_value=1)
+    name = CharField(required=True, max_length=50)
+    email = CharField(max_length=100)
+    score = FloatField(min_value=0.0, max_value=100.0)
+    active = BooleanField()
+
+
+def flat5_data(index=0):
+    return {"id": index + 1, "name": "user {}".format(index), "email": "user{}@example.com".format(index),
+            "score": 42.5, "active": True}
+
+
+def _flat50_serializer():
+    attrs = {}
+    for i in range(25):
+        attrs["int_{}".format(i)] = IntField(required=True, min_value=0, max_value=1000)
+        attrs["char_{}".format(i)] = CharField(required=True, max_length=20)
+    return type("Flat50Serializer", (Serializer,), attrs)
+
+
+Flat50Serializer = _flat50_serializer()
+
+FLAT50_DATA = dict(("int_{}".format(i), i) for i in range(25))
+FLAT50_DATA.update(("char_{}".format(i), "value {}".format(i)) for i in range(25))
+
+FLAT50_INVALID_DATA = dict(("int_{}".format(i), "x{}".format(i)) for i in range(25))
+FLAT50_INVALID_DATA.update(("char_{}".format(i), i if i % 2 else "y" * 30) for i in range(25))
+
+
+class GlossDefSerializer(Serializer):
+    para = CharField()
+    gloss_see_also = CharField(many=True, source="GlossSeeAlso")
+
+
+class GlossEntrySerializer(Serializer):
+    id = IntField(source="ID")
+    sort_as = CharField(source="SortAs")
+    gloss_term = CharField(source="GlossTerm")
+    acronym = CharField(source="Acronym")
+    abbrev = CharField(source="Abbrev", required=True, allow_blank=False)
+    gloss_def = GlossDefSerializer(source="GlossDef")
+    gloss_see = CharField(source="GlossSee")
+
+
+class GlossListSerializer(Serializer):
+    gloss_entry = GlossEntrySerializer(source="GlossEntry")
+
+
+class GlossDivSerializer(Serializer):
+    title = CharField()
+    gloss_list = GlossListSerializer(source="GlossList")
+
+
+class GlossarySerializer(Serializer):
+    title = CharField()
+    gloss_div = GlossDivSerializer(source="GlossDiv")
+
+
+class SampleSerializer(Serializer):
+    glossary = GlossarySerializer()
+
+
+GLOSSARY_DATA = {
+    "glossary": {
+        "title": "example glossary",
+        "GlossDiv": {
+            "title": "S",
+            "GlossList": {
+                "GlossEntry": {
+                    "ID": 12,
+                    "SortAs": "SGML",
+                    "GlossTerm": "Standard Generalized Markup Language",
+                    "Acronym": "SGML",
+                    "Abbrev": "ISO 8879:1986",
+                    "GlossDef": {
+                        "para": "A meta-markup language, used to create markup languages such as DocBook.",
+                        "GlossSeeAlso": ["GML", "XML"]
+                    },
+                    "GlossSee": "markup"
+                }
+            }
+        }
+    }
+}
+
+
+class EventSerializer(Serializer):
+    day = DateField(required=True)
+    created = DateTimeField(required=True)
+    updated = DateTimeField(allow_timezone=True)
+    starts = DateTimeField(convert_to_datetime=True)
+    ends = DateTimeField(convert_to_datetime=True)
+    birthday = DateField(format="%d/%m/%Y", convert_to_date=True)
+
+
+def event_data(index=0):
+    return {"day": "2020-01-{:02d}".format(index % 28 + 1), "created": "2020-01-02T10:{:02d}:00".format(index % 60),
+            "updated": "2020-01-02T10:00:00+02:00", "starts": "2020-01-02T08:00:00",
+            "ends": "2020-01-02T18:00:00", "birthday": "{:02d}/04/1990".format(index % 28 + 1)}
+
+
+class ContactSerializer(Serializer):
+    email = RegexField(r"^[\w.+-]+@[\w-]+(\.[\w-]+)+$", required=True)
+    phone = RegexField(r"^\+?[0-9 ()-]{7,20}$")
+    zip_code = RegexField(r"^[0-9]{5}(-[0-9]{4})?$")
+    country = RegexField(r"^[A-Z]{2}$")
+    slug = RegexField(r"^[a-z0-9]+(-[a-z0-9]+)*$")
+
+
+CONTACT_DATA = {"email": "first.last+tag@mail.example.com", "phone": "+1 (555) 123-4567", "zip_code": "12345-6789",
+                "country": "US", "slug": "first-last-2020"}
+
+
+def single(serializer_class, data):
+    def build(backend):
+        cls = with_backend(serializer_class, backend)
+
+        def run():
+            return cls(data=data).is_valid()
+        return run, 1
+    return build
+
+
+def many(serializer_class, make_data, count):
+    def build(backend):
+        cls = with_backend(serializer_class, backend)
+        items = [make_data(index) for index in range(count)]
+
+        def run():
+            return cls(data=items, many=True).is_valid()
+        return run, count
+    return build
+
+
+# name -> (build(backend), whether the payload is valid)
+CASES = [
+    ("flat5", single(Flat5Serializer, flat5_data()), True),
+    ("flat50", single(Flat50Serializer, FLAT50_DATA), True),
+    ("glossary", single(SampleSerializer, GLOSSARY_DATA), True),
+    ("many_10k", many(Flat5Serializer, flat5_data, 10000), True),
+    ("many_100k", many(Flat5Serializer, flat5_data, 100000), True),
+    ("flat50_invalid", single(Flat50Serializer, FLAT50_INVALID_DATA), False),
+    ("dates", single(EventSerializer, event_data()), True),
+    ("dates_many_10k", many(EventSerializer, event_data, 10000), True),
+    ("regex", single(ContactSerializer, CONTACT_DATA), True),
+]
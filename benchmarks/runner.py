@@ -0,0 +1,146 @@
+"""Run the benchmarks, optionally saving them as or comparing them to a baseline.
+
+    python -m benchmarks                        # every case with both backends
+    python -m benchmarks flat many --backend plan
+    python -m benchmarks --save baseline.json
+    python -m benchmarks --compare baseline.json --tolerance 0.15
+"""
+from __future__ import absolute_import, print_function, division
+
+import argparse
+import io
+import json
+import sys
+import timeit
+
+from .cases import CASES, PLAN, CODEGEN
+
+try:
+    import tracemalloc
+except ImportError:  # Python 2
+    tracemalloc = None
+
+ALL = "all"
+
+MIN_TIME = 1.0
+MIN_ROUNDS = 5
+MAX_ROUNDS = 100000
+TOLERANCE = 0.1
+
+_clock = timeit.default_timer
+
+
+def measure(run, operations, min_time=MIN_TIME):
+    """Time ``run`` for at least ``min_time`` seconds and ``MIN_ROUNDS`` calls.
+
+    Returns a dict with the operations per second, the p50 and p99 latency of
+    one call in seconds and the peak memory one call allocates in bytes
+    (None without tracemalloc).
+    """
+    run()
+    timings = []
+    started = _clock()
+    while len(timings) < MAX_ROUNDS and (len(timings) < MIN_ROUNDS or _clock() - started < min_time):
+        call_started = _clock()
+        run()
+        timings.append(_clock() - call_started)
+    timings.sort()
+    return {
+        "ops": operations * len(timings) / sum(timings),
+        "p50": _percentile(timings, 0.50),
+        "p99": _percentile(timings, 0.99),
+        "peak": _peak_memory(run),
+    }
+
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def _peak_memory(run):
+    if tracemalloc is None:
+        return None
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def compare(result, baseline, tolerance=TOLERANCE):
+    """Return the regressions of ``result`` against ``baseline`` as messages."""
+    regressions = []
+    if result["ops"] < baseline["ops"] * (1 - tolerance):
+        regressions.append("ops/s {:.0f} < {:.0f}".format(result["ops"], baseline["ops"]))
+    if result["peak"] is not None and baseline.get("peak") is not None \
+            and result["peak"] > baseline["peak"] * (1 + tolerance):
+        regressions.append("peak {} > {}".format(_format_bytes(result["peak"]), _format_bytes(baseline["peak"])))
+    return regressions
+
+
+def _format_time(seconds):
+    if seconds < 1e-3:
+        return "{:.1f}us".format(seconds * 1e6)
+    if seconds < 1:
+        return "{:.2f}ms".format(seconds * 1e3)
+    return "{:.2f}s".format(seconds)
+
+
+def _format_bytes(size):
+    if size is None:
+        return "-"
+    if size < 1024 * 1024:
+        return "{:.1f}KB".format(size / 1024)
+    return "{:.1f}MB".format(size / (1024 * 1024))
+
+
+def select_cases(names=None, backend=ALL):
+    backends = (PLAN, CODEGEN) if backend == ALL else (backend,)
+    for name, build, _ in CASES:
+        if names and not any(part in name for part in names):
+            continue
+        for case_backend in backends:
+            yield "{}[{}]".format(name, case_backend), build, case_backend
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmark the validation hot paths.")
+    parser.add_argument("names", nargs="*", help="only run the cases whose name contains one of these")
+    parser.add_argument("--backend", choices=(PLAN, CODEGEN, ALL), default=ALL, help="serializer backend")
+    parser.add_argument("--min-time", type=float, default=MIN_TIME, help="seconds to time every case for")
+    parser.add_argument("--save", metavar="PATH", help="write the results as a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare the results to a baseline")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="allowed slowdown or memory growth as a fraction (default: 0.1)")
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if args.compare:
+        with io.open(args.compare, encoding="utf-8") as stream:
+            baseline = json.load(stream)
+
+    results = {}
+    regressed = 0
+    print("{:<26} {:>12} {:>10} {:>10} {:>9}  {}".format("case", "ops/s", "p50", "p99", "peak", "baseline"))
+    for name, build, backend in select_cases(args.names, args.backend):
+        run, operations = build(backend)
+        result = results[name] = measure(run, operations, args.min_time)
+        status = ""
+        if name in baseline:
+            regressions = compare(result, baseline[name], args.tolerance)
+            change = result["ops"] / baseline[name]["ops"] - 1
+            status = "{:+.1%} {}".format(change, "; ".join(regressions) if regressions else "ok")
+            regressed += bool(regressions)
+        print("{:<26} {:>12.0f} {:>10} {:>10} {:>9}  {}".format(
+            name, result["ops"], _format_time(result["p50"]), _format_time(result["p99"]),
+            _format_bytes(result["peak"]), status))
+        sys.stdout.flush()
+
+    if args.save:
+        with open(args.save, "w") as stream:
+            json.dump(results, stream, indent=2, sort_keys=True)
+    if regressed:
+        print("{} case(s) regressed by more than {:.0%}".format(regressed, args.tolerance), file=sys.stderr)
+        return 1
+    return 0
@@ -0,0 +1,233 @@
+"""Asynchronous validation (Python 3 only).
+
+Mirrors ``Plan.run`` step by step so results are the same as the sync path,
+but awaits async ``validate`` hooks and async rules, and validates nested
+serializers and list elements concurrently.
+"""
+import asyncio
+import inspect
+
+from .errors import NULL, REQUIRED
+from .plan import FIELD, SERIALIZER, MISSING
+from .serializers import Serializer, ListSerializer, ValidationError
+from .validator import INVALID
+
+
+class _Unlimited(object):
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+async def is_valid(serializer, concurrency=None):
+    if not serializer._within_limits():
+        return False
+    limiter = asyncio.Semaphore(concurrency) if concurrency else _Unlimited()
+    if isinstance(serializer, ListSerializer):
+        serializer._validated_data, serializer._errors, serializer._data = await run_list(
+            serializer, serializer._initial_data, limiter)
+    else:
+        serializer._validated_data, serializer._errors, serializer._all_fields_valid = await run_plan(
+            serializer._plan, serializer, serializer._initial_data, limiter)
+    return not serializer.has_error()
+
+
+async def run_list(list_serializer, initial_data, limiter):
+    plan = list_serializer._child._plan
+    if not plan.is_async:
+        return list_serializer.run_validation(initial_data)
+    list_serializer._check_initial_data(initial_data)
+    if initial_data is None:
+        return [], [NULL], []
+    list_errors = list_serializer.list_errors(initial_data)
+    if list_errors:
+        return [], list_errors, []
+    constraint_errors = list_serializer.constraint_errors(initial_data)
+    child = list_serializer._child
+    max_errors = list_serializer._max_errors
+    if max_errors is None:
+        results = await asyncio.gather(*[run_plan(plan, child, item, limiter) for item in initial_data])
+    else:
+        results = await _run_within_budget(plan, child, initial_data, limiter, max_errors, constraint_errors)
+    return list_serializer.merge_items(results, max_errors, constraint_errors=constraint_errors)
+
+
+async def _run_within_budget(plan, child, items, limiter, max_errors, constraint_errors):
+    # Elements are validated in batches as large as the errors still allowed, so
+    # no batch starts once max_errors elements have failed and at most
+    # max_errors - 1 elements past the last reported one are validated
+    results = []
+    failures = 0
+    while failures < max_errors and len(results) < len(items):
+        start = len(results)
+        batch = items[start:start + max_errors - failures]
+        results.extend(await asyncio.gather(*[run_plan(plan, child, item, limiter) for item in batch]))
+        for index in range(start, len(results)):
+            if results[index][1] or (constraint_errors and index in constraint_errors):
+                failures += 1
+    return results
+
+
+async def run_plan(plan, owner, data, limiter):
+    if not plan.is_async:
+        return plan.run(owner, data)
+
+    validated = {}
+    errors = {}
+    all_fields_valid = True
+
+    if plan.hook:
+        hook_errors, data = await _check_user_validation(owner, data, limiter)
+        if hook_errors:
+            all_fields_valid = False
+            for error in hook_errors:
+                errors.update(error)
+
+    # Every step gives (validated value or MISSING, errors, whether it was required and missing);
+    # steps that await are gathered and the results applied in declaration order
+    outcomes = [_run_step(step, data, limiter) for step in plan.steps]
+    pending = [index for index, outcome in enumerate(outcomes) if inspect.isawaitable(outcome)]
+    if pending:
+        for index, outcome in zip(pending, await asyncio.gather(*[outcomes[i] for i in pending])):
+            outcomes[index] = outcome
+
+    for step, (value, step_errors, missing) in zip(plan.steps, outcomes):
+        if missing:
+            all_fields_valid = False
+        if step_errors:
+            errors[step.name] = step_errors
+        if value is not MISSING:
+            validated[step.name] = value
+    return validated, errors, all_fields_valid
+
+
+def _run_step(step, data, limiter):
+    name = step.name
+    if step.kind is FIELD:
+        value = step.lookup(data)
+        if value is MISSING:
+            if step.required:
+                return MISSING, [REQUIRED], True
+            value = step.get_default()
+        field = step.node
+        if field._async_rules:
+            return _run_async_field(field, value, limiter)
+        result = field.clean(value)
+        if result is INVALID:
+            return MISSING, field.collect_errors(value), False
+        return result, None, False
+
+    if step.kind is SERIALIZER:
+        value = None
+        if data:
+            value = step.lookup(data)
+            if value is MISSING:
+                if step.required:
+                    return MISSING, {name: REQUIRED}, True
+                value = None
+        return _run_serializer(step, value, limiter)
+
+    value = step.default
+    if data:
+        value = step.lookup(data)
+        if value is MISSING:
+            if step.required:
+                return MISSING, [REQUIRED], True
+            value = step.default
+    return _run_list_step(step, value, limiter)
+
+
+async def _run_async_field(field, value, limiter):
+    result = await _clean(field, value, limiter)
+    if result is INVALID:
+        return MISSING, await _collect_errors(field, value, limiter), False
+    return result, None, False
+
+
+# _clean and _collect_errors are Field.clean and Field.collect_errors with the
+# async rules checked last, after the sync ones
+
+
+async def _clean(field, value, limiter):
+    checks = field._checks + field._async_rules
+    if field._many:
+        if value is None:
+            return value
+        if not isinstance(value, (list, tuple)):
+            return INVALID
+        for item in value:
+            for check in checks:
+                if await _check(check, item, limiter) is INVALID:
+                    return INVALID
+        return value
+
+    for check in checks:
+        value = await _check(check, value, limiter)
+        if value is INVALID:
+            return INVALID
+    return value
+
+
+async def _collect_errors(field, value, limiter):
+    checks = field._checks + field._async_rules
+    errors = []
+    if field._many:
+        if not isinstance(value, (list, tuple)):
+            errors.append(field._list_check.get_error(value))
+            return errors
+        for item in value:
+            for check in checks:
+                if await _check(check, item, limiter, quietly=True) is INVALID:
+                    errors.append(check.get_error(item))
+        return errors
+
+    for check in checks:
+        result = await _check(check, value, limiter, quietly=True)
+        if result is INVALID:
+            errors.append(check.get_error(value))
+        else:
+            value = result
+    return errors
+
+
+async def _check(check, value, limiter, quietly=False):
+    try:
+        if not check.is_async:
+            return check(value)
+        async with limiter:
+            return await check(value)
+    except TypeError:
+        # Same as Field.collect_errors on Python 3
+        if quietly:
+            return value
+        raise
+
+
+async def _run_serializer(step, value, limiter):
+    nested_data, nested_errors, nested_valid = await run_plan(step.plan, step.node, value, limiter)
+    if not nested_valid or (step.force_valid and nested_errors):
+        nested_data = {}
+    return nested_data, nested_errors, False
+
+
+async def _run_list_step(step, value, limiter):
+    list_data, list_errors, _ = await run_list(step.node, value, limiter)
+    return list_data, list_errors, False
+
+
+async def _check_user_validation(owner, data, limiter):
+    async with limiter:
+        if type(owner)._check_user_validation is not Serializer._check_user_validation:
+            result = owner._check_user_validation(data)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+        try:
+            result = owner.validate(data)
+            if inspect.isawaitable(result):
+                result = await result
+            return [], result
+        except ValidationError as e:
+            return e.details, data
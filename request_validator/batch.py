@@ -0,0 +1,236 @@
+from __future__ import absolute_import
+
+import operator
+
+import six
+
+from .plan import MISSING, FIELD
+from .validator import (
+    INVALID, IntRule, FloatRule, StringRule, BooleanRule, NotNullRule, NotBlankRule, MaxLenRule,
+    MinLenRule, MaxValueRule, MinValueRule, InRule,
+)
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Below this many rows the cost of building arrays outweighs the vectorized checks
+MIN_COLUMNAR_ROWS = 256
+
+_NONE = type(None)
+_STRING_TYPES = frozenset(six.string_types)
+_INT_TYPES = frozenset(six.integer_types) - frozenset([bool])
+
+
+def is_available():
+    return numpy is not None
+
+
+def supports(plan):
+    """Only flat serializers of plain fields, without validate() hooks, can be validated column by column."""
+    return bool(plan.steps) and not plan.hook and all(
+        step.kind is FIELD and step.node._checks_only for step in plan.steps)
+
+
+def validate_columns(plan, records):
+    """Validate ``records`` column by column.
+
+    Returns one validated dict per record that passed every rule, and None for
+    the others: those must be validated one by one to get their exact errors.
+    """
+    count = len(records)
+    passed = numpy.fromiter((type(record) is dict and len(record) != 0 for record in records),
+                            dtype=bool, count=count)
+    rows = [record if type(record) is dict else {} for record in records]
+
+    columns = []
+    copies = []
+    for step in plan.steps:
+        values = _get_column(step, rows)
+        if MISSING in values:
+            missing = numpy.fromiter((value is MISSING for value in values), dtype=bool, count=count)
+            if step.required:
+                passed &= ~missing
+            elif not step.shared_default:
+                copies.append((step, missing))
+            default = step.default
+            values = [default if value is MISSING else value for value in values]
+
+        failed, values = _check_column(step.node, values)
+        passed &= ~failed
+        columns.append(values)
+
+    names = [step.name for step in plan.steps]
+    results = [dict(zip(names, values)) if ok else None
+               for ok, values in zip(passed.tolist(), zip(*columns))]
+    for step, missing in copies:
+        for index in numpy.flatnonzero(missing & passed).tolist():
+            results[index][step.name] = step.get_default()
+    return results
+
+
+def _get_column(step, rows):
+    name = step.name
+    source = step.source
+    if source is None:
+        return list(map(operator.methodcaller("get", name, MISSING), rows))
+    return [row[source] if source in row else row.get(name, MISSING) for row in rows]
+
+
+def _check_column(field, values):
+    count = len(values)
+    if field._many:
+        results = [field.clean(value) for value in values]
+        failed = numpy.fromiter((result is INVALID for result in results), dtype=bool, count=count)
+        return failed, values
+
+    failed = numpy.zeros(count, dtype=bool)
+    for rule in field._checks:
+        vectorizer = _VECTORIZERS.get(type(rule))
+        result = vectorizer(rule, values) if vectorizer is not None else None
+        if result is None:
+            result = _check_rows(rule, values)
+        rule_failed, values = result
+        if rule_failed is not None and rule_failed.any():
+            failed |= rule_failed
+            # Rows that already failed are re-validated one by one later; neutralise
+            # them so the remaining vectorized rules only see well-typed values
+            values = [None if bad else value for bad, value in zip(rule_failed.tolist(), values)]
+    return failed, values
+
+
+def _check_rows(rule, values):
+    results = [rule(value) for value in values]
+    failed = numpy.fromiter((result is INVALID for result in results), dtype=bool, count=len(values))
+    if not failed.any():
+        return failed, results
+    return failed, [value if result is INVALID else result for value, result in zip(values, results)]
+
+
+def _types(values):
+    return frozenset(map(type, values))
+
+
+def _objects(values):
+    array = numpy.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def _type_rule(accepted):
+    def check(rule, values):
+        if _types(values) <= accepted:
+            return None, values
+        return None
+    return check
+
+
+def _check_float(rule, values):
+    types = _types(values)
+    if types <= {float, _NONE}:
+        return None, values
+    if types <= _INT_TYPES | {float}:
+        try:
+            return None, numpy.asarray(values, dtype=numpy.float64).tolist()
+        except OverflowError:
+            return None
+    return None
+
+
+def _check_not_null(rule, values):
+    return numpy.equal(_objects(values), None), values
+
+
+def _check_not_blank(rule, values):
+    return numpy.equal(_objects(values), ""), values
+
+
+def _lengths(values):
+    types = _types(values)
+    if not types <= _STRING_TYPES | {list, tuple, _NONE}:
+        return None, None
+    if _NONE in types:
+        present = numpy.not_equal(_objects(values), None)
+        lengths = numpy.fromiter((0 if value is None else len(value) for value in values),
+                                 dtype=numpy.int64, count=len(values))
+        return lengths, present
+    return numpy.fromiter(map(len, values), dtype=numpy.int64, count=len(values)), None
+
+
+def _length_rule(compare):
+    def check(rule, values):
+        lengths, present = _lengths(values)
+        if lengths is None:
+            return None
+        failed = compare(lengths, rule.value)
+        if present is not None:
+            failed &= present
+        return failed, values
+    return check
+
+
+def _numbers(values):
+    types = _types(values) - {_NONE}
+    if types <= _INT_TYPES:
+        dtype = numpy.int64
+    elif types <= {float}:
+        dtype = numpy.float64
+    else:
+        return None, None
+    present = None
+    if _NONE in _types(values):
+        present = numpy.not_equal(_objects(values), None)
+        values = [0 if value is None else value for value in values]
+    try:
+        return numpy.asarray(values, dtype=dtype), present
+    except OverflowError:
+        return None, None
+
+
+def _value_rule(compare):
+    def check(rule, values):
+        if not isinstance(rule.value, (float,) + six.integer_types):
+            return None
+        numbers, present = _numbers(values)
+        if numbers is None:
+            return None
+        failed = compare(numbers, rule.value)
+        if present is not None:
+            failed &= present
+        return failed, values
+    return check
+
+
+def _check_in(rule, values):
+    if not isinstance(rule.choices, frozenset) or len(rule.choices) > len(values):
+        # Looking every value up in a large set beats sorting the set with them
+        return None
+    types = _types(values)
+    choices = list(rule.choices)
+    choice_types = _types(choices)
+    if types <= _STRING_TYPES and choice_types <= _STRING_TYPES:
+        # Fixed width string arrays drop trailing NULs, so strings are compared as objects
+        return ~numpy.isin(_objects(values), _objects(choices)), values
+    if types <= _INT_TYPES and choice_types <= _INT_TYPES:
+        try:
+            return ~numpy.isin(numpy.asarray(values, dtype=numpy.int64),
+                               numpy.asarray(choices, dtype=numpy.int64)), values
+        except OverflowError:
+            return None
+    return None
+
+
+_VECTORIZERS = {
+    IntRule: _type_rule(_INT_TYPES | {_NONE}),
+    StringRule: _type_rule(_STRING_TYPES | {_NONE}),
+    BooleanRule: _type_rule(frozenset([bool])),
+    FloatRule: _check_float,
+    NotNullRule: _check_not_null,
+    NotBlankRule: _check_not_blank,
+    MaxLenRule: _length_rule(numpy.greater if numpy is not None else None),
+    MinLenRule: _length_rule(numpy.less if numpy is not None else None),
+    MaxValueRule: _value_rule(numpy.greater if numpy is not None else None),
+    MinValueRule: _value_rule(numpy.less if numpy is not None else None),
+    InRule: _check_in,
+}
@@ -0,0 +1,131 @@
+from __future__ import absolute_import
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+import six
+
+_clock = getattr(time, "monotonic", time.time)
+
+
+class LRUCache(object):
+    """A small thread-safe mapping that evicts the least recently used key.
+
+    With ``ttl`` (seconds) entries also expire. ``hits``, ``misses`` and
+    ``evictions`` (entries dropped for room or age) are counted.
+    """
+
+    def __init__(self, maxsize=128, ttl=None):
+        assert isinstance(maxsize, int) and maxsize > 0, \
+            """maxsize must be a positive integer"""
+        assert ttl is None or ttl > 0, \
+            """ttl must be a positive number of seconds"""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __reduce__(self):
+        # A copy starts empty; the lock and entries are local to a process
+        return self.__class__, (self.maxsize, self.ttl)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            if self.ttl is not None:
+                expires, value = value
+                if expires <= _clock():
+                    self.evictions += 1
+                    self.misses += 1
+                    return default
+                self._data[key] = expires, value
+            else:
+                self._data[key] = value
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        if self.ttl is not None:
+            value = _clock() + self.ttl, value
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = value
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "size": len(self._data), "maxsize": self.maxsize}
+
+
+# Types canonical JSON keeps apart; tuples, non-string keys and subclasses would share a digest with others
+_PLAIN_TYPES = frozenset((six.text_type, int, float, bool, type(None)))
+
+
+def _is_plain(data):
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        value_type = type(value)
+        if value_type is dict:
+            for key in value:
+                if type(key) is not six.text_type and not _is_text_key(key):
+                    return False
+            stack.extend(value.values())
+        elif value_type is list:
+            stack.extend(value)
+        elif value_type not in _PLAIN_TYPES:
+            return False
+    return True
+
+
+def _is_text_key(key):
+    if type(key) is six.text_type:
+        return True
+    # Python 2 literals make byte string keys, equal to the unicode ones when they are ASCII
+    if not six.PY2 or type(key) is not str:
+        return False
+    try:
+        key.decode("ascii")
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def content_key(data, raw=None):
+    """A digest of ``raw`` bytes when given, else of ``data`` in canonical JSON.
+
+    Returns None when ``data`` holds anything canonical JSON would not keep
+    apart from other values (tuples, keys that are not strings, objects);
+    such data is not cached.
+    """
+    if raw is not None:
+        return "raw", hashlib.sha1(raw).digest()
+    if not _is_plain(data):
+        return None
+    try:
+        text = json.dumps(data, sort_keys=True, separators=(",", ":"))
+    except (TypeError, ValueError):
+        return None
+    return "json", hashlib.sha1(text.encode("utf-8")).digest()
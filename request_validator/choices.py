@@ -0,0 +1,71 @@
+"""Choices too many to keep in every process."""
+from __future__ import absolute_import
+
+import mmap
+
+import six
+
+
+class ChoicesFromFile(object):
+    """The lines of a sorted text file as the choices of a field.
+
+    The file is mapped in memory read-only and searched by bisection, so
+    processes using the same file share one copy, cached by the operating
+    system, instead of each holding every choice. Lines must be sorted by
+    their bytes, as ``LC_ALL=C sort`` does, and end with ``\\n``.
+    """
+
+    __slots__ = ("path", "encoding", "_data")
+
+    def __init__(self, path, encoding="utf-8"):
+        self.path = path
+        self.encoding = encoding
+        with open(path, "rb") as stream:
+            stream.seek(0, 2)
+            if stream.tell():
+                self._data = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                # An empty file can not be mapped
+                self._data = b""
+
+    def __reduce__(self):
+        return self.__class__, (self.path, self.encoding)
+
+    def __contains__(self, value):
+        if isinstance(value, six.text_type):
+            value = value.encode(self.encoding)
+        elif not isinstance(value, bytes):
+            return False
+        if b"\n" in value:
+            return False
+        data = self._data
+        low = 0
+        high = len(data)
+        while low < high:
+            middle = (low + high) // 2
+            start = data.rfind(b"\n", low, middle)
+            start = low if start < 0 else start + 1
+            end = data.find(b"\n", start, high)
+            if end < 0:
+                end = high
+            line = data[start:end]
+            if line == value:
+                return True
+            if line < value:
+                low = end + 1
+            else:
+                high = start
+        return False
+
+    def __iter__(self):
+        data = self._data
+        start = 0
+        while start < len(data):
+            end = data.find(b"\n", start)
+            if end < 0:
+                end = len(data)
+            yield data[start:end].decode(self.encoding)
+            start = end + 1
+
+    def __repr__(self):
+        return "ChoicesFromFile({!r})".format(self.path)
@@ -0,0 +1,277 @@
+"""Validate NDJSON or CSV files against a serializer class.
+
+    python -m request_validator myapp.serializers.EventSerializer events.ndjson \\
+        --output valid.ndjson --errors errors.ndjson --jobs 8
+"""
+from __future__ import absolute_import, print_function, division
+
+import argparse
+import csv
+import importlib
+import io
+import json
+import multiprocessing
+import sys
+import time
+from collections import deque
+
+import six
+
+from .fields import BooleanField, FloatField, ListField, OneOfField
+from .plan import FIELD
+from .serializers import Serializer
+
+NDJSON = "ndjson"
+CSV = "csv"
+
+CHUNK_SIZE = 5000
+
+_TRUE_CELLS = frozenset(("true", "1", "yes"))
+_FALSE_CELLS = frozenset(("false", "0", "no"))
+
+_serializer_class = None
+_csv_converters = None
+
+
+def import_serializer(path):
+    """Import a serializer class from ``"package.module.Class"`` or ``"package.module:Class"``."""
+    if ":" in path:
+        module_name, _, class_name = path.partition(":")
+    else:
+        module_name, _, class_name = path.rpartition(".")
+    if not module_name or not class_name:
+        raise ImportError("{!r} is not a dotted path to a serializer class".format(path))
+    serializer_class = getattr(importlib.import_module(module_name), class_name, None)
+    if not (isinstance(serializer_class, type) and issubclass(serializer_class, Serializer)):
+        raise ImportError("{!r} is not a Serializer subclass".format(path))
+    return serializer_class
+
+
+def get_format(path, format=None):
+    if format:
+        return format
+    return CSV if path.lower().endswith(".csv") else NDJSON
+
+
+def read_chunks(path, format, chunk_size=CHUNK_SIZE):
+    """Yield lists of ``(line_number, record)`` from ``path``.
+
+    NDJSON lines are left undecoded so the workers parse them; CSV rows are
+    read here because quoted values may span lines.
+    """
+    chunk = []
+    if format == CSV:
+        with _open_csv(path) as stream:
+            reader = csv.DictReader(stream)
+            for row in reader:
+                chunk.append((reader.line_num, row))
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+    else:
+        with io.open(path, encoding="utf-8") as stream:
+            for line_number, line in enumerate(stream, 1):
+                if line.strip():
+                    chunk.append((line_number, line))
+                    if len(chunk) >= chunk_size:
+                        yield chunk
+                        chunk = []
+    if chunk:
+        yield chunk
+
+
+def _open_csv(path):
+    if six.PY2:
+        return open(path, "rb")
+    return io.open(path, newline="", encoding="utf-8")
+
+
+def _to_float(cell):
+    try:
+        return float(cell)
+    except ValueError:
+        return cell
+
+
+def _to_bool(cell):
+    lowered = cell.strip().lower()
+    if lowered in _TRUE_CELLS:
+        return True
+    if lowered in _FALSE_CELLS:
+        return False
+    return cell
+
+
+def _to_json(cell):
+    try:
+        return json.loads(cell)
+    except ValueError:
+        return cell
+
+
+def csv_converters(serializer_class):
+    """Input key -> function turning a CSV cell into the type its field checks.
+
+    Floats and booleans (``true``/``false``, ``1``/``0``, ``yes``/``no``) are
+    parsed, lists and objects are read as JSON; integers are parsed by their
+    fields and other cells stay strings. A cell that does not parse is left
+    as it is for its field to reject.
+    """
+    converters = {}
+    for step in serializer_class._plan.steps:
+        node = step.node
+        if step.kind is not FIELD or node._many or isinstance(node, (ListField, OneOfField)):
+            converter = _to_json
+        elif isinstance(node, FloatField):
+            converter = _to_float
+        elif isinstance(node, BooleanField):
+            converter = _to_bool
+        else:
+            continue
+        for key in (step.name, step.source):
+            if key is not None:
+                converters[key] = converter
+    return converters
+
+
+def csv_record(row, converters):
+    """The record of a CSV row: empty cells are missing values, the others are converted."""
+    record = {}
+    for key, cell in row.items():
+        if cell is None or cell == "":
+            continue
+        converter = converters.get(key)
+        record[key] = cell if converter is None else converter(cell)
+    return record
+
+
+def _init_worker(serializer_path):
+    global _serializer_class, _csv_converters
+    _serializer_class = import_serializer(serializer_path)
+    _csv_converters = csv_converters(_serializer_class)
+
+
+def validate_chunk(task):
+    """Validate one chunk; returns ``(line_number, validated_data, errors)`` per record."""
+    format, chunk = task
+    results = []
+    records = []
+    for line_number, record in chunk:
+        if format == NDJSON:
+            try:
+                record = json.loads(record)
+            except ValueError as e:
+                results.append((line_number, None, {"non_field_error": "Invalid JSON: {}".format(e)}))
+                continue
+        else:
+            record = csv_record(record, _csv_converters)
+        if not isinstance(record, dict):
+            results.append((line_number, None, {"non_field_error": "Expected a JSON object"}))
+            continue
+        records.append((line_number, record))
+
+    validated = _serializer_class.validate_each(record for _, record in records)
+    for (line_number, _), (validated_data, errors) in zip(records, validated):
+        results.append((line_number, None if errors else validated_data, errors))
+    results.sort(key=lambda result: result[0])
+    return results
+
+
+class _Report(object):
+    def __init__(self, output, errors):
+        self.output = output
+        self.errors = errors
+        self.valid = 0
+        self.invalid = 0
+
+    def add(self, path, results):
+        for line_number, validated_data, errors in results:
+            if errors:
+                self.invalid += 1
+                self.errors.write(_dumps({"file": path, "line": line_number, "errors": errors}))
+            else:
+                self.valid += 1
+                if self.output is not None:
+                    self.output.write(_dumps(validated_data))
+
+
+def _dumps(value):
+    line = json.dumps(value, default=str, ensure_ascii=False)
+    if isinstance(line, bytes):
+        line = line.decode("utf-8")
+    return line + u"\n"
+
+
+def run(serializer_path, paths, report, format=None, jobs=None, chunk_size=CHUNK_SIZE):
+    jobs = jobs or multiprocessing.cpu_count()
+    if jobs == 1:
+        _init_worker(serializer_path)
+        for path in paths:
+            path_format = get_format(path, format)
+            for chunk in read_chunks(path, path_format, chunk_size):
+                report.add(path, validate_chunk((path_format, chunk)))
+        return
+
+    pool = multiprocessing.Pool(jobs, _init_worker, (serializer_path,))
+    try:
+        pending = deque()
+        for path in paths:
+            path_format = get_format(path, format)
+            for chunk in read_chunks(path, path_format, chunk_size):
+                pending.append((path, pool.apply_async(validate_chunk, ((path_format, chunk),))))
+                # Keep a few chunks per worker in flight so memory stays bounded
+                while len(pending) > jobs * 2:
+                    done_path, result = pending.popleft()
+                    report.add(done_path, result.get())
+        while pending:
+            done_path, result = pending.popleft()
+            report.add(done_path, result.get())
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def _open_output(path):
+    if path == "-":
+        return sys.stdout
+    return io.open(path, "w", encoding="utf-8")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m request_validator",
+                                     description="Validate NDJSON or CSV files against a serializer.")
+    parser.add_argument("serializer", help="dotted path of the Serializer subclass, e.g. app.serializers.Event")
+    parser.add_argument("files", nargs="+", help="NDJSON or CSV files (CSV is detected by extension)")
+    parser.add_argument("--format", choices=(NDJSON, CSV), help="format of every file")
+    parser.add_argument("-o", "--output", help="write valid records as NDJSON to this file ('-' for stdout)")
+    parser.add_argument("-e", "--errors", default="-",
+                        help="write the error report as NDJSON to this file (default: stderr)")
+    parser.add_argument("-j", "--jobs", type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="records sent to a worker at once")
+    args = parser.parse_args(argv)
+
+    try:
+        import_serializer(args.serializer)
+    except ImportError as e:
+        parser.error(str(e))
+
+    output = _open_output(args.output) if args.output else None
+    errors = _open_output(args.errors) if args.errors != "-" else sys.stderr
+    report = _Report(output, errors)
+    started = time.time()
+    try:
+        run(args.serializer, args.files, report, args.format, args.jobs, args.chunk_size)
+    except (IOError, OSError, ValueError, csv.Error) as e:
+        print("error: {}".format(e), file=sys.stderr)
+        return 1
+    finally:
+        for stream in (output, errors):
+            if stream not in (None, sys.stdout, sys.stderr):
+                stream.close()
+
+    elapsed = time.time() - started
+    total = report.valid + report.invalid
+    print("{} records ({} valid, {} invalid) in {:.2f}s, {:.0f} records/s".format(
+        total, report.valid, report.invalid, elapsed, total / elapsed if elapsed else 0), file=sys.stderr)
+    return 1 if report.invalid else 0
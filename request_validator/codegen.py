@@ -0,0 +1,396 @@
+from __future__ import absolute_import
+
+import copy
+import hashlib
+import linecache
+import types
+from decimal import Decimal
+
+import six
+from six.moves import builtins
+
+from .errors import ErrorList, NULL, REQUIRED
+from .plan import Plan, MISSING, FIELD, SERIALIZER
+from .validator import (
+    INVALID, _INT_PATTERN, NotNullRule, NotBlankRule, StringRule, BooleanRule, ListRule, IntRule,
+    FloatRule, MaxLenRule, MinLenRule, MaxValueRule, MinValueRule, RegexRule,
+)
+
+_STRING_TYPES = six.string_types
+_NUMBER_TYPES = six.integer_types + (Decimal,)
+
+# Code of generated functions loaded from a snapshot, by code_key
+_preloaded = {}
+
+
+class GeneratedPlan(Plan):
+    """A plan whose ``run`` is a function generated from straight-line Python source."""
+
+    def __init__(self, steps, hook=False, name="serializer"):
+        super(GeneratedPlan, self).__init__(steps, hook=hook)
+        self.name = name
+        self.source, self.run = _Generator(name).build(self)
+
+    def __reduce__(self):
+        # Generated functions cannot be pickled, so the copy generates its own
+        return self.__class__, (self.steps, self.hook, self.name)
+
+
+def compile_plan(plan, name="serializer"):
+    return GeneratedPlan(plan.steps, hook=plan.hook, name=name)
+
+
+def code_key(filename, source):
+    return hashlib.sha1((filename + "\n" + source).encode("utf-8")).digest()
+
+
+def function_codes(plans):
+    """The code of the generated function of every GeneratedPlan in ``plans``, by ``code_key``."""
+    codes = {}
+    for plan in plans:
+        if isinstance(plan, GeneratedPlan):
+            code = six.get_function_code(plan.run)
+            codes[code_key(code.co_filename, plan.source)] = code
+    return codes
+
+
+def preload(codes):
+    """Use ``codes`` (from ``function_codes``) instead of compiling the same source again."""
+    _preloaded.update(codes)
+
+
+def generate_source(serializer_class):
+    plan = serializer_class._plan
+    if isinstance(plan, GeneratedPlan):
+        return plan.source
+    return _Generator(serializer_class.__name__).build(plan)[0]
+
+
+class _Generator(object):
+    def __init__(self, name):
+        self._name = name
+        self._lines = []
+        self._indent = 1
+        self._namespace = {
+            "MISSING": MISSING,
+            "INVALID": INVALID,
+            "REQUIRED": REQUIRED,
+            "NULL": NULL,
+            "ErrorList": ErrorList,
+            "string_types": _STRING_TYPES,
+            "number_types": _NUMBER_TYPES,
+            "int_match": _INT_PATTERN.match,
+            "deepcopy": copy.deepcopy,
+        }
+        self._constants = {}
+
+    def build(self, plan):
+        function_name = "validate_{}".format(self._name)
+        self._lines.append("def {}(owner, data):".format(function_name))
+        self._emit_object(plan, "owner", "data", 0)
+        self._line("return validated_0, errors_0, valid_0")
+        source = "\n".join(self._lines) + "\n"
+
+        filename = "<request_validator.codegen {}>".format(self._name)
+        linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+        namespace = dict(self._namespace)
+        code = _preloaded.get(code_key(filename, source))
+        if code is not None:
+            # exec would have added the builtins
+            namespace["__builtins__"] = builtins
+            return source, types.FunctionType(code, namespace, function_name)
+        six.exec_(compile(source, filename, "exec"), namespace)
+        return source, namespace[function_name]
+
+    def _line(self, line):
+        self._lines.append("    " * self._indent + line)
+
+    def _bind(self, value):
+        key = id(value)
+        if key not in self._constants:
+            name = "c{}".format(len(self._constants))
+            self._constants[key] = name
+            self._namespace[name] = value
+        return self._constants[key]
+
+    def _literal(self, value):
+        if type(value) in (int, bool) or value is None:
+            return repr(value)
+        return self._bind(value)
+
+    def _default(self, step):
+        if step.shared_default:
+            return self._literal(step.default)
+        return "deepcopy({})".format(self._bind(step.default))
+
+    def _emit_lookup(self, step, data, value, empty=None):
+        guard = "not {} and ".format(empty) if empty else ""
+        source = step.source
+        if source is not None:
+            self._line("if {guard}{key} in {data}:".format(
+                guard=guard, key=self._literal_key(source), data=data))
+            self._indent += 1
+            self._line("{} = {}[{}]".format(value, data, self._literal_key(source)))
+            self._indent -= 1
+            self._line("elif {guard}{key} in {data}:".format(
+                guard=guard, key=self._literal_key(step.name), data=data))
+        else:
+            self._line("if {guard}{key} in {data}:".format(
+                guard=guard, key=self._literal_key(step.name), data=data))
+        self._indent += 1
+        self._line("{} = {}[{}]".format(value, data, self._literal_key(step.name)))
+        self._indent -= 1
+        self._line("else:")
+        self._indent += 1
+        self._line("{} = MISSING".format(value))
+        self._indent -= 1
+
+    def _literal_key(self, key):
+        if isinstance(key, six.string_types):
+            return repr(key)
+        return self._bind(key)
+
+    def _emit_object(self, plan, owner, data, depth):
+        validated = "validated_{}".format(depth)
+        errors = "errors_{}".format(depth)
+        valid = "valid_{}".format(depth)
+        empty = "empty_{}".format(depth)
+        self._line("{} = {{}}".format(validated))
+        self._line("{} = {{}}".format(errors))
+        self._line("{} = True".format(valid))
+        if plan.hook:
+            self._line("hook_errors, {data} = {owner}._check_user_validation({data})".format(
+                data=data, owner=owner))
+            self._line("if hook_errors:")
+            self._indent += 1
+            self._line("{} = False".format(valid))
+            self._line("for error in hook_errors:")
+            self._line("    {}.update(error)".format(errors))
+            self._indent -= 1
+        self._line("{} = not {}".format(empty, data))
+
+        for step in plan.steps:
+            self._line("# {}".format(step.name))
+            if step.kind is FIELD:
+                self._emit_field(step, data, depth)
+            elif step.kind is SERIALIZER:
+                self._emit_serializer(step, data, depth)
+            else:
+                self._emit_list(step, data, depth)
+
+    def _emit_required(self, step, depth, error):
+        self._line("if value_{} is MISSING:".format(depth))
+        self._indent += 1
+        if step.required:
+            self._line("valid_{} = False".format(depth))
+            self._line("errors_{}[{}] = {}".format(depth, self._literal_key(step.name), error))
+            self._indent -= 1
+            self._line("else:")
+            return True
+        self._line("value_{} = {}".format(depth, self._default(step)))
+        self._indent -= 1
+        return False
+
+    def _emit_field(self, step, data, depth):
+        value = "value_{}".format(depth)
+        v = "v_{}".format(depth)
+        ok = "ok_{}".format(depth)
+        name = self._literal_key(step.name)
+        field = self._bind(step.node)
+        self._emit_lookup(step, data, value, "empty_{}".format(depth))
+        nested = self._emit_required(step, depth, "[REQUIRED]")
+        if nested:
+            self._indent += 1
+
+        if step.node._many or not step.node._checks_only:
+            self._line("{} = {}.clean({})".format(v, field, value))
+            self._line("{} = {} is not INVALID".format(ok, v))
+        else:
+            self._line("{} = {}".format(v, value))
+            self._line("{} = True".format(ok))
+            for index, check in enumerate(step.node._checks):
+                self._emit_check(check, v, ok, guarded=index > 0)
+
+        self._line("if {}:".format(ok))
+        self._line("    validated_{}[{}] = {}".format(depth, name, v))
+        self._line("else:")
+        self._line("    errors_{}[{}] = {}.collect_errors({})".format(depth, name, field, value))
+        if nested:
+            self._indent -= 1
+
+    def _emit_check(self, check, v, ok, guarded=True):
+        # Only the exact built-in rule classes are inlined, subclasses may override __call__
+        kind = type(check)
+        option = check.value
+        if kind is NotNullRule:
+            lines = ["if {v} is None:", "    {ok} = False"]
+        elif kind is NotBlankRule:
+            lines = ["if {v} == '':", "    {ok} = False"]
+        elif kind is StringRule:
+            lines = ["if {v} is not None and not isinstance({v}, string_types):", "    {ok} = False"]
+        elif kind is BooleanRule:
+            lines = ["if {v} is not True and {v} is not False:", "    {ok} = False"]
+        elif kind is ListRule:
+            lines = ["if not isinstance({v}, list):", "    {ok} = False"]
+        elif kind is IntRule:
+            lines = [
+                "if {v}.__class__ is not int and not isinstance({v}, int):",
+                "    if isinstance({v}, number_types):",
+                "        {v} = int({v})",
+                "    elif isinstance({v}, string_types) and int_match({v}):",
+                "        {v} = int({v})",
+                "    elif {v} is not None:",
+                "        {ok} = False",
+            ]
+        elif kind is FloatRule:
+            lines = [
+                "if {v}.__class__ is not float and not isinstance({v}, float):",
+                "    if isinstance({v}, number_types):",
+                "        {v} = float({v})",
+                "    elif {v} is not None:",
+                "        {ok} = False",
+            ]
+        elif kind is MaxLenRule:
+            lines = ["if {v} is not None and len({v}) > {option}:", "    {ok} = False"]
+        elif kind is MinLenRule:
+            lines = ["if {v} is not None and len({v}) < {option}:", "    {ok} = False"]
+        elif kind is MaxValueRule:
+            lines = ["if {v} is not None and {v} > {option}:", "    {ok} = False"]
+        elif kind is MinValueRule:
+            lines = ["if {v} is not None and {v} < {option}:", "    {ok} = False"]
+        elif kind is RegexRule:
+            option = check.match
+            lines = ["if {v} is not None and not {option}({v}):", "    {ok} = False"]
+        else:
+            lines = [
+                "{v} = {check}({v})",
+                "if {v} is INVALID:",
+                "    {ok} = False",
+            ]
+
+        if guarded:
+            self._line("if {}:".format(ok))
+            self._indent += 1
+        names = {"v": v, "ok": ok}
+        names["option"] = self._literal(option) if "{option}" in "".join(lines) else None
+        names["check"] = self._bind(check) if "{check}" in "".join(lines) else None
+        for line in lines:
+            self._line(line.format(**names))
+        if guarded:
+            self._indent -= 1
+
+    def _emit_serializer(self, step, data, depth):
+        value = "value_{}".format(depth)
+        name = self._literal_key(step.name)
+        child = depth + 1
+        self._line("{} = None".format(value))
+        self._line("if not empty_{}:".format(depth))
+        self._indent += 1
+        self._emit_lookup(step, data, value)
+        self._line("if {} is MISSING:".format(value))
+        self._indent += 1
+        if step.required:
+            self._line("valid_{} = False".format(depth))
+            self._line("errors_{}[{}] = {{{}: REQUIRED}}".format(depth, name, name))
+        else:
+            self._line("{} = None".format(value))
+        self._indent -= 2
+        if step.required:
+            self._line("if {} is not MISSING:".format(value))
+            self._indent += 1
+
+        self._line("data_{} = {}".format(child, value))
+        self._emit_object(step.plan, self._bind(step.node), "data_{}".format(child), child)
+        self._line("if errors_{}:".format(child))
+        self._line("    errors_{}[{}] = errors_{}".format(depth, name, child))
+        condition = "valid_{}".format(child)
+        if step.force_valid:
+            condition += " and not errors_{}".format(child)
+        self._line("if {}:".format(condition))
+        self._line("    validated_{}[{}] = validated_{}".format(depth, name, child))
+        self._line("else:")
+        self._line("    validated_{}[{}] = {{}}".format(depth, name))
+        if step.required:
+            self._indent -= 1
+
+    def _emit_list(self, step, data, depth):
+        from .serializers import ListSerializer
+
+        value = "value_{}".format(depth)
+        name = self._literal_key(step.name)
+        node = step.node
+        default = self._literal(step.default)
+        self._line("{} = {}".format(value, default))
+        self._line("if not empty_{}:".format(depth))
+        self._indent += 1
+        self._emit_lookup(step, data, value)
+        self._line("if {} is MISSING:".format(value))
+        self._indent += 1
+        if step.required:
+            self._line("valid_{} = False".format(depth))
+            self._line("errors_{}[{}] = [REQUIRED]".format(depth, name))
+        else:
+            self._line("{} = {}".format(value, default))
+        self._indent -= 2
+        if step.required:
+            self._line("if {} is not MISSING:".format(value))
+            self._indent += 1
+
+        items = "items_{}".format(depth)
+        item_errors = "item_errors_{}".format(depth)
+        run_validation = six.get_unbound_function(type(node).run_validation)
+        # Lists with their own options (columnar, workers, max_errors, max_length, constraints) keep their
+        # run_validation
+        options = (node._columnar or node._workers or node._executor or node._max_errors
+                   or node._max_length is not None or node._constraints is not None)
+        if options or run_validation is not six.get_unbound_function(ListSerializer.run_validation):
+            self._line("{}, {}, _ = {}.run_validation({})".format(items, item_errors, self._bind(node), value))
+        else:
+            self._emit_list_loop(node, value, items, item_errors, depth)
+        self._line("if {}:".format(item_errors))
+        self._line("    errors_{}[{}] = {}".format(depth, name, item_errors))
+        self._line("validated_{}[{}] = {}".format(depth, name, items))
+        if step.required:
+            self._indent -= 1
+
+    def _emit_list_loop(self, node, value, items, item_errors, depth):
+        child = depth + 1
+        child_plan = node._child._plan
+        self._line("assert isinstance({v}, (list, tuple)) or {v} is None, \\".format(v=value))
+        self._line("    \"\"\" _initial_data must be list or tuple but get {data_type}\"\"\".format(")
+        self._line("        data_type=type({}).__name__)".format(value))
+        self._line("{} = []".format(items))
+        self._line("if {} is None:".format(value))
+        self._line("    {} = [NULL]".format(item_errors))
+        self._line("else:")
+        self._indent += 1
+        self._line("{} = ErrorList()".format(item_errors))
+        self._line("for index_{c}, data_{c} in enumerate({v}):".format(c=child, v=value))
+        self._indent += 1
+        self._emit_object(child_plan, self._bind(node._child), "data_{}".format(child), child)
+        condition = "not valid_{}".format(child)
+        if node._child._force_valid:
+            condition += " or errors_{}".format(child)
+        self._line("if {}:".format(condition))
+        self._line("    validated_{} = {{}}".format(child))
+        self._line("if not errors_{}:".format(child))
+        self._indent += 1
+        self._emit_fill_defaults(child_plan, child)
+        self._line("{}.append(validated_{})".format(items, child))
+        self._indent -= 1
+        self._line("else:")
+        self._indent += 1
+        self._line("{}.add(index_{c}, errors_{c})".format(item_errors, c=child))
+        if not node._force_valid:
+            self._line("if validated_{}:".format(child))
+            self._indent += 1
+            self._emit_fill_defaults(child_plan, child)
+            self._line("{}.append(validated_{})".format(items, child))
+            self._indent -= 1
+        self._indent -= 3
+
+    def _emit_fill_defaults(self, plan, depth):
+        for step in plan.steps:
+            key = self._literal_key(step.name)
+            self._line("if {} not in validated_{}:".format(key, depth))
+            self._line("    validated_{}[{}] = {}".format(depth, key, self._default(step)))
@@ -0,0 +1,169 @@
+"""Constraints between the elements of a list, checked with hash lookups.
+
+``unique_by`` names the field, or the tuple of fields, no two elements may
+share, and ``references`` maps fields of an element to fields some element of
+the same list must have, like a foreign key:
+
+    ItemSerializer(many=True, unique_by="id", references={"parent_id": "id"})
+
+Names are those of the fields of the element serializer, read from the input
+like the fields read them (``source`` first). Values are compared as they were
+sent. Elements that are not objects, or that lack or null a value, are left to
+the validation of their fields.
+
+Errors go to the field of a single-field key and to ``non_field_error`` for
+composite keys, next to the errors of the element itself.
+"""
+from __future__ import absolute_import
+
+import six
+
+from .limits import NON_FIELD_ERROR
+from .plan import MISSING
+from .validator import Rule, _StaticMessageRule
+
+
+def _names(key):
+    if isinstance(key, six.string_types):
+        return (key,)
+    assert isinstance(key, (list, tuple)) and key and all(isinstance(name, six.string_types) for name in key), \
+        """a key must be a field name or a tuple of field names but get {!r}""".format(key)
+    return tuple(key)
+
+
+def _error_key(names):
+    return names[0] if len(names) == 1 else NON_FIELD_ERROR
+
+
+def _column(columns, items, steps):
+    # The key of every element, None for those without one; each key is read once per check
+    names = tuple(step.name for step in steps)
+    keys = columns.get(names)
+    if keys is not None:
+        return keys
+    if len(steps) == 1:
+        # Read as Step.lookup does, source first
+        source = steps[0].source
+        name = steps[0].name
+        if source is None or source == name:
+            keys = [item.get(name) if isinstance(item, dict) else None for item in items]
+        else:
+            keys = [(item[source] if source in item else item.get(name)) if isinstance(item, dict) else None
+                    for item in items]
+        columns[names] = keys
+        return keys
+    keys = []
+    for item in items:
+        if not isinstance(item, dict):
+            keys.append(None)
+            continue
+        values = tuple(step.lookup(item) for step in steps)
+        if any(value is MISSING or value is None for value in values):
+            keys.append(None)
+        else:
+            keys.append(values)
+    columns[names] = keys
+    return keys
+
+
+def _key_set(keys):
+    try:
+        return set(keys)
+    except TypeError:
+        # Unhashable values can not be referred to
+        hashable = set()
+        for key in keys:
+            try:
+                hashable.add(key)
+            except TypeError:
+                pass
+        return hashable
+
+
+class UniqueRule(Rule):
+    __slots__ = ()
+
+    name = "unique"
+    message = "This item has the same {fields} as item {index}"
+
+    # The failing value is the index of the first element with the key, so one rule serves every duplicate
+    def get_message(self, data):
+        return self.message.format(fields=", ".join(self.value), index=data)
+
+    def get_params(self, data):
+        return {"fields": list(self.value), "index": data}
+
+
+class ReferenceRule(_StaticMessageRule):
+    __slots__ = ()
+
+    name = "reference"
+    message = "{fields} must be the {references} of an item in this list"
+
+    def message_params(self):
+        names, target = self.value
+        return {"fields": ", ".join(names), "references": ", ".join(target)}
+
+    def error_params(self):
+        names, target = self.value
+        return {"fields": list(names), "references": list(target)}
+
+
+class Constraints(object):
+    """The ``unique_by`` and ``references`` options of a list of ``serializer_class`` elements."""
+
+    __slots__ = ("serializer_class", "unique_by", "references", "_unique_steps", "_unique_rule")
+
+    def __init__(self, serializer_class, unique_by=None, references=None):
+        assert references is None or isinstance(references, dict), \
+            """references must map keys to the keys they refer to"""
+        self.serializer_class = serializer_class
+        self.unique_by = _names(unique_by) if unique_by is not None else None
+        self._unique_steps = self._steps(self.unique_by) if unique_by is not None else None
+        self._unique_rule = UniqueRule(self.unique_by) if unique_by is not None else None
+        self.references = []
+        for names, target in sorted((_names(key), _names(target)) for key, target in (references or {}).items()):
+            assert len(names) == len(target), \
+                """{} and the key it refers to must have as many fields""".format(", ".join(names))
+            self.references.append((self._steps(names), self._steps(target), ReferenceRule((names, target))))
+
+    def __reduce__(self):
+        references = dict((rule.value[0], rule.value[1]) for _, _, rule in self.references)
+        return self.__class__, (self.serializer_class, self.unique_by, references or None)
+
+    def _steps(self, names):
+        steps = self.serializer_class._plan.steps_by_name
+        for name in names:
+            assert name in steps, """{} has no field {!r}""".format(self.serializer_class.__name__, name)
+        return tuple(steps[name] for name in names)
+
+    def check(self, items):
+        """The errors of the elements breaking a constraint, ``{index: {key: [errors]}}``, or None."""
+        columns = {}
+        errors = {}
+        if self.unique_by is not None:
+            rule = self._unique_rule
+            error_key = _error_key(self.unique_by)
+            first_indices = {}
+            for index, key in enumerate(_column(columns, items, self._unique_steps)):
+                if key is None:
+                    continue
+                try:
+                    first = first_indices.setdefault(key, index)
+                except TypeError:
+                    continue
+                if first != index:
+                    errors.setdefault(index, {}).setdefault(error_key, []).append(rule.get_error(first))
+        for steps, target, rule in self.references:
+            keys = _key_set(_column(columns, items, target))
+            error_key = _error_key(rule.value[0])
+            for index, key in enumerate(_column(columns, items, steps)):
+                if key is None:
+                    continue
+                try:
+                    if key in keys:
+                        continue
+                except TypeError:
+                    continue
+                errors.setdefault(index, {}).setdefault(error_key, []).append(rule.get_error(key))
+        return errors or None
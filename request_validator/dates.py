@@ -0,0 +1,120 @@
+from __future__ import absolute_import
+
+import re
+import datetime
+
+DEFAULT_DATE_FORMAT = "%Y-%m-%d"
+DEFAULT_DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+_ISO_DATE = re.compile(r"([0-9]{4})-([0-9]{2})-([0-9]{2})$")
+_ISO_DATETIME = re.compile(r"([0-9]{4})-([0-9]{2})-([0-9]{2})T([0-9]{2}):([0-9]{2}):([0-9]{2})$")
+_OFFSET = re.compile(r"(?:Z|([+-])([0-9]{2}):?([0-9]{2}))$")
+
+try:
+    _timezone = datetime.timezone
+except AttributeError:
+    class _timezone(datetime.tzinfo):
+        def __init__(self, offset):
+            self._offset = offset
+
+        def utcoffset(self, dt):
+            return self._offset
+
+        def dst(self, dt):
+            return datetime.timedelta(0)
+
+        def tzname(self, dt):
+            return format_offset(self._offset)
+
+        def __reduce__(self):
+            return _timezone, (self._offset,)
+
+UTC = _timezone(datetime.timedelta(0))
+_TIMEZONES = {0: UTC}
+
+
+def get_timezone(minutes):
+    if minutes not in _TIMEZONES:
+        _TIMEZONES[minutes] = _timezone(datetime.timedelta(minutes=minutes))
+    return _TIMEZONES[minutes]
+
+
+def format_offset(offset):
+    minutes = int(offset.total_seconds()) // 60
+    sign = "-" if minutes < 0 else "+"
+    hours, minutes = divmod(abs(minutes), 60)
+    return "{}{:02d}:{:02d}".format(sign, hours, minutes)
+
+
+def split_offset(value):
+    """Split a trailing ``Z``, ``+HH:MM`` or ``+HHMM`` offset from ``value``.
+
+    Returns the remaining string and a tzinfo, or ``None`` when there is no offset.
+    """
+    match = _OFFSET.search(value)
+    if match is None:
+        return value, None
+    sign, hours, minutes = match.groups()
+    if sign is None:
+        return value[:match.start()], UTC
+    hours, minutes = int(hours), int(minutes)
+    if hours > 23 or minutes > 59:
+        return value, None
+    total = hours * 60 + minutes
+    return value[:match.start()], get_timezone(-total if sign == "-" else total)
+
+
+def _from_groups(factory, match):
+    return factory(*[int(part) for part in match.groups()])
+
+
+_date_fromisoformat = getattr(datetime.date, "fromisoformat", None)
+_datetime_fromisoformat = getattr(datetime.datetime, "fromisoformat", None)
+
+
+def parse_iso_date(value):
+    """Parse ``YYYY-MM-DD`` without ``strptime``; ``None`` when ``value`` has another shape."""
+    match = _ISO_DATE.match(value)
+    if match is None:
+        return None
+    if _date_fromisoformat is not None:
+        return _date_fromisoformat(value)
+    return _from_groups(datetime.date, match)
+
+
+def parse_iso_datetime(value):
+    """Parse ``YYYY-MM-DDTHH:MM:SS`` without ``strptime``; ``None`` when ``value`` has another shape."""
+    match = _ISO_DATETIME.match(value)
+    if match is None:
+        return None
+    if _datetime_fromisoformat is not None:
+        return _datetime_fromisoformat(value)
+    return _from_groups(datetime.datetime, match)
+
+
+def parse_date(value, format=DEFAULT_DATE_FORMAT):
+    if format == DEFAULT_DATE_FORMAT:
+        parsed = parse_iso_date(value)
+        if parsed is not None:
+            return parsed
+    return datetime.datetime.strptime(value, format).date()
+
+
+def parse_datetime(value, format=DEFAULT_DATETIME_FORMAT, allow_timezone=False):
+    if allow_timezone:
+        local, tzinfo = split_offset(value)
+        if tzinfo is not None:
+            try:
+                return _parse_naive_datetime(local, format).replace(tzinfo=tzinfo)
+            except ValueError:
+                # e.g. a custom format ending in "-%Y" looks like an offset
+                pass
+    return _parse_naive_datetime(value, format)
+
+
+def _parse_naive_datetime(value, format):
+    if format == DEFAULT_DATETIME_FORMAT:
+        parsed = parse_iso_datetime(value)
+        if parsed is not None:
+            return parsed
+    return datetime.datetime.strptime(value, format)
@@ -0,0 +1,83 @@
+"""Decoding of request bodies for ``Serializer.from_json``.
+
+orjson or ujson are used when installed, the standard library otherwise.
+"""
+from __future__ import absolute_import
+
+import json
+
+import six
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+AUTO = "auto"
+STDLIB = "json"
+ORJSON = "orjson"
+UJSON = "ujson"
+DECODERS = (AUTO, STDLIB, ORJSON, UJSON)
+
+MAX_BODY_SIZE = 1024 * 1024
+
+# Lone surrogates in text still count, as the 3 bytes they take
+_ENCODE_ERRORS = "strict" if six.PY2 else "surrogatepass"
+
+
+class BodyTooLarge(ValueError):
+    def __init__(self, size, limit):
+        super(BodyTooLarge, self).__init__("Body of {} bytes is larger than the limit of {} bytes".format(size, limit))
+        self.size = size
+        self.limit = limit
+
+
+def _as_bytes(raw):
+    if isinstance(raw, memoryview):
+        return raw.tobytes()
+    if isinstance(raw, bytearray):
+        return bytes(raw)
+    return raw
+
+
+def get_loader(name=AUTO):
+    """The ``loads`` function of decoder ``name``; ``"auto"`` picks the fastest one installed."""
+    assert name in DECODERS, """ json decoder must be one of {} but get {!r}""".format(", ".join(DECODERS), name)
+    if name in (AUTO, ORJSON) and orjson is not None:
+        return orjson.loads
+    if name in (AUTO, UJSON) and ujson is not None:
+        return ujson.loads
+    if name in (AUTO, STDLIB):
+        return json.loads
+    raise ImportError("{} is not installed".format(name))
+
+
+def body_size(raw):
+    """The size of ``raw`` in bytes, text counted in UTF-8."""
+    if not isinstance(raw, six.text_type):
+        return len(raw)
+    isascii = getattr(raw, "isascii", None)
+    if isascii is not None and isascii():
+        return len(raw)
+    return len(raw.encode("utf-8", _ENCODE_ERRORS))
+
+
+def check_size(raw, limit):
+    if limit is None:
+        return
+    if isinstance(raw, six.text_type) and 4 * len(raw) <= limit:
+        # Fits at 4 bytes a character, so it is not encoded to be measured
+        return
+    size = body_size(raw)
+    if size > limit:
+        raise BodyTooLarge(size, limit)
+
+
+def loads(raw, decoder=AUTO):
+    """Decode the JSON text ``raw`` (bytes or text) with ``decoder``."""
+    return get_loader(decoder)(_as_bytes(raw))
@@ -0,0 +1,115 @@
+from __future__ import absolute_import
+
+import six
+
+from .slots import PicklableSlots
+
+
+class ErrorDetail(PicklableSlots):
+    """One failed check.
+
+    ``code`` is stable (a rule name, ``"required"``, ``"null"``...) and
+    ``params`` holds the options of the rule; the English ``message`` is
+    only formatted when it is asked for.
+    """
+
+    __slots__ = ("code", "rule", "value", "path", "_message")
+
+    def __init__(self, code, message=None, rule=None, value=None, path=()):
+        self.code = code
+        self.rule = rule
+        self.value = value
+        self.path = path
+        self._message = message
+
+    @property
+    def message(self):
+        if self.rule is None:
+            return self._message
+        return self.rule.get_message(self.value)
+
+    @property
+    def params(self):
+        if self.rule is None:
+            return {}
+        return self.rule.get_params(self.value)
+
+    def at(self, path):
+        return ErrorDetail(self.code, self._message, self.rule, self.value, path)
+
+    def as_dict(self):
+        return {"code": self.code, "message": self.message, "path": list(self.path), "params": self.params}
+
+    def __str__(self):
+        return self.message
+
+    def __repr__(self):
+        return "ErrorDetail(code={!r}, path={!r})".format(self.code, self.path)
+
+    def __eq__(self, other):
+        if isinstance(other, ErrorDetail):
+            return (self.code, self.message, self.path) == (other.code, other.message, other.path)
+        if isinstance(other, six.string_types):
+            return self.message == other
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+
+class ErrorList(list, PicklableSlots):
+    """Errors of the failing elements of a list, with the index of every element."""
+
+    __slots__ = ("indices",)
+
+    def __init__(self):
+        super(ErrorList, self).__init__()
+        self.indices = []
+
+    def add(self, index, errors):
+        self.append(errors)
+        self.indices.append(index)
+
+
+REQUIRED_MESSAGE = "This field is required"
+NULL_MESSAGE = "can not be null !"
+
+REQUIRED = ErrorDetail("required", REQUIRED_MESSAGE)
+NULL = ErrorDetail("null", NULL_MESSAGE)
+
+
+def render_errors(errors):
+    """Return ``errors`` with every ErrorDetail replaced by its message."""
+    if isinstance(errors, ErrorDetail):
+        return errors.message
+    if isinstance(errors, dict):
+        return dict((key, render_errors(value)) for key, value in errors.items())
+    if isinstance(errors, list):
+        return [render_errors(value) for value in errors]
+    return errors
+
+
+def iter_error_details(errors, path=()):
+    """Yield an ErrorDetail with its path for every error in ``errors``.
+
+    Messages raised by ``validate`` hooks are reported with the ``"invalid"`` code.
+    """
+    if isinstance(errors, ErrorDetail):
+        yield errors.at(path)
+    elif isinstance(errors, dict):
+        for key, value in errors.items():
+            for detail in iter_error_details(value, path + (key,)):
+                yield detail
+    elif isinstance(errors, ErrorList):
+        for index, value in zip(errors.indices, errors):
+            for detail in iter_error_details(value, path + (index,)):
+                yield detail
+    elif isinstance(errors, list):
+        for value in errors:
+            for detail in iter_error_details(value, path):
+                yield detail
+    else:
+        yield ErrorDetail("invalid", errors, path=path)
@@ -1,80 +1,126 @@
 from __future__ import absolute_import
+
+import itertools
+import threading
+from collections import OrderedDict
+
+from . import dates
+from .choices import ChoicesFromFile
+from .errors import ErrorList, REQUIRED
+from .plan import MISSING
+from .slots import PicklableSlots
 from .validator import *
+from .validator import _StaticMessageRule
+
+# Shared by fields and nested serializers so declaration order survives class creation
+_creation_order = itertools.count()
 
 
-class Field(object):
-    def __init__(self, source=None, required=False, many=False, default=None, allow_null=True):
+class Field(PicklableSlots):
+    __slots__ = ("_source", "_many", "_rules", "_extra_rules", "_async_rules", "_checks", "_required",
+                 "_default", "_creation_counter", "_list_check")
+
+    # clean only runs _checks, so codegen and columnar validation may run them inline
+    _checks_only = True
+
+    def __init__(self, source=None, required=False, many=False, default=None, allow_null=True,
+                 rules=None):
         self._source = source
-        self._data = None
-        self.data = None
         self._many = many
-        self._errors = []
         self._rules = {}
+        # User rules always run after the type rules the field class adds itself
+        rules = [build_rule(rule) for rule in rules or ()]
+        self._extra_rules = tuple(rule for rule in rules if not rule.is_async)
+        self._async_rules = tuple(rule for rule in rules if rule.is_async)
+        self._checks = self._extra_rules
         self._required = required
         self._default = default
+        self._creation_counter = next(_creation_order)
+        if many:
+            self._list_check = ListRule()
         if not allow_null:
             self.add_rule(Validator.NOT_NULL)
 
-    def set_data(self, data, index):
-        self.data = self._default
-        self._errors = []
-
-        self._data = data
-
-        if not self._data:
-            if self._required:
-                self._errors.append("This field is required")
-            return self
-
-        if self._source in self._data:
-            self.data = self._data[self._source]
-        elif index in self._data:
-            self.data = self._data[index]
-        else:
-            if self._required:
-                self._errors.append("This field is required")
-
-        return self
-
     def is_required(self):
         return self._required
 
     def add_rule(self, rule, value=None):
-        self._rules[rule] = value
-
-    def data(self):
-        return self.data
-
-    def get_errors(self):
-        return self._errors
-
-    def has_error(self):
-        return len(self._errors) != 0
-
-    def validate(self):
-        if not self._many:
-            for rule, value in self._rules.iteritems():
-                validator = Validator(self.data, rule, value)
-                if validator.validate():
-                    self.data = validator.data
-                    continue
-                else:
-                    self._errors.append(validator.get_message())
-        else:
-            assert isinstance(self.data, list) or isinstance(self.data, tuple), \
-                """ data must be list or tuple but get {data_type}""".format(
-                    data_type=type(self.data).__name__)
-            for data in self.data:
-                for rule, value in self._rules.iteritems():
-                    validator = Validator(data, rule, value)
-                    if validator.validate():
-                        continue
-                    else:
-                        self._errors.append(validator.get_message())
-        return not self.has_error()
+        rule = build_rule(rule, value)
+        if rule.is_async:
+            self._async_rules += (rule,)
+            return
+        self._rules[rule.name or id(rule)] = rule
+        self._checks = tuple(self._rules.values()) + self._extra_rules
+
+    def clean(self, value):
+        if self._many:
+            if value is None:
+                return value
+            if not isinstance(value, (list, tuple)):
+                return INVALID
+            for item in value:
+                for check in self._checks:
+                    if check(item) is INVALID:
+                        return INVALID
+            return value
+
+        for check in self._checks:
+            value = check(value)
+            if value is INVALID:
+                return INVALID
+        return value
+
+    def collect_errors(self, value):
+        errors = []
+        if self._many:
+            if not isinstance(value, (list, tuple)):
+                errors.append(self._list_check.get_error(value))
+                return errors
+            for item in value:
+                for check in self._checks:
+                    if _check_quietly(check, item) is INVALID:
+                        errors.append(check.get_error(item))
+            return errors
+
+        for check in self._checks:
+            result = _check_quietly(check, value)
+            if result is INVALID:
+                errors.append(check.get_error(value))
+            else:
+                value = result
+        return errors
+
+    def first_error(self, value):
+        """Error of the first rule ``value`` fails, or None when it passes them all."""
+        if self._many:
+            if not isinstance(value, (list, tuple)):
+                return self._list_check.get_error(value)
+            for item in value:
+                for check in self._checks:
+                    if check(item) is INVALID:
+                        return check.get_error(item)
+            return None
+
+        for check in self._checks:
+            result = check(value)
+            if result is INVALID:
+                return check.get_error(value)
+            value = result
+        return None
+
+
+def _check_quietly(check, value):
+    try:
+        return check(value)
+    except TypeError:
+        # On Python 3 a value that already failed its type rule cannot be compared
+        # with the bounds of the following rules; the type error is reported already
+        return value
 
 
 class CharField(Field):
+    __slots__ = ()
+
     def __init__(self, min_length=None, max_length=None, choices=None, allow_blank=False, *args,
                  **kwargs):
         super(CharField, self).__init__(*args, **kwargs)
@@ -95,12 +141,14 @@ class CharField(Field):
             self.add_rule(Validator.MAX_LEN, max_length)
 
         if choices is not None:
-            assert isinstance(choices, list) or isinstance(choices, tuple), \
-                """choices must be tuple or list"""
+            assert isinstance(choices, (list, tuple, set, frozenset, ChoicesFromFile)), \
+                """choices must be tuple, list, set or ChoicesFromFile"""
             self.add_rule(Validator.IN, choices)
 
 
 class IntField(Field):
+    __slots__ = ()
+
     def __init__(self, min_value=None, max_value=None, choices=None, *args,
                  **kwargs):
         super(IntField, self).__init__(*args, **kwargs)
@@ -115,24 +163,26 @@ class IntField(Field):
         if max_value is not None:
             assert isinstance(max_value, int), \
                 """max_length must be integer"""
-            self.add_rule(Validator.MAX_LEN, max_value)
+            self.add_rule(Validator.MAX_VALUE, max_value)
 
         if choices is not None:
-            assert isinstance(choices, list) or isinstance(choices, tuple), \
-                """choices must be tuple or list"""
+            assert isinstance(choices, (list, tuple, set, frozenset)), \
+                """choices must be tuple, list or set"""
             for choice in choices:
                 assert isinstance(choice, int), \
                     """
                     choices must be list or tuple of integer but get {data_type}
-                    """.format(data_type=type(choice).__name_)
+                    """.format(data_type=type(choice).__name__)
             self.add_rule(Validator.IN, choices)
 
 
 class IntegerField(IntField):
-    pass
+    __slots__ = ()
 
 
 class FloatField(Field):
+    __slots__ = ()
+
     def __init__(self, min_value=None, max_value=None, choices=None, *args,
                  **kwargs):
         super(FloatField, self).__init__(*args, **kwargs)
@@ -147,20 +197,22 @@ class FloatField(Field):
         if max_value is not None:
             assert isinstance(max_value, float), \
                 """max_length must be integer"""
-            self.add_rule(Validator.MAX_LEN, max_value)
+            self.add_rule(Validator.MAX_VALUE, max_value)
 
         if choices is not None:
-            assert isinstance(choices, list) or isinstance(choices, tuple), \
-                """choices must be tuple or list"""
+            assert isinstance(choices, (list, tuple, set, frozenset)), \
+                """choices must be tuple, list or set"""
             for choice in choices:
                 assert isinstance(choice, float), \
                     """
                     choices must be list or tuple of integer but get {data_type}
-                    """.format(data_type=type(choice).__name_)
+                    """.format(data_type=type(choice).__name__)
             self.add_rule(Validator.IN, choices)
 
 
 class RegexField(CharField):
+    __slots__ = ()
+
     def __init__(self, pattern, *args, **kwargs):
         super(RegexField, self).__init__(*args, **kwargs)
 
@@ -168,34 +220,245 @@ class RegexField(CharField):
 
 
 class DateField(Field):
-    def __init__(self, format=None, convert_to_date=False, *args, **kwargs):
+    __slots__ = ("_format",)
+
+    def __init__(self, format=None, convert_to_date=False, cache_size=None, *args, **kwargs):
         super(DateField, self).__init__(*args, **kwargs)
         if format:
             self._format = format
         else:
-            self._format = "%Y-%m-%d"
+            self._format = dates.DEFAULT_DATE_FORMAT
 
-        self.add_rule(Validator.DATE, {"format": self._format, "convert_to_date": convert_to_date})
+        self.add_rule(Validator.DATE, {"format": self._format, "convert_to_date": convert_to_date,
+                                       "cache_size": cache_size})
 
 
 class DateTimeField(Field):
-    def __init__(self, format=None, convert_to_datetime=False, *args, **kwargs):
+    __slots__ = ("_format",)
+
+    def __init__(self, format=None, convert_to_datetime=False, allow_timezone=False, cache_size=None,
+                 *args, **kwargs):
         super(DateTimeField, self).__init__(*args, **kwargs)
         if format:
             self._format = format
         else:
-            self._format = "%Y-%m-%dT%H:%M:%S"
+            self._format = dates.DEFAULT_DATETIME_FORMAT
 
-        self.add_rule(Validator.DATETIME, {"format": self._format, "convert_to_datetime": convert_to_datetime})
+        self.add_rule(Validator.DATETIME, {"format": self._format, "convert_to_datetime": convert_to_datetime,
+                                           "allow_timezone": allow_timezone, "cache_size": cache_size})
 
 
 class BooleanField(Field):
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         super(BooleanField, self).__init__(*args, **kwargs)
         self.add_rule(Validator.BOOLEAN)
 
 
 class ListField(Field):
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         super(ListField, self).__init__(*args, **kwargs)
         self.add_rule(Validator.LIST)
+
+
+# Shared by every OneOfField, counting is short
+_counts_lock = threading.Lock()
+
+# Per thread, id of a OneOfField -> (value, errors) of the last value its clean rejected
+_failures = threading.local()
+
+
+class _TagRule(Rule):
+    __slots__ = ()
+
+    name = "unknown_tag"
+    message = "\"{data}\" is not a known type"
+
+    def error_params(self):
+        return {"choices": sorted(self.value, key=str)}
+
+
+class _ObjectRule(Rule):
+    __slots__ = ()
+
+    name = "object"
+    message = "This field must be object but get {data_type}"
+
+
+class _NoMatchRule(_StaticMessageRule):
+    __slots__ = ()
+
+    name = "no_match"
+    message = "This field matches none of ({choices})"
+
+    def message_params(self):
+        return {"choices": ",".join(self.value)}
+
+    def error_params(self):
+        return {"choices": list(self.value)}
+
+
+class OneOfField(Field):
+    """A value validated by one of several serializers.
+
+    With ``discriminator`` the serializer is looked up in ``choices`` (tag ->
+    serializer class) by the value of that key; without one ``choices`` is a
+    sequence of serializer classes tried in order, and the first the value is
+    valid for is used. With ``many`` every item of a list is dispatched on its
+    own. ``counts()`` tells how many values every choice took.
+    """
+    __slots__ = ("_discriminator", "_choices", "_tag_error", "_object_error", "_no_match_error", "_counts",
+                 "_unmatched")
+
+    # clean does more than run _checks, so codegen and columnar validation must call it
+    _checks_only = False
+
+    def __init__(self, choices, discriminator=None, *args, **kwargs):
+        super(OneOfField, self).__init__(*args, **kwargs)
+        assert not self._async_rules, """OneOfField does not take async rules"""
+        if discriminator is None:
+            assert isinstance(choices, (list, tuple)), """choices must be a list of serializers"""
+            choices = OrderedDict((serializer.__name__, serializer) for serializer in choices)
+        else:
+            assert isinstance(choices, dict), """choices must map tags to serializers"""
+        self._discriminator = discriminator
+        # Every choice validates with one shared instance, like the elements of a ListSerializer
+        self._choices = OrderedDict((key, serializer()) for key, serializer in choices.items())
+        for key, child in self._choices.items():
+            assert not child._plan.is_async, """{} has async validators""".format(type(child).__name__)
+        self._tag_error = _TagRule(list(self._choices))
+        self._object_error = _ObjectRule()
+        self._no_match_error = _NoMatchRule(list(self._choices))
+        self._counts = dict.fromkeys(self._choices, 0)
+        self._unmatched = 0
+
+    def counts(self):
+        """``{"choices": {tag: values}, "unmatched": values}`` since the field was created.
+
+        Without a discriminator the choices are counted by serializer name;
+        ``unmatched`` counts the values no choice took.
+        """
+        with _counts_lock:
+            return {"choices": dict(self._counts), "unmatched": self._unmatched}
+
+    def reset_counts(self):
+        with _counts_lock:
+            self._counts = dict.fromkeys(self._choices, 0)
+            self._unmatched = 0
+
+    def clean(self, value):
+        if self._many:
+            if value is None:
+                return value
+            if not isinstance(value, (list, tuple)):
+                return INVALID
+            # Every item is validated and counted, even after one failed
+            results = [self._validate(item) for item in value]
+            self._count(key for key, _, _ in results)
+            items = [item_data for _, item_data, _ in results]
+            if any(item_data is None for item_data in items):
+                errors = ErrorList()
+                for index, (_, _, item_errors) in enumerate(results):
+                    if item_errors:
+                        errors.add(index, item_errors)
+                self._remember(value, errors)
+                return INVALID
+            return items
+
+        original = value
+        for check in self._checks:
+            value = check(value)
+            if value is INVALID:
+                return INVALID
+        if value is None:
+            return value
+        key, item_data, item_errors = self._validate(value)
+        self._count((key,))
+        if item_data is None:
+            self._remember(original, item_errors)
+            return INVALID
+        return item_data
+
+    # Every caller of clean asks collect_errors for the errors of a rejected value
+    # right after, so they are kept from clean instead of validating the value again
+    def _remember(self, value, errors):
+        failures = getattr(_failures, "errors", None)
+        if failures is None:
+            failures = _failures.errors = {}
+        failures[id(self)] = value, errors
+
+    def _recall(self, value):
+        failures = getattr(_failures, "errors", None)
+        if not failures:
+            return None
+        found = failures.pop(id(self), None)
+        if found is None or found[0] is not value:
+            return None
+        return found[1]
+
+    def _count(self, keys):
+        with _counts_lock:
+            for key in keys:
+                if key is None:
+                    self._unmatched += 1
+                else:
+                    self._counts[key] += 1
+
+    def _validate(self, item):
+        # (key of the choice that took the item or None, validated data or None, errors)
+        if not isinstance(item, dict):
+            return None, None, [self._object_error.get_error(item)]
+        if self._discriminator is None:
+            for key, child in self._choices.items():
+                item_data, item_errors, _ = child._plan.run(child, item)
+                if not item_errors:
+                    return key, child._plan.fill_defaults(item_data), None
+            return None, None, [self._no_match_error.get_error(item)]
+
+        tag = item.get(self._discriminator, MISSING)
+        if tag is MISSING:
+            return None, None, {self._discriminator: [REQUIRED]}
+        try:
+            child = self._choices.get(tag)
+        except TypeError:
+            child = None
+        if child is None:
+            return None, None, {self._discriminator: [self._tag_error.get_error(tag)]}
+        item_data, item_errors, _ = child._plan.run(child, item)
+        if item_errors:
+            return tag, None, item_errors
+        return tag, child._plan.fill_defaults(item_data), None
+
+    def collect_errors(self, value):
+        errors = self._recall(value)
+        if errors is not None:
+            return errors
+        if self._many:
+            if not isinstance(value, (list, tuple)):
+                return [self._list_check.get_error(value)]
+            errors = ErrorList()
+            for index, item in enumerate(value):
+                item_errors = self._validate(item)[2]
+                if item_errors:
+                    errors.add(index, item_errors)
+            return errors
+
+        errors = []
+        for check in self._checks:
+            result = _check_quietly(check, value)
+            if result is INVALID:
+                errors.append(check.get_error(value))
+            else:
+                value = result
+        if errors or value is None:
+            return errors
+        return self._validate(value)[2]
+
+    def first_error(self, value):
+        errors = self.collect_errors(value)
+        if isinstance(errors, dict):
+            return errors
+        return errors[0] if errors else None
@@ -0,0 +1,288 @@
+"""Revalidation of a document that changed a little since it was last validated.
+
+Every run keeps, per serializer level and per list element, the input it saw
+and the outcome of every step. The next run compares the new input with it
+(or follows an explicit set of changed paths) and only validates again the
+steps whose input changed; ``validate`` hooks run again only on the levels
+that contain a change. The results are those of ``Plan.run``.
+"""
+from __future__ import absolute_import
+
+from .errors import NULL, REQUIRED
+from .plan import FIELD, SERIALIZER, MISSING
+from .validator import INVALID
+
+
+class _All(object):
+    def __repr__(self):
+        return "ALL"
+
+
+# Marks a path whose whole subtree changed
+ALL = _All()
+
+
+def changed_tree(paths):
+    """Nest changed paths, e.g. ``[("items", 3, "name")]``, into ``{"items": {3: {"name": ALL}}}``."""
+    tree = {}
+    for path in paths:
+        path = tuple(path)
+        if not path:
+            return ALL
+        node = tree
+        for key in path[:-1]:
+            child = node.get(key)
+            if child is ALL:
+                break
+            if child is None:
+                child = node[key] = {}
+            node = child
+        else:
+            node[path[-1]] = ALL
+    return tree
+
+
+def same(old, new):
+    """Whether two inputs are equal, types included (``1``, ``1.0`` and ``True`` validate differently)."""
+    if old is new:
+        return True
+    if type(old) is not type(new):
+        return False
+    if isinstance(old, dict):
+        if len(old) != len(new):
+            return False
+        for key, value in old.items():
+            if key not in new or not same(value, new[key]):
+                return False
+        return True
+    if isinstance(old, (list, tuple)):
+        return len(old) == len(new) and all(same(a, b) for a, b in zip(old, new))
+    return old == new
+
+
+class Level(object):
+    """What one run of a plan saw and found."""
+
+    __slots__ = ("input", "data", "hook_errors", "outcomes")
+
+    def __init__(self, input, data, hook_errors, outcomes):
+        self.input = input
+        # The input as the validate hook returned it
+        self.data = data
+        self.hook_errors = hook_errors
+        # name -> (validated value or MISSING, errors, required and missing, state of the nested run)
+        self.outcomes = outcomes
+
+
+class Elements(object):
+    """What one run of a list saw and found, per element."""
+
+    __slots__ = ("items", "results", "levels", "validated_data", "errors")
+
+    def __init__(self, items, results, levels, validated_data, errors):
+        self.items = items
+        self.results = results
+        self.levels = levels
+        self.validated_data = validated_data
+        self.errors = errors
+
+
+def run(plan, owner, data, state=None, tree=None):
+    """Return ``(validated, errors, all_fields_valid, state)``.
+
+    ``state`` comes from the previous run (None validates everything) and
+    ``tree`` from ``changed_tree`` (None compares the inputs instead).
+    """
+    if tree is ALL or (state is not None and bool(state.input) != bool(data)):
+        # Required nested values are only checked in a non-empty input, so a change of emptiness changes them all
+        state = None
+    changed = None
+    if state is not None:
+        if tree is not None:
+            changed = _tree_steps(plan, tree)
+        elif plan.hook:
+            # The hook sees the whole input, declared or not
+            changed = {} if same(state.input, data) else None
+        else:
+            changed = _changed_steps(plan, state.data, data)
+        if changed == {} and not (plan.hook and tree):
+            # A changed path no step reads may still be read by the hook
+            return _compose(plan, state.hook_errors, state.outcomes) + (state,)
+
+    input = data
+    hook_errors = []
+    if plan.hook:
+        hook_errors, data = owner._check_user_validation(data)
+        if state is not None and bool(state.data) != bool(data):
+            state = None
+        if state is not None and (changed is None or data is not input or state.data is not state.input):
+            # Changed paths name keys of the input, not of what the hook made of it
+            changed = _changed_steps(plan, state.data, data)
+
+    outcomes = {}
+    for step in plan.steps:
+        name = step.name
+        if state is None:
+            outcomes[name] = _run_step(step, data, None, ALL)
+        elif name in changed:
+            subtree = changed[name]
+            outcomes[name] = _run_step(step, data, state.outcomes[name][3], None if subtree is True else subtree)
+        else:
+            outcomes[name] = state.outcomes[name]
+    return _compose(plan, hook_errors, outcomes) + (Level(input, data, hook_errors, outcomes),)
+
+
+def _tree_steps(plan, tree):
+    changed = {}
+    for step in plan.steps:
+        subtree = _subtree(tree, step)
+        if subtree is not None:
+            changed[step.name] = subtree
+    return changed
+
+
+def _subtree(tree, step):
+    subtrees = [tree[key] for key in (step.source, step.name) if key is not None and key in tree]
+    if not subtrees:
+        return None
+    if len(subtrees) == 1:
+        return subtrees[0]
+    return ALL
+
+
+def _changed_steps(plan, old, new):
+    """``{name: True}`` for the steps whose value differs between two inputs."""
+    changed = {}
+    for step in plan.steps:
+        if not same(_lookup(step, old), _lookup(step, new)):
+            changed[step.name] = True
+    return changed
+
+
+def _lookup(step, data):
+    if not data:
+        return MISSING
+    return step.lookup(data)
+
+
+def _compose(plan, hook_errors, outcomes):
+    # Same order and precedence as Plan.run: hook errors first, overridden by the steps
+    validated = {}
+    errors = {}
+    all_fields_valid = not hook_errors
+    for error in hook_errors:
+        errors.update(error)
+    for step in plan.steps:
+        value, step_errors, missing, _ = outcomes[step.name]
+        if missing:
+            all_fields_valid = False
+        if step_errors:
+            errors[step.name] = step_errors
+        if value is not MISSING:
+            validated[step.name] = value
+    return validated, errors, all_fields_valid
+
+
+def _run_step(step, data, previous, subtree):
+    name = step.name
+    if step.kind is FIELD:
+        value = step.lookup(data)
+        if value is MISSING:
+            if step.required:
+                return MISSING, [REQUIRED], True, None
+            value = step.get_default()
+        field = step.node
+        result = field.clean(value)
+        if result is INVALID:
+            return MISSING, field.collect_errors(value), False, None
+        return result, None, False, None
+
+    if step.kind is SERIALIZER:
+        value = None
+        if data:
+            value = step.lookup(data)
+            if value is MISSING:
+                if step.required:
+                    return MISSING, {name: REQUIRED}, True, None
+                value = None
+        nested_data, nested_errors, nested_valid, level = run(step.plan, step.node, value, previous, subtree)
+        if not nested_valid or (step.force_valid and nested_errors):
+            nested_data = {}
+        return nested_data, nested_errors, False, level
+
+    value = step.default
+    if data:
+        value = step.lookup(data)
+        if value is MISSING:
+            if step.required:
+                return MISSING, [REQUIRED], True, None
+            value = step.default
+    list_data, list_errors, elements = run_list(step.node, value, previous, subtree)
+    return list_data, list_errors, False, elements
+
+
+def run_list(list_serializer, items, state=None, tree=None):
+    """Return ``(validated_data, errors, state)`` of a list, like ``run_validation``."""
+    list_serializer._check_initial_data(items)
+    if items is None:
+        return [], [NULL], None
+    list_errors = list_serializer.list_errors(items)
+    if list_errors:
+        return [], list_errors, None
+    if list_serializer._max_errors is not None:
+        # A run cut short by the error budget does not know every element
+        validated_data, errors, _ = list_serializer.run_validation(items)
+        return validated_data, errors, None
+    if tree is ALL or (tree is not None and state is not None and len(items) != len(state.items)):
+        # Indices of changed paths do not say where elements moved when the length changed
+        state = None
+
+    child = list_serializer._child
+    plan = child._plan
+    same_length = state is not None and len(items) == len(state.items)
+    if same_length and tree is not None:
+        # Only the listed elements are looked at
+        results = list(state.results)
+        levels = list(state.levels)
+        changed = sorted(index for index in tree if isinstance(index, int) and 0 <= index < len(items))
+        for index in changed:
+            item_data, item_errors, item_valid, levels[index] = run(
+                plan, child, items[index], state.levels[index], tree[index])
+            results[index] = item_data, item_errors, item_valid
+    else:
+        results = []
+        levels = []
+        changed = []
+        for index, item in enumerate(items):
+            if state is not None and index < len(state.items):
+                if tree is not None:
+                    subtree = tree.get(index)
+                    unchanged = subtree is None
+                else:
+                    subtree = None
+                    unchanged = same(state.items[index], item)
+                if unchanged:
+                    results.append(state.results[index])
+                    levels.append(state.levels[index])
+                    continue
+                item_data, item_errors, item_valid, level = run(plan, child, item, state.levels[index], subtree)
+            else:
+                item_data, item_errors, item_valid, level = run(plan, child, item)
+            changed.append(index)
+            results.append((item_data, item_errors, item_valid))
+            levels.append(level)
+
+    constraint_errors = list_serializer.constraint_errors(items)
+    if same_length and not state.errors and not constraint_errors and not any(results[index][1] for index in changed):
+        # Without errors every element has its own place in the validated data
+        validated_data = list(state.validated_data)
+        errors = state.errors
+        child_force_valid = child._force_valid
+        for index in changed:
+            item_data, item_errors, item_valid = results[index]
+            if not item_valid or (child_force_valid and item_errors):
+                item_data = {}
+            validated_data[index] = plan.fill_defaults(item_data)
+    else:
+        validated_data, errors, _ = list_serializer.merge_items(results, constraint_errors=constraint_errors)
+    return validated_data, errors, Elements(list(items), results, levels, validated_data, errors)
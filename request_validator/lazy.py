@@ -0,0 +1,92 @@
+"""Validated data that is only validated as it is read."""
+from __future__ import absolute_import
+
+try:
+    from collections.abc import Mapping
+except ImportError:  # Python 2
+    from collections import Mapping
+
+from .errors import REQUIRED, render_errors
+from .plan import FIELD, SERIALIZER, MISSING
+from .serializers import ValidationError
+from .validator import INVALID
+
+
+class ValidatedMapping(Mapping):
+    """A read-only mapping over the input of a serializer.
+
+    Every declared field is validated (and converted) the first time it is
+    read and remembered after that; a field that is not valid raises
+    ValidationError with its errors. Nested serializers are lazy mappings
+    themselves. ``to_dict()`` validates what is left and returns plain dicts.
+    """
+
+    __slots__ = ("_plan", "_owner", "_input", "_values")
+
+    def __init__(self, plan, owner, data):
+        assert not plan.is_async, """{} has async validators""".format(type(owner).__name__)
+        if plan.hook:
+            # The hook sees and may change the whole input, so it can not wait for a read
+            hook_errors, data = owner._check_user_validation(data)
+            if hook_errors:
+                raise ValidationError(hook_errors)
+        self._plan = plan
+        self._owner = owner
+        self._input = data
+        self._values = {}
+
+    def __getitem__(self, name):
+        try:
+            return self._values[name]
+        except KeyError:
+            pass
+        step = self._plan.steps_by_name[name]
+        value = self._values[name] = self._validate(step)
+        return value
+
+    def _validate(self, step):
+        name = step.name
+        data = self._input
+        if step.kind is FIELD:
+            value = step.lookup(data)
+            if value is MISSING:
+                if step.required:
+                    raise ValidationError({name: render_errors([REQUIRED])})
+                value = step.get_default()
+            result = step.node.clean(value)
+            if result is INVALID:
+                raise ValidationError({name: render_errors(step.node.collect_errors(value))})
+            return result
+
+        # Like Plan.run, an empty input is not checked for required nested values
+        value = None if step.kind is SERIALIZER else step.default
+        if data:
+            value = step.lookup(data)
+            if value is MISSING:
+                if step.required:
+                    missing = {name: REQUIRED} if step.kind is SERIALIZER else [REQUIRED]
+                    raise ValidationError({name: render_errors(missing)})
+                value = None if step.kind is SERIALIZER else step.default
+        if step.kind is SERIALIZER:
+            return ValidatedMapping(step.plan, step.node, value)
+        list_data, list_errors, _ = step.node.run_validation(value)
+        if list_errors:
+            raise ValidationError({name: render_errors(list_errors)})
+        return list_data
+
+    def __iter__(self):
+        return iter(self._plan.steps_by_name)
+
+    def __len__(self):
+        return len(self._plan.steps)
+
+    def __contains__(self, name):
+        return name in self._plan.steps_by_name
+
+    def __repr__(self):
+        return "<ValidatedMapping of {}: {} of {} read>".format(
+            type(self._owner).__name__, len(self._values), len(self))
+
+    def to_dict(self):
+        return dict((name, value.to_dict() if isinstance(value, ValidatedMapping) else value)
+                    for name, value in self.items())
@@ -0,0 +1,226 @@
+"""Limits on the size of a document, checked in one pass before it is validated.
+
+A serializer uses ``Meta.limits`` when it has one and the global limits set
+with ``set_default`` otherwise; nested serializers and list elements are part
+of the document of the serializer ``is_valid`` is called on.
+"""
+from __future__ import absolute_import
+
+import six
+
+from .errors import ErrorList
+from .plan import LIST, SERIALIZER
+from .validator import INVALID, _StaticMessageRule
+
+NON_FIELD_ERROR = "non_field_error"
+
+_CONTAINERS = (dict, list, tuple)
+
+
+class _LimitRule(_StaticMessageRule):
+    __slots__ = ()
+
+    def message_params(self):
+        return {"limit": self.value}
+
+    def error_params(self):
+        return {"limit": self.value}
+
+
+class MaxDepthRule(_LimitRule):
+    __slots__ = ()
+
+    name = "max_depth"
+    message = "The data must not be nested deeper than {limit} levels"
+
+
+class MaxNodesRule(_LimitRule):
+    __slots__ = ()
+
+    name = "max_nodes"
+    message = "The data must not have more than {limit} values"
+
+
+class MaxListLengthRule(_LimitRule):
+    __slots__ = ()
+
+    name = "max_list_length"
+    message = "This list must not have more than {limit} items"
+
+    def __call__(self, data):
+        if data is None or len(data) <= self.value:
+            return data
+        return INVALID
+
+
+class MaxStringLengthRule(_LimitRule):
+    __slots__ = ()
+
+    name = "max_string_length"
+    message = "This string must not be longer than {limit} characters"
+
+
+class Limits(object):
+    """Maximum nesting depth, number of values, list length and string length of a document.
+
+    Limits left as None are not checked; a document within all of them is
+    walked once, strings and lists are measured before any rule sees them.
+    """
+
+    __slots__ = ("max_depth", "max_nodes", "max_list_length", "max_string_length")
+
+    def __init__(self, max_depth=None, max_nodes=None, max_list_length=None, max_string_length=None):
+        for name, limit in (("max_depth", max_depth), ("max_nodes", max_nodes),
+                            ("max_list_length", max_list_length), ("max_string_length", max_string_length)):
+            assert limit is None or (isinstance(limit, int) and limit > 0), \
+                """{} must be a positive integer""".format(name)
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.max_list_length = max_list_length
+        self.max_string_length = max_string_length
+
+    def __reduce__(self):
+        return self.__class__, (self.max_depth, self.max_nodes, self.max_list_length, self.max_string_length)
+
+    @property
+    def enabled(self):
+        return any((self.max_depth, self.max_nodes, self.max_list_length, self.max_string_length))
+
+    def check(self, data):
+        """The first limit ``data`` exceeds as ``(path, ErrorDetail)``, or None."""
+        if self.fits(data):
+            return None
+        return self._locate(data)
+
+    def fits(self, data):
+        """Whether ``data`` is within every limit, found level by level without keeping paths."""
+        max_depth = self.max_depth
+        max_nodes = self.max_nodes
+        max_list_length = self.max_list_length
+        max_string_length = self.max_string_length
+        string_types = six.string_types
+        nodes = 1
+        depth = 1
+        level = [data]
+        while level:
+            if max_depth and depth > max_depth:
+                return False
+            containers = []
+            for value in level:
+                if isinstance(value, dict):
+                    children = value.values()
+                else:
+                    if max_list_length and len(value) > max_list_length:
+                        return False
+                    children = value
+                nodes += len(value)
+                if max_nodes and nodes > max_nodes:
+                    return False
+                if max_string_length:
+                    for child in children:
+                        if isinstance(child, _CONTAINERS):
+                            containers.append(child)
+                        elif isinstance(child, string_types) and len(child) > max_string_length:
+                            return False
+                else:
+                    containers.extend([child for child in children if isinstance(child, _CONTAINERS)])
+            level = containers
+            depth += 1
+        return True
+
+    def _locate(self, data):
+        # Only walked for data over a limit, so it can afford to keep the path of every container
+        max_depth = self.max_depth
+        max_nodes = self.max_nodes
+        max_list_length = self.max_list_length
+        max_string_length = self.max_string_length
+        nodes = 1
+        stack = [((), data, 1)]
+        while stack:
+            path, value, depth = stack.pop()
+            if isinstance(value, dict):
+                children = six.iteritems(value)
+            else:
+                if max_list_length and len(value) > max_list_length:
+                    return path, MaxListLengthRule(max_list_length).get_error(value)
+                children = enumerate(value)
+            if max_depth and depth > max_depth:
+                return path, MaxDepthRule(max_depth).get_error(value)
+            nodes += len(value)
+            if max_nodes and nodes > max_nodes:
+                return (), MaxNodesRule(max_nodes).get_error(data)
+            for key, child in children:
+                if isinstance(child, _CONTAINERS):
+                    stack.append((path + (key,), child, depth + 1))
+                elif max_string_length and isinstance(child, six.string_types) and len(child) > max_string_length:
+                    return path + (key,), MaxStringLengthRule(max_string_length).get_error(child)
+        return None
+
+
+_default = Limits()
+
+
+def set_default(limits):
+    """Use ``limits`` for every serializer without ``Meta.limits``."""
+    global _default
+    assert isinstance(limits, Limits), """limits must be a Limits but get {}""".format(type(limits).__name__)
+    _default = limits
+
+
+def get_default():
+    return _default
+
+
+def check_document(limits, data, many=False, plan=None):
+    """The errors of a document that exceeds ``limits`` (default: the global ones), or None.
+
+    The error is reported at the path where the limit was exceeded, with
+    ``non_field_error`` standing for the root of a serializer. With the
+    ``plan`` of the serializer (of its elements when ``many``) the path is
+    made of field names, like the other errors of the serializer.
+    """
+    if limits is None:
+        limits = _default
+    if not limits.enabled or not isinstance(data, _CONTAINERS):
+        return None
+    found = limits.check(data)
+    if found is None:
+        return None
+    path, detail = found
+    if plan is not None:
+        path = _field_path(plan, path, many)
+    if not path:
+        return [detail] if many else {NON_FIELD_ERROR: detail}
+    errors = [detail]
+    for key in reversed(path):
+        if isinstance(key, int):
+            items = ErrorList()
+            items.add(key, errors)
+            errors = items
+        else:
+            errors = {key: errors}
+    return errors
+
+
+def _field_path(plan, path, many):
+    # Input keys to field names, down to the field holding the value; the errors of a field are a flat list
+    path = list(path)
+    names = []
+    if many and path:
+        names.append(path.pop(0))
+    while path:
+        steps = plan._steps_by_key.get(path.pop(0))
+        if not steps:
+            # No field reads that key, so the serializer reports it
+            names.append(NON_FIELD_ERROR)
+            break
+        step = steps[0][1]
+        names.append(step.name)
+        if step.kind is SERIALIZER:
+            plan = step.plan
+        elif step.kind is LIST and path:
+            names.append(path.pop(0))
+            plan = step.node._child._plan
+        else:
+            break
+    return tuple(names)
@@ -0,0 +1,237 @@
+"""Timing and counting of validation runs.
+
+An observer given to ``is_valid(observer=...)``, or set as ``Meta.observer``,
+is called after every field, nested serializer, list element and ``validate``
+hook with how long it took and the errors it found. Runs without an observer
+never come here, so they cost nothing extra.
+"""
+from __future__ import absolute_import, division
+
+import threading
+import timeit
+
+import six
+
+from .errors import NULL, REQUIRED, iter_error_details
+from .plan import FIELD, SERIALIZER, MISSING
+from .validator import INVALID
+
+_clock = timeit.default_timer
+
+
+class Observer(object):
+    """Base class of observers; every callback does nothing.
+
+    ``root`` is the serializer ``is_valid`` was called on, ``path`` the keys
+    and list indices leading to the value (``()`` for the root itself) and
+    ``errors`` what was found there, empty when the value is valid.
+    """
+
+    def field(self, root, path, field, duration, errors):
+        pass
+
+    def serializer(self, root, path, duration, errors):
+        pass
+
+    def list_item(self, root, path, duration, errors):
+        pass
+
+    def hook(self, root, path, duration, errors):
+        pass
+
+
+def run_plan(plan, owner, data, observer, root, path=()):
+    """``Plan.run`` telling ``observer`` about every step."""
+    validated = {}
+    errors = {}
+    all_fields_valid = True
+
+    if plan.hook:
+        started = _clock()
+        hook_errors, data = owner._check_user_validation(data)
+        observer.hook(root, path, _clock() - started, hook_errors)
+        if hook_errors:
+            all_fields_valid = False
+            for error in hook_errors:
+                errors.update(error)
+
+    for step in plan.steps:
+        name = step.name
+        step_path = path + (name,)
+        kind = step.kind
+        if kind is FIELD:
+            value = step.lookup(data)
+            if value is MISSING:
+                if step.required:
+                    all_fields_valid = False
+                    errors[name] = [REQUIRED]
+                    observer.field(root, step_path, step.node, 0.0, errors[name])
+                    continue
+                value = step.get_default()
+            field = step.node
+            started = _clock()
+            result = field.clean(value)
+            if result is INVALID:
+                errors[name] = field.collect_errors(value)
+            observer.field(root, step_path, field, _clock() - started, errors.get(name, ()))
+            if result is not INVALID:
+                validated[name] = result
+        elif kind is SERIALIZER:
+            value = None
+            if data:
+                value = step.lookup(data)
+                if value is MISSING:
+                    if step.required:
+                        all_fields_valid = False
+                        errors[name] = {name: REQUIRED}
+                        observer.serializer(root, step_path, 0.0, errors[name])
+                        continue
+                    value = None
+            started = _clock()
+            nested_data, nested_errors, nested_valid = run_plan(step.plan, step.node, value, observer, root,
+                                                                step_path)
+            observer.serializer(root, step_path, _clock() - started, nested_errors)
+            if nested_errors:
+                errors[name] = nested_errors
+            if nested_valid and not (step.force_valid and nested_errors):
+                validated[name] = nested_data
+            else:
+                validated[name] = {}
+        else:
+            value = step.default
+            if data:
+                value = step.lookup(data)
+                if value is MISSING:
+                    if step.required:
+                        all_fields_valid = False
+                        errors[name] = [REQUIRED]
+                        observer.serializer(root, step_path, 0.0, errors[name])
+                        continue
+                    value = step.default
+            started = _clock()
+            list_data, list_errors, _ = run_list(step.node, value, observer, root, step_path)
+            observer.serializer(root, step_path, _clock() - started, list_errors)
+            if list_errors:
+                errors[name] = list_errors
+            validated[name] = list_data
+
+    return validated, errors, all_fields_valid
+
+
+def run_list(list_serializer, initial_data, observer, root, path=()):
+    """``ListSerializer.run_validation`` telling ``observer`` about every element.
+
+    Elements are validated one by one, without columnar checks or workers.
+    """
+    list_serializer._check_initial_data(initial_data)
+    if initial_data is None:
+        return [], [NULL], []
+    list_errors = list_serializer.list_errors(initial_data)
+    if list_errors:
+        return [], list_errors, []
+    return list_serializer.merge_items(_run_items(list_serializer, initial_data, observer, root, path),
+                                       list_serializer._max_errors,
+                                       constraint_errors=list_serializer.constraint_errors(initial_data))
+
+
+def _run_items(list_serializer, items, observer, root, path):
+    child = list_serializer._child
+    plan = child._plan
+    for index, item in enumerate(items):
+        started = _clock()
+        result = run_plan(plan, child, item, observer, root, path + (index,))
+        observer.list_item(root, path + (index,), _clock() - started, result[1])
+        yield result
+
+
+class StatsCollector(Observer):
+    """Aggregates calls, failures and time per serializer class and path.
+
+    List indices are folded into ``*`` so every element of a list adds to the
+    same path, e.g. ``items.*.price``. Fields and hooks also count their
+    failures per error code.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._paths = {}
+        self._codes = {}
+
+    def field(self, root, path, field, duration, errors):
+        self._add(root, "field", path, duration, errors, count_codes=True)
+
+    def serializer(self, root, path, duration, errors):
+        self._add(root, "serializer", path, duration, errors)
+
+    def list_item(self, root, path, duration, errors):
+        self._add(root, "list_item", path, duration, errors)
+
+    def hook(self, root, path, duration, errors):
+        self._add(root, "hook", path, duration, errors, count_codes=True)
+
+    def _add(self, root, kind, path, duration, errors, count_codes=False):
+        # A many=True root is reported under the class of its elements
+        name = type(getattr(root, "_child", root)).__name__
+        dotted = format_path(path)
+        with self._lock:
+            stats = self._paths.get((name, kind, dotted))
+            if stats is None:
+                stats = self._paths[(name, kind, dotted)] = [0, 0, 0.0]
+            stats[0] += 1
+            stats[2] += duration
+            if errors:
+                stats[1] += 1
+                if count_codes:
+                    for detail in iter_error_details(errors):
+                        key = (name, dotted, detail.code)
+                        self._codes[key] = self._codes.get(key, 0) + 1
+
+    def reset(self):
+        with self._lock:
+            self._paths.clear()
+            self._codes.clear()
+
+    def as_dict(self):
+        """``{serializer: {"paths": {path: {kind: {calls, failures, seconds}}}, "errors": {path: {code: count}}}}``
+
+        ``kind`` is ``"field"``, ``"serializer"``, ``"list_item"`` or ``"hook"``;
+        the serializer ``is_valid`` was called on has the empty path.
+        """
+        result = {}
+        with self._lock:
+            for (name, kind, path), (calls, failures, seconds) in self._paths.items():
+                paths = result.setdefault(name, {"paths": {}, "errors": {}})["paths"]
+                paths.setdefault(path, {})[kind] = {"calls": calls, "failures": failures, "seconds": seconds}
+            for (name, path, code), count in self._codes.items():
+                errors = result.setdefault(name, {"paths": {}, "errors": {}})["errors"]
+                errors.setdefault(path, {})[code] = count
+        return result
+
+    def prometheus(self, prefix="request_validator"):
+        """The statistics in the Prometheus text exposition format."""
+        with self._lock:
+            paths = sorted(self._paths.items())
+            codes = sorted(self._codes.items())
+        lines = []
+        for metric, index, help_text in (("calls_total", 0, "Values validated"),
+                                         ("failures_total", 1, "Values that failed validation"),
+                                         ("seconds_total", 2, "Time spent validating")):
+            lines.append("# HELP {}_{} {}".format(prefix, metric, help_text))
+            lines.append("# TYPE {}_{} counter".format(prefix, metric))
+            for (name, kind, path), stats in paths:
+                lines.append("{}_{}{{serializer=\"{}\",kind=\"{}\",path=\"{}\"}} {}".format(
+                    prefix, metric, _escape(name), kind, _escape(path), stats[index]))
+        lines.append("# HELP {}_errors_total Failed checks per error code".format(prefix))
+        lines.append("# TYPE {}_errors_total counter".format(prefix))
+        for (name, path, code), count in codes:
+            lines.append("{}_errors_total{{serializer=\"{}\",path=\"{}\",code=\"{}\"}} {}".format(
+                prefix, _escape(name), _escape(path), _escape(code), count))
+        return "\n".join(lines) + "\n"
+
+
+def format_path(path):
+    return ".".join("*" if isinstance(key, int) else six.text_type(key) for key in path)
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
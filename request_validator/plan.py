@@ -0,0 +1,286 @@
+from __future__ import absolute_import
+
+import copy
+import datetime
+from collections import OrderedDict
+from decimal import Decimal
+
+import six
+
+from .errors import REQUIRED, REQUIRED_MESSAGE
+from .validator import INVALID
+
+FIELD = "field"
+SERIALIZER = "serializer"
+LIST = "list"
+# Steps compare kinds by identity, so unpickled kinds are mapped back to these constants
+_KINDS = {FIELD: FIELD, SERIALIZER: SERIALIZER, LIST: LIST}
+
+
+class _Missing(object):
+    def __repr__(self):
+        return "MISSING"
+
+
+MISSING = _Missing()
+
+_IMMUTABLE_TYPES = six.string_types + six.integer_types + (
+    float, bool, type(None), Decimal, datetime.date, datetime.time, frozenset)
+
+
+def is_immutable(value):
+    if isinstance(value, tuple):
+        return all(is_immutable(item) for item in value)
+    return isinstance(value, _IMMUTABLE_TYPES)
+
+
+class Step(object):
+    """One declared field of a serializer, resolved at class creation."""
+
+    __slots__ = ("name", "kind", "node", "source", "required", "default", "shared_default",
+                 "plan", "force_valid")
+
+    def __init__(self, name, kind, node):
+        self.name = name
+        self.kind = _KINDS[kind]
+        self.node = node
+        self.source = node._source
+        self.required = node._required
+        self.default = node._default
+        self.shared_default = is_immutable(self.default)
+        self.force_valid = getattr(node, "_force_valid", False)
+        self.plan = node._plan if kind == SERIALIZER else None
+
+    def __reduce__(self):
+        return self.__class__, (self.name, self.kind, self.node)
+
+    def is_async(self):
+        if self.kind is FIELD:
+            return bool(self.node._async_rules)
+        if self.kind is SERIALIZER:
+            return self.plan.is_async
+        return self.node._child._plan.is_async
+
+    def get_default(self):
+        # Declared defaults belong to the shared schema, so mutable ones are copied per call
+        if self.shared_default:
+            return self.default
+        return copy.deepcopy(self.default)
+
+    def lookup(self, data):
+        if not data:
+            return MISSING
+        source = self.source
+        if source is not None and source in data:
+            return data[source]
+        if self.name in data:
+            return data[self.name]
+        return MISSING
+
+
+class Plan(object):
+    """Immutable validation plan of a serializer class.
+
+    ``run`` walks the steps once per call and never copies or mutates the
+    declared fields, so one plan is shared by every instance of the class.
+    """
+
+    def __init__(self, steps, hook=False, async_hook=False):
+        self.steps = tuple(steps)
+        self.steps_by_name = OrderedDict((step.name, step) for step in self.steps)
+        # Input key -> (position, step) of the steps that read it, for run_partial
+        self._steps_by_key = {}
+        for position, step in enumerate(self.steps):
+            for key in set((step.name, step.source)) - set([None]):
+                self._steps_by_key.setdefault(key, []).append((position, step))
+        self.hook = hook
+        self.async_hook = async_hook
+        self.is_async = async_hook or any(step.is_async() for step in self.steps)
+
+    def fill_defaults(self, data):
+        for step in self.steps:
+            if step.name not in data:
+                data[step.name] = step.get_default()
+        return data
+
+    def run(self, owner, data):
+        validated = {}
+        errors = {}
+        all_fields_valid = True
+
+        if self.hook:
+            hook_errors, data = owner._check_user_validation(data)
+            if hook_errors:
+                all_fields_valid = False
+                for error in hook_errors:
+                    errors.update(error)
+
+        for step in self.steps:
+            name = step.name
+            kind = step.kind
+            if kind is FIELD:
+                value = step.lookup(data)
+                if value is MISSING:
+                    if step.required:
+                        all_fields_valid = False
+                        errors[name] = [REQUIRED]
+                        continue
+                    value = step.get_default()
+                field = step.node
+                result = field.clean(value)
+                if result is INVALID:
+                    errors[name] = field.collect_errors(value)
+                    continue
+                validated[name] = result
+            elif kind is SERIALIZER:
+                value = None
+                if data:
+                    value = step.lookup(data)
+                    if value is MISSING:
+                        if step.required:
+                            all_fields_valid = False
+                            errors[name] = {name: REQUIRED}
+                            continue
+                        value = None
+                nested_data, nested_errors, nested_valid = step.plan.run(step.node, value)
+                if nested_errors:
+                    errors[name] = nested_errors
+                if nested_valid and not (step.force_valid and nested_errors):
+                    validated[name] = nested_data
+                else:
+                    validated[name] = {}
+            else:
+                value = step.default
+                if data:
+                    value = step.lookup(data)
+                    if value is MISSING:
+                        if step.required:
+                            all_fields_valid = False
+                            errors[name] = [REQUIRED]
+                            continue
+                        value = step.default
+                list_data, list_errors, _ = step.node.run_validation(value)
+                if list_errors:
+                    errors[name] = list_errors
+                validated[name] = list_data
+
+        return validated, errors, all_fields_valid
+
+    def present_steps(self, data):
+        """The steps whose value is in ``data``, in declaration order."""
+        if not data:
+            return ()
+        if not isinstance(data, dict):
+            return [step for step in self.steps if step.lookup(data) is not MISSING]
+        found = {}
+        steps_by_key = self._steps_by_key
+        if len(data) < len(steps_by_key):
+            for key in data:
+                for position, step in steps_by_key.get(key, ()):
+                    found[position] = step
+        else:
+            for key, steps in steps_by_key.items():
+                if key in data:
+                    for position, step in steps:
+                        found[position] = step
+        return [found[position] for position in sorted(found)]
+
+    def run_partial(self, owner, data):
+        """Like ``run`` but only for the values present in ``data``, recursively.
+
+        Missing fields are neither required nor defaulted, so the time taken
+        depends on the size of the input rather than of the schema.
+        """
+        validated = {}
+        errors = {}
+        all_fields_valid = True
+
+        if self.hook:
+            hook_errors, data = owner._check_user_validation(data)
+            if hook_errors:
+                all_fields_valid = False
+                for error in hook_errors:
+                    errors.update(error)
+
+        for step in self.present_steps(data):
+            name = step.name
+            value = step.lookup(data)
+            kind = step.kind
+            if kind is FIELD:
+                field = step.node
+                result = field.clean(value)
+                if result is INVALID:
+                    errors[name] = field.collect_errors(value)
+                    continue
+                validated[name] = result
+            elif kind is SERIALIZER:
+                nested_data, nested_errors, nested_valid = step.plan.run_partial(step.node, value)
+                if nested_errors:
+                    errors[name] = nested_errors
+                if nested_valid and not (step.force_valid and nested_errors):
+                    validated[name] = nested_data
+                else:
+                    validated[name] = {}
+            else:
+                list_data, list_errors, _ = step.node.run_validation(value, partial=True)
+                if list_errors:
+                    errors[name] = list_errors
+                validated[name] = list_data
+
+        return validated, errors, all_fields_valid
+
+    def run_fail_fast(self, owner, data):
+        """Like ``run`` but returns at the first error, which is the only one reported.
+
+        Nothing is validated for an invalid input, so the validated data is empty.
+        """
+        validated = {}
+
+        if self.hook:
+            hook_errors, data = owner._check_user_validation(data)
+            if hook_errors:
+                errors = {}
+                for error in hook_errors:
+                    errors.update(error)
+                return {}, errors, False
+
+        for step in self.steps:
+            name = step.name
+            kind = step.kind
+            if kind is FIELD:
+                value = step.lookup(data)
+                if value is MISSING:
+                    if step.required:
+                        return {}, {name: [REQUIRED]}, False
+                    value = step.get_default()
+                field = step.node
+                result = field.clean(value)
+                if result is INVALID:
+                    return {}, {name: [field.first_error(value)]}, True
+                validated[name] = result
+            elif kind is SERIALIZER:
+                value = None
+                if data:
+                    value = step.lookup(data)
+                    if value is MISSING:
+                        if step.required:
+                            return {}, {name: {name: REQUIRED}}, False
+                        value = None
+                nested_data, nested_errors, _ = step.plan.run_fail_fast(step.node, value)
+                if nested_errors:
+                    return {}, {name: nested_errors}, True
+                validated[name] = nested_data
+            else:
+                value = step.default
+                if data:
+                    value = step.lookup(data)
+                    if value is MISSING:
+                        if step.required:
+                            return {}, {name: [REQUIRED]}, False
+                        value = step.default
+                list_data, list_errors, _ = step.node.run_validation(value, fail_fast=True)
+                if list_errors:
+                    return {}, {name: list_errors}, True
+                validated[name] = list_data
+
+        return validated, {}, True
@@ -0,0 +1,92 @@
+"""Every serializer class, and what it takes to start processes with them ready.
+
+Serializer classes compile their plans when they are created, so importing
+them in a parent process before it forks workers is what shares them. The
+generated functions of ``backend = "codegen"`` classes can also be saved to a
+snapshot that later processes load before importing their serializers, to
+skip compiling them again:
+
+    registry.load_snapshot(path)
+    registry.warm_up(["myapp.serializers"])
+    registry.save_snapshot(path)
+
+A snapshot holds code like a ``.pyc`` file does; only load trusted ones.
+"""
+from __future__ import absolute_import
+
+import gc
+import importlib
+import marshal
+import os
+import platform
+import sys
+import weakref
+
+from . import codegen
+
+# Snapshots are only read by the Python version that wrote them
+_HEADER = "request_validator snapshot {} {:x}\n".format(
+    platform.python_implementation(), sys.hexversion).encode("ascii")
+
+_classes = weakref.WeakSet()
+
+
+def register(serializer_class):
+    _classes.add(serializer_class)
+    return serializer_class
+
+
+def registered():
+    """Every serializer class created so far, by module and name."""
+    return sorted(_classes, key=lambda cls: (cls.__module__, cls.__name__))
+
+
+def warm_up(modules=(), freeze=True):
+    """Import ``modules`` (dotted names) and get every serializer class ready before a fork.
+
+    With ``freeze`` the garbage collector stops tracking what exists by then
+    (Python 3.7+), so collections in forked workers do not write to, and
+    copy, the memory they share with the parent. Returns the classes.
+    """
+    for module in modules:
+        importlib.import_module(module)
+    classes = registered()
+    if freeze and hasattr(gc, "freeze"):
+        gc.collect()
+        gc.freeze()
+    return classes
+
+
+def save_snapshot(path):
+    """Write the generated functions of every codegen serializer, and their selections, to ``path``.
+
+    Returns how many were written.
+    """
+    plans = []
+    for serializer_class in registered():
+        plans.append(serializer_class._plan)
+        plans.extend(serializer_class._selected_plans.values())
+    codes = codegen.function_codes(plans)
+    temporary = "{}.{}.tmp".format(path, os.getpid())
+    with open(temporary, "wb") as stream:
+        stream.write(_HEADER)
+        marshal.dump(codes, stream)
+    getattr(os, "replace", os.rename)(temporary, path)
+    return len(codes)
+
+
+def load_snapshot(path):
+    """Use the functions saved in ``path`` for serializer classes created from now on.
+
+    A missing snapshot or one written by another Python version is ignored.
+    Returns how many functions were loaded.
+    """
+    try:
+        with open(path, "rb") as stream:
+            if stream.readline() != _HEADER:
+                return 0
+            codes = marshal.load(stream)
+    except (IOError, OSError, EOFError, ValueError, TypeError):
+        return 0
+    codegen.preload(codes)
+    return len(codes)
@@ -1,11 +1,35 @@
 from __future__ import absolute_import
 
-import copy
+import inspect
+import multiprocessing
+from collections import OrderedDict
 
-from .fields import Field
+import six
 
+from .fields import Field, _creation_order
+from . import batch, codegen, constraints, decode, incremental, limits, observe, registry, stream
+from .cache import LRUCache, content_key
+from .errors import ErrorList, NULL, iter_error_details, render_errors
+from .plan import Plan, Step, FIELD, SERIALIZER, LIST
+from .slots import PicklableSlots
+from .validator import INVALID
+
+try:
+    from concurrent.futures import ProcessPoolExecutor
+except ImportError:
+    ProcessPoolExecutor = None
+
+PLAN_BACKEND = "plan"
+CODEGEN_BACKEND = "codegen"
+
+# Lists shorter than this are not worth shipping to worker processes
+MIN_PARALLEL_ROWS = 1000
+
+
+class BaseSerializer(PicklableSlots):
+    __slots__ = ("_initial_data", "_source", "_required", "_force_valid", "_errors", "_validated_data",
+                 "_creation_counter")
 
-class BaseSerializer(object):
     def __init__(self, data=None, source=None, required=True, force_valid=False):
         self._initial_data = data
         self._source = source
@@ -13,9 +37,14 @@ class BaseSerializer(object):
         self._force_valid = force_valid
         self._errors = None
         self._validated_data = None
+        self._creation_counter = next(_creation_order)
 
     def get_errors(self):
-        return self._errors
+        return render_errors(self._errors)
+
+    def error_details(self):
+        """Every error as an ErrorDetail with a stable ``code``, its ``params`` and its ``path``."""
+        return list(iter_error_details(self._errors))
 
     def validate_data(self):
         return self._validated_data
@@ -28,13 +57,86 @@ class BaseSerializer(object):
         return self.get_errors()
 
 
+class SerializerMetaclass(type):
+    """Resolves the declared fields of a serializer class and compiles its plan once."""
+
+    def __new__(mcs, name, bases, attrs):
+        declared = [(key, value) for key, value in attrs.items()
+                    if isinstance(value, (Field, BaseSerializer))]
+        declared.sort(key=lambda item: item[1]._creation_counter)
+        for key, _ in declared:
+            del attrs[key]
+
+        cls = super(SerializerMetaclass, mcs).__new__(mcs, name, bases, attrs)
+
+        fields = OrderedDict(getattr(cls._get_parent(), "_fields_dict", ()))
+        fields.update(declared)
+        cls._fields_dict = fields
+        cls._fields = list(fields)
+        cls._plan = cls._compile()
+        cls._result_cache = getattr(getattr(cls, "Meta", None), "cache", None)
+        assert cls._result_cache is None or isinstance(cls._result_cache, LRUCache), \
+            """ Meta.cache must be an LRUCache but get {}""".format(type(cls._result_cache).__name__)
+        cls._observer = getattr(getattr(cls, "Meta", None), "observer", None)
+        cls._max_body_size = getattr(getattr(cls, "Meta", None), "max_body_size", decode.MAX_BODY_SIZE)
+        cls._json_decoder = getattr(getattr(cls, "Meta", None), "json_decoder", decode.AUTO)
+        assert cls._json_decoder in decode.DECODERS, \
+            """ json_decoder must be one of {} but get {!r}""".format(", ".join(decode.DECODERS), cls._json_decoder)
+        cls._limits = getattr(getattr(cls, "Meta", None), "limits", None)
+        assert cls._limits is None or isinstance(cls._limits, limits.Limits), \
+            """ Meta.limits must be a Limits but get {}""".format(type(cls._limits).__name__)
+        cls._selected_plans = {}
+        return registry.register(cls)
+
+    def _compile(cls):
+        steps = []
+        for name, node in cls._fields_dict.items():
+            if isinstance(node, Field):
+                kind = FIELD
+            elif isinstance(node, ListSerializer):
+                kind = LIST
+            else:
+                kind = SERIALIZER
+            steps.append(Step(name, kind, node))
+        plan = Plan(steps, hook=_has_validation_hook(cls), async_hook=_has_async_hook(cls))
+
+        backend = getattr(getattr(cls, "Meta", None), "backend", PLAN_BACKEND)
+        assert backend in (PLAN_BACKEND, CODEGEN_BACKEND), \
+            """ backend must be "{}" or "{}" but get {!r}""".format(PLAN_BACKEND, CODEGEN_BACKEND, backend)
+        if backend == CODEGEN_BACKEND and not plan.is_async:
+            plan = codegen.compile_plan(plan, name=cls.__name__)
+        return plan
+
+
+def _has_validation_hook(cls):
+    for klass in cls.__mro__:
+        if "validate" in klass.__dict__ or "_check_user_validation" in klass.__dict__:
+            return klass.__module__ != __name__
+    return False
+
+
+def _has_async_hook(cls):
+    iscoroutinefunction = getattr(inspect, "iscoroutinefunction", None)
+    if iscoroutinefunction is None:
+        return False
+    return iscoroutinefunction(cls.validate) or iscoroutinefunction(cls._check_user_validation)
+
+
+@six.add_metaclass(SerializerMetaclass)
 class Serializer(BaseSerializer):
+    __slots__ = ("_default", "_all_fields_valid", "_used_plan", "_partial", "_revalidation", "_raw")
+
     def __init__(self, *args, **kwargs):
+        kwargs.pop("many", None)
         super(Serializer, self).__init__(*args, **kwargs)
         self._validated_data = {}
         self._errors = {}
         self._default = {}
         self._all_fields_valid = True
+        self._used_plan = self._plan
+        self._partial = False
+        self._revalidation = None
+        self._raw = None
 
     def validate_data(self):
         if not (self._force_valid and self.has_error()) and self._all_fields_valid:
@@ -43,41 +145,19 @@ class Serializer(BaseSerializer):
 
     def __new__(cls, *args, **kwargs):
         many = kwargs.pop("many", False)
-        cls.fields()
         if many:
             if hasattr(cls, "Meta") and hasattr(cls.Meta, "list_serializer"):
                 return cls.Meta.list_serializer(cls, *args, **kwargs)
             return ListSerializer(cls, *args, **kwargs)
         else:
-            return object.__new__(cls, *args, **kwargs)
+            return object.__new__(cls)
 
     @classmethod
     def fields(cls):
-        if "_fields_dict" not in cls.__dict__:
-            cls._fields_dict = {}
-            for field in cls._get_fields():
-                if field in cls.__dict__:
-                    cls._fields_dict[field] = getattr(cls, field)
-                    if hasattr(cls, field):
-                        delattr(cls, field)
-
-            if len(cls._get_classes()) > 1:
-                cls._fields_dict.update(cls._get_parent().fields())
-
         return cls._fields_dict
 
     @classmethod
     def _get_fields(cls):
-        if '_fields' not in cls.__dict__:
-            cls._fields = []
-            for field in set(dir(cls)) - set(dir(cls._get_parent())):
-                if not isinstance(getattr(cls, field), (Field, BaseSerializer)):
-                    continue
-                cls._fields.append(field)
-
-            if len(cls._get_classes()) > 1:
-                cls._fields = cls._fields + cls._get_parent()._get_fields()
-
         return cls._fields
 
     @classmethod
@@ -92,7 +172,7 @@ class Serializer(BaseSerializer):
                 assert len(bases) == 1, """ can not use multiple extend"""
                 the_class = bases[0]
                 cls._base_classes.append(the_class)
-                if the_class == Serializer:
+                if the_class.__name__ == "Serializer" and the_class.__module__ == __name__:
                     break
 
         return cls._base_classes
@@ -101,75 +181,194 @@ class Serializer(BaseSerializer):
     def _get_parent(cls):
         return cls._get_classes()[0]
 
-    def _get_field(self, key):
-        return copy.deepcopy(getattr(self, '_fields_dict')[key])
-
     @property
     def data(self):
-        data = self.validate_data()
-        for key, value in self.fields().items():
-            if key not in data:
-                data[key] = value._default
-        return data
+        if self._partial:
+            return self.validate_data()
+        return self._used_plan.fill_defaults(self.validate_data())
+
+    @classmethod
+    def select_plan(cls, only=None, exclude=None):
+        """The plan of the fields in ``only`` (all by default) and not in ``exclude``.
+
+        It is built once per selection and kept on the class.
+        """
+        key = (frozenset(only) if only is not None else None, frozenset(exclude or ()))
+        plan = cls._selected_plans.get(key)
+        if plan is None:
+            unknown = set(only or ()).union(exclude or ()).difference(cls._fields)
+            assert not unknown, """{} has no fields {}""".format(cls.__name__, ", ".join(sorted(unknown)))
+            steps = [step for step in cls._plan.steps
+                     if (only is None or step.name in key[0]) and step.name not in key[1]]
+            plan = Plan(steps, hook=cls._plan.hook, async_hook=cls._plan.async_hook)
+            if isinstance(cls._plan, codegen.GeneratedPlan):
+                plan = codegen.compile_plan(plan, name=cls.__name__)
+            cls._selected_plans[key] = plan
+        return plan
+
+    @classmethod
+    def from_json(cls, raw, max_size=None, **kwargs):
+        """A serializer of the JSON request body ``raw`` (bytes or text), as ``cls(data=...)`` makes.
+
+        A body longer than ``max_size`` (default ``Meta.max_body_size``, 1 MiB;
+        set it to None for no limit) raises ``decode.BodyTooLarge`` before
+        anything is decoded, and JSON that is not valid raises ValueError.
+        ``Meta.json_decoder`` picks the decoder, by default the fastest one
+        installed: orjson, ujson or the standard library.
+        """
+        decode.check_size(raw, max_size if max_size is not None else cls._max_body_size)
+        data = decode.loads(raw, cls._json_decoder)
+        serializer = cls(data=data, **kwargs)
+        if isinstance(serializer, Serializer) and isinstance(raw, bytes):
+            # The cache can key the result by the body instead of the decoded data
+            serializer._raw = raw
+        return serializer
+
+    @classmethod
+    def iter_validate(cls, fileobj, chunk_size=stream.CHUNK_SIZE, max_item_size=stream.MAX_ITEM_SIZE, **kwargs):
+        """Validate a top-level JSON array read from ``fileobj`` element by element.
+
+        Yields ``(index, validated_data, errors)`` for every element, like one
+        entry of a ``many=True`` serializer, without loading the whole array.
+        An element longer than ``max_item_size`` characters raises
+        ``stream.ItemTooLarge``.
+        """
+        items = stream.iter_array(fileobj, chunk_size, max_item_size)
+        for index, (item_data, item_errors) in enumerate(cls.validate_each(items, **kwargs)):
+            yield index, item_data, item_errors
+
+    @classmethod
+    def validate_each(cls, items, **kwargs):
+        """Yield ``(validated_data, errors)`` for every item of ``items``."""
+        assert not cls._plan.is_async, """{} has async validators""".format(cls.__name__)
+        child = cls(**kwargs)
+        plan = cls._plan
+        for item in items:
+            # Every item is a document of its own
+            limit_errors = limits.check_document(cls._limits, item, plan=plan)
+            if limit_errors is not None:
+                yield {}, render_errors(limit_errors)
+                continue
+            item_data, item_errors, item_valid = plan.run(child, item)
+            if not item_valid or (child._force_valid and item_errors):
+                item_data = {}
+            if item_data or not item_errors:
+                plan.fill_defaults(item_data)
+            yield item_data, render_errors(item_errors)
 
     def add_error(self, index, value):
         self._errors[index] = value
 
-    def is_valid(self):
-        validated_data, serializer_validated = self._validate(self._initial_data)
-        self._validated_data = validated_data
+    def is_valid(self, fail_fast=False, raw=None, use_cache=True, observer=None, partial=False, only=None,
+                 exclude=None):
+        """Validate the data; with ``fail_fast`` stop at the first error, the only one reported.
+
+        With ``partial`` only the values present in the data are validated, in
+        nested serializers and list elements too, as for a PATCH request.
+        ``only`` and ``exclude`` restrict validation to some of the fields.
+
+        When the class has a ``Meta.cache`` the result is looked up by a digest
+        of the data, or of ``raw`` (the bytes it was decoded from) when given.
+        Pass ``use_cache=False`` when ``validate`` must run every time.
+
+        ``observer`` (default ``Meta.observer``) is an ``observe.Observer``
+        told about every field, nested serializer, list element and hook.
+
+        Data over its ``limits.Limits`` is not validated; the exceeded limit
+        is the only error.
+        """
+        assert not self._plan.is_async, \
+            """{} has async validators, use is_valid_async()""".format(type(self).__name__)
+        assert not (partial and fail_fast), """partial and fail_fast can not be combined"""
+        plan = self._plan if only is None and not exclude else self.select_plan(only, exclude)
+        self._used_plan = plan
+        self._partial = partial
+        if not self._within_limits():
+            return False
+        observer = observer or self._observer
+        if observer is not None:
+            assert not (fail_fast or partial), """fail_fast and partial runs can not be observed"""
+            self._validated_data, self._errors, self._all_fields_valid = _observe(
+                self, observer, observe.run_plan, plan, self, self._initial_data, observer, self)
+            return not self.has_error()
+        if partial:
+            self._validated_data, self._errors, self._all_fields_valid = plan.run_partial(
+                self, self._initial_data)
+            return not self.has_error()
+        # Only full runs of the whole class are cached
+        cache = self._result_cache if use_cache and plan is self._plan else None
+        key = None
+        if cache is not None:
+            key = content_key(self._initial_data, raw if raw is not None else self._raw)
+            if key is not None:
+                key = (type(self), fail_fast) + key
+                result = cache.get(key)
+                if result is not None:
+                    self._validated_data, self._errors, self._all_fields_valid = _copy_result(result)
+                    return not self.has_error()
+        run = plan.run_fail_fast if fail_fast else plan.run
+        result = run(self, self._initial_data)
+        self._validated_data, self._errors, self._all_fields_valid = result
+        if key is not None:
+            cache.set(key, _copy_result(result))
         return not self.has_error()
 
-    def _validate(self, initial_data):
-        serializer_validated = True
-        validate_data = {}
-        errors, initial_data = self._check_user_validation(initial_data)
-
-        if len(errors) != 0:
-            self._all_fields_valid = False
-            for error in errors:
-                for key, value in error.iteritems():
-                    self.add_error(key, value)
-
-        for attr in self.fields():
-            field = self._get_field(attr)
-            if isinstance(field, Field):
-                field.set_data(initial_data, attr)
-                if field.has_error():
-                    self._all_fields_valid = False
-                    serializer_validated = False
-                    self.add_error(attr, field.get_errors())
-                    continue
-                if not field.validate():
-                    serializer_validated = False
-                    self.add_error(attr, field.get_errors())
-                    continue
-                validate_data[attr] = field.data
-            elif isinstance(field, Serializer):
-                field.set_initial_data(initial_data, attr)
-                if field.has_error():
-                    self._all_fields_valid = False
-                    serializer_validated = False
-                    self.add_error(attr, field.get_errors())
-                    continue
-                elif not field.is_valid():
-                    serializer_validated = False
-                    self.add_error(attr, field.get_errors())
-                validate_data[attr] = field.validate_data()
-                continue
-            elif isinstance(field, ListSerializer):
-                field.set_initial_data(initial_data, attr)
-                if field.has_error():
-                    self._all_fields_valid = False
-                    serializer_validated = False
-                    self.add_error(attr, field.get_errors())
-                    continue
-                elif not field.is_valid():
-                    serializer_validated = False
-                    self.add_error(attr, field.get_errors())
-                validate_data[attr] = field.validate_data()
-                continue
-        return validate_data, serializer_validated
+    def revalidate(self, previous=None, changed=None):
+        """Validate like ``is_valid`` but only what changed since ``previous`` was validated.
+
+        ``previous`` is a serializer of the same class validated with
+        ``revalidate``; without one everything is validated. The inputs are
+        compared unless ``changed`` lists the paths that changed, e.g.
+        ``[("items", 3, "name")]``, which is required when the document was
+        modified in place. Unchanged parts of the validated data are shared
+        with ``previous``.
+        """
+        assert not self._plan.is_async, \
+            """{} has async validators, use is_valid_async()""".format(type(self).__name__)
+        state = None
+        if previous is not None:
+            assert type(previous) is type(self), """previous must be a {}""".format(type(self).__name__)
+            state = previous._revalidation
+        tree = incremental.changed_tree(changed) if changed is not None else None
+        self._used_plan = self._plan
+        self._partial = False
+        if not self._within_limits():
+            self._revalidation = None
+            return False
+        self._validated_data, self._errors, self._all_fields_valid, self._revalidation = incremental.run(
+            self._plan, self, self._initial_data, state, tree)
+        return not self.has_error()
+
+    def lazy_data(self):
+        """The validated data as a read-only mapping that validates every field on its first read.
+
+        Nothing is validated up front except the ``validate`` hook, so reading
+        a few fields of a large input only pays for those; a field that is
+        not valid raises ValidationError when it is read. ``to_dict()`` gives
+        plain dicts like ``data``.
+        """
+        from .lazy import ValidatedMapping
+        limit_errors = limits.check_document(self._limits, self._initial_data, plan=self._plan)
+        if limit_errors is not None:
+            raise ValidationError(render_errors(limit_errors))
+        return ValidatedMapping(self._plan, self, self._initial_data)
+
+    def is_valid_async(self, concurrency=None):
+        """Coroutine version of ``is_valid`` that awaits async hooks and rules (Python 3 only).
+
+        Hooks and async rules of nested serializers and list elements run
+        concurrently, at most ``concurrency`` at a time when it is given.
+        """
+        from . import aio
+        return aio.is_valid(self, concurrency)
+
+    def _within_limits(self):
+        # A document over its limits gets that one error and is not validated
+        limit_errors = limits.check_document(self._limits, self._initial_data, plan=self._plan)
+        if limit_errors is None:
+            return True
+        self._validated_data, self._errors, self._all_fields_valid = {}, limit_errors, False
+        return False
 
     def _check_user_validation(self, data):
         try:
@@ -185,23 +384,39 @@ class Serializer(BaseSerializer):
     def is_all_fields_valid(self):
         return self._all_fields_valid
 
-    def set_initial_data(self, data, index):
-        self._initial_data = None
-        if not data:
-            return self
 
-        if self._source in data:
-            self._initial_data = data[self._source]
-        elif index in data:
-            self._initial_data = data[index]
+def _add_errors(errors, extra):
+    # Errors of an item with more errors for some of its keys
+    errors = dict(errors) if errors else {}
+    for key, details in extra.items():
+        existing = errors.get(key)
+        if existing is None:
+            errors[key] = details
+        elif isinstance(existing, list):
+            errors[key] = existing + details
         else:
-            if self._required:
-                self.add_error(index, "This field is required")
-        return self
+            errors[key] = [existing] + details
+    return errors
 
 
 class ListSerializer(BaseSerializer):
+    __slots__ = ("_serializer", "_args", "_kwargs", "_data", "_default", "_allow_null", "_columnar", "_workers",
+                 "_executor", "_max_errors", "_max_length", "_constraints", "_child")
+
     def __init__(self, serializer, *args, **kwargs):
+        columnar = kwargs.pop("columnar", False)
+        workers = kwargs.pop("workers", None)
+        executor = kwargs.pop("executor", None)
+        max_errors = kwargs.pop("max_errors", None)
+        max_length = kwargs.pop("max_length", None)
+        unique_by = kwargs.pop("unique_by", None)
+        references = kwargs.pop("references", None)
+        assert executor is not None or not workers or ProcessPoolExecutor is not None, \
+            """workers needs concurrent.futures (the "futures" package on Python 2)"""
+        assert max_errors is None or (isinstance(max_errors, int) and max_errors > 0), \
+            """max_errors must be a positive integer"""
+        assert max_length is None or (isinstance(max_length, int) and max_length >= 0), \
+            """max_length must be a non-negative integer"""
         super(ListSerializer, self).__init__(*args, **kwargs)
 
         kwargs.pop("data", False)
@@ -213,6 +428,16 @@ class ListSerializer(BaseSerializer):
         self._data = []
         self._default = []
         self._allow_null = True
+        self._columnar = columnar
+        self._workers = workers
+        self._executor = executor
+        self._max_errors = max_errors
+        self._max_length = limits.MaxListLengthRule(max_length) if max_length is not None else None
+        self._constraints = None
+        if unique_by is not None or references:
+            self._constraints = constraints.Constraints(serializer, unique_by, references)
+        # Element validation runs the child plan against this one shared instance
+        self._child = serializer(*args, **kwargs)
 
     def add_error(self, value):
         self._errors.append(value)
@@ -220,44 +445,188 @@ class ListSerializer(BaseSerializer):
     def _can_null(self):
         return self._allow_null and self._initial_data is None
 
-    def is_valid(self):
-        assert isinstance(self._initial_data, (list, tuple)) or self._initial_data is None, \
+    def is_valid(self, fail_fast=False, observer=None, partial=False):
+        if not self._within_limits():
+            return False
+        observer = observer or self._child._observer
+        if observer is not None:
+            assert not (fail_fast or partial), """fail_fast and partial runs can not be observed"""
+            self._validated_data, self._errors, self._data = _observe(
+                self, observer, observe.run_list, self, self._initial_data, observer, self)
+            return not self.has_error()
+        self._validated_data, self._errors, self._data = self.run_validation(
+            self._initial_data, fail_fast, partial)
+        return not self.has_error()
+
+    def is_valid_async(self, concurrency=None):
+        """Coroutine version of ``is_valid`` that awaits async hooks and rules (Python 3 only)."""
+        from . import aio
+        return aio.is_valid(self, concurrency)
+
+    def _within_limits(self):
+        limit_errors = limits.check_document(self._child._limits, self._initial_data, many=True,
+                                             plan=self._child._plan)
+        if limit_errors is None:
+            return True
+        self._validated_data, self._errors, self._data = [], limit_errors, []
+        return False
+
+    def run_validation(self, initial_data, fail_fast=False, partial=False):
+        assert not self._child._plan.is_async, \
+            """{} has async validators, use is_valid_async()""".format(self._serializer.__name__)
+        assert not (partial and fail_fast), """partial and fail_fast can not be combined"""
+        self._check_initial_data(initial_data)
+        if initial_data is None:
+            return [], [NULL], []
+        list_errors = self.list_errors(initial_data)
+        if list_errors:
+            return [], list_errors, []
+        constraint_errors = self.constraint_errors(initial_data)
+        if partial:
+            # Elements of a partial list are checked in this process, one by one, and get no defaults
+            child = self._child
+            results = (child._plan.run_partial(child, item) for item in initial_data)
+            return self.merge_items(results, self._max_errors, fill_defaults=False,
+                                    constraint_errors=constraint_errors)
+        results = self._run_items(initial_data, fail_fast)
+        try:
+            return self.merge_items(results, 1 if fail_fast else self._max_errors,
+                                    constraint_errors=constraint_errors)
+        finally:
+            # Stops the remaining work when the error budget ran out
+            results.close()
+
+    def _check_initial_data(self, initial_data):
+        assert isinstance(initial_data, (list, tuple)) or initial_data is None, \
             """ _initial_data must be list or tuple but get {data_type}""".format(
-                data_type=type(self._initial_data).__name__)
-
-        if self._initial_data is not None:
-            for initial_data in self._initial_data:
-                serializer = self._serializer(data=initial_data, *self._args, **self._kwargs)
-                if serializer.is_valid():
-                    self._validated_data.append(serializer.validate_data())
-                    self._data.append(serializer.data)
-                else:
-                    self.add_error(serializer.get_errors())
-                    if not self._force_valid and serializer.validate_data():
-                        self._validated_data.append(serializer.validate_data())
-                        self._data.append(serializer.data)
+                data_type=type(initial_data).__name__)
+
+    def list_errors(self, items):
+        """The error of a list longer than ``max_length``, checked before any item is validated."""
+        if self._max_length is not None and self._max_length(items) is INVALID:
+            return [self._max_length.get_error(items)]
+        return None
+
+    def constraint_errors(self, items):
+        """``{index: errors}`` of the items breaking ``unique_by`` or ``references``, or None."""
+        if self._constraints is None:
+            return None
+        return self._constraints.check(items)
+
+    def merge_items(self, results, max_errors=None, fill_defaults=True, constraint_errors=None):
+        """Build ``(validated_data, errors, data)`` from the child result of every item.
+
+        ``data`` holds the same dicts as ``validated_data``, so one list serves
+        both. Stops after ``max_errors`` items failed when it is given. The
+        ``constraint_errors`` of an item are added to its own errors.
+        """
+        validated_data = []
+        errors = ErrorList()
+        plan = self._child._plan if fill_defaults else _NO_DEFAULTS
+        child_force_valid = self._child._force_valid
+        for index, (item_data, item_errors, item_valid) in enumerate(results):
+            if constraint_errors and index in constraint_errors:
+                item_errors = _add_errors(item_errors, constraint_errors[index])
+            if not item_valid or (child_force_valid and item_errors):
+                item_data = {}
+            if not item_errors:
+                validated_data.append(plan.fill_defaults(item_data))
+            else:
+                errors.add(index, item_errors)
+                if not self._force_valid and item_data:
+                    validated_data.append(plan.fill_defaults(item_data))
+                if max_errors is not None and len(errors) >= max_errors:
+                    break
+        return validated_data, errors, validated_data
+
+    def iter_items(self, items, fail_fast=False):
+        """Yield the ``(validated_data, errors, all_fields_valid)`` of the child for every item."""
+        child = self._child
+        plan = child._plan
+        run = plan.run_fail_fast if fail_fast else plan.run
+        checked = self._validate_columns(plan, items)
+        if checked is None:
+            for item in items:
+                yield run(child, item)
         else:
-            self.add_error("can not be null !")
-
-        return not self.has_error()
+            for item, item_data in zip(items, checked):
+                yield run(child, item) if item_data is None else (item_data, {}, True)
+
+    def validate_items(self, items, fail_fast=False):
+        return list(self.iter_items(items, fail_fast))
+
+    def _run_items(self, items, fail_fast):
+        if not (self._workers or self._executor) or len(items) < MIN_PARALLEL_ROWS:
+            for result in self.iter_items(items, fail_fast):
+                yield result
+            return
+
+        workers = self._workers or multiprocessing.cpu_count()
+        size = -(-len(items) // (workers * 4))
+        chunks = [items[start:start + size] for start in range(0, len(items), size)]
+        executor = self._executor or ProcessPoolExecutor(workers)
+        futures = []
+        try:
+            # The serializer class is pickled by reference, so workers import it and compile it once;
+            # the positional data argument is left out of what is shipped with every chunk
+            args = (None,) + self._args[1:] if self._args else ()
+            futures = [executor.submit(_validate_chunk, self._serializer, args, self._kwargs,
+                                       self._columnar, fail_fast, chunk) for chunk in chunks]
+            for future in futures:
+                for result in future.result():
+                    yield result
+        finally:
+            for future in futures:
+                future.cancel()
+            if self._executor is None:
+                executor.shutdown()
+
+    def _validate_columns(self, plan, initial_data):
+        # Rows that fail column by column are validated again one by one, so errors
+        # are exactly the same as without columnar validation
+        if (not self._columnar or len(initial_data) < batch.MIN_COLUMNAR_ROWS
+                or not batch.is_available() or not batch.supports(plan)):
+            return None
+        return batch.validate_columns(plan, initial_data)
 
     @property
     def data(self):
         return self._data
 
-    def set_initial_data(self, data, index):
-        self._initial_data = self._default
-        if not data:
-            return self
 
-        if self._source in data:
-            self._initial_data = data[self._source]
-        elif index in data:
-            self._initial_data = data[index]
-        else:
-            if self._required:
-                self.add_error("This field is required")
-        return self
+# Fills no defaults in merge_items
+_NO_DEFAULTS = Plan(())
+
+
+def _observe(serializer, observer, run, *args):
+    # The root is reported with the empty path, after everything it contains
+    started = observe._clock()
+    result = run(*args)
+    observer.serializer(serializer, (), observe._clock() - started, result[1])
+    return result
+
+
+def _copy_result(result):
+    # Callers may change the validated data and errors, so the cache keeps its own copy
+    validated, errors, all_fields_valid = result
+    return _copy(validated), _copy(errors), all_fields_valid
+
+
+def _copy(value):
+    if isinstance(value, dict):
+        return dict((key, _copy(item)) for key, item in value.items())
+    if isinstance(value, ErrorList):
+        errors = ErrorList()
+        errors.extend(_copy(item) for item in value)
+        errors.indices = list(value.indices)
+        return errors
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    return value
+
+
+def _validate_chunk(serializer, args, kwargs, columnar, fail_fast, items):
+    return ListSerializer(serializer, columnar=columnar, *args, **kwargs).validate_items(items, fail_fast)
 
 
 class ValidationError(Exception):
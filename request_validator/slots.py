@@ -0,0 +1,24 @@
+from __future__ import absolute_import
+
+
+class PicklableSlots(object):
+    """Base of classes with ``__slots__`` that are pickled.
+
+    Pickle protocols 0 and 1 of Python 2 refuse such classes unless they
+    define ``__getstate__``; the state is every slot that is set, plus the
+    ``__dict__`` of subclasses that do not declare slots.
+    """
+
+    __slots__ = ()
+
+    def __getstate__(self):
+        state = dict(getattr(self, "__dict__", ()))
+        for cls in type(self).__mro__:
+            for name in cls.__dict__.get("__slots__", ()):
+                if name != "__dict__" and hasattr(self, name):
+                    state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
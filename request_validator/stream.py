@@ -0,0 +1,161 @@
+from __future__ import absolute_import
+
+import codecs
+import json
+import re
+from json.scanner import py_make_scanner
+
+CHUNK_SIZE = 64 * 1024
+MAX_ITEM_SIZE = 16 * 1024 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DELIMITER = re.compile(r"[ \t\n\r]*([,\]])[ \t\n\r]*")
+# Python 2 decode errors only tell their position in the message
+_ERROR_POSITION = re.compile(r"\(char (\d+)")
+# Longest text a value may end with and still continue, e.g. the "\uXXXX\uXXXX" of a surrogate pair
+_TAIL = 16
+# Decode errors only raised at the end of the input; Python 2 raises the second for a string opened at the end
+_TRUNCATED = ("Unterminated string", "end is out of bounds")
+
+_python_scanner = py_make_scanner(json.JSONDecoder())
+
+
+class ItemTooLarge(ValueError):
+    def __init__(self, index, limit):
+        super(ItemTooLarge, self).__init__(
+            "Element {} of the array is longer than the limit of {} characters".format(index, limit))
+        self.index = index
+        self.limit = limit
+
+
+class _Reader(object):
+    """A text buffer over ``fileobj`` that only keeps the part not parsed yet."""
+
+    def __init__(self, fileobj, chunk_size):
+        self._fileobj = fileobj
+        self._chunk_size = chunk_size
+        self._decoder = None
+        self.buffer = u""
+        self.pos = 0
+        self.eof = False
+
+    def read(self):
+        while True:
+            chunk = self._fileobj.read(self._chunk_size)
+            if isinstance(chunk, bytes):
+                if self._decoder is None:
+                    self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+                text = self._decoder.decode(chunk, final=not chunk)
+                if not text and chunk:
+                    # Only part of a multi-byte character so far
+                    continue
+                chunk = text
+            break
+        if not chunk:
+            self.eof = True
+            return False
+        if self.pos:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        self.buffer += chunk
+        return True
+
+    def skip_whitespace(self):
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer) or not self.read():
+                return
+
+    def next_char(self):
+        self.skip_whitespace()
+        if self.pos >= len(self.buffer):
+            raise ValueError("Unexpected end of JSON input")
+        return self.buffer[self.pos]
+
+
+def iter_array(fileobj, chunk_size=CHUNK_SIZE, max_item_size=MAX_ITEM_SIZE):
+    """Yield the elements of the top-level JSON array in ``fileobj`` one by one.
+
+    The file is read ``chunk_size`` bytes (or characters) at a time and only
+    the element being decoded is kept in memory; an element longer than
+    ``max_item_size`` characters raises ItemTooLarge.
+    """
+    decoder = json.JSONDecoder()
+    reader = _Reader(fileobj, chunk_size)
+
+    if reader.next_char() != "[":
+        raise ValueError("Expecting a JSON array at position {}".format(reader.pos))
+    reader.pos += 1
+    if reader.next_char() == "]":
+        reader.pos += 1
+        _check_end(reader)
+        return
+
+    raw_decode = decoder.raw_decode
+    index = 0
+    while True:
+        reader.skip_whitespace()
+        try:
+            item, end = raw_decode(reader.buffer, reader.pos)
+        except ValueError as error:
+            if _may_be_truncated(error, reader.buffer, reader.pos) and _read_more(reader, index, max_item_size):
+                continue
+            raise
+        # Until its delimiter is buffered a value (e.g. a number) may continue in the next chunk
+        match = _DELIMITER.match(reader.buffer, end)
+        if match is None:
+            rest = _WHITESPACE.match(reader.buffer, end).end()
+            if (rest == len(reader.buffer) or len(reader.buffer) - end <= _TAIL) \
+                    and _read_more(reader, index, max_item_size):
+                continue
+            raise ValueError("Expecting ',' delimiter at position {}".format(end))
+        reader.pos = match.end()
+        yield item
+        index += 1
+
+        if match.group(1) == "]":
+            _check_end(reader)
+            return
+
+
+def _may_be_truncated(error, buffer, start):
+    # Whether more input could make the error go away: it is about the end of the buffer
+    message = str(error)
+    if message.startswith(_TRUNCATED):
+        return True
+    position = getattr(error, "pos", None)
+    if position is None:
+        match = _ERROR_POSITION.search(message)
+        if match is None:
+            # The C scanner of Python 2 does not tell where a nested value failed, the Python one does
+            try:
+                _python_scanner(buffer, start)
+            except StopIteration:
+                return start >= len(buffer) - _TAIL
+            except ValueError as python_error:
+                python_message = str(python_error)
+                if python_message.startswith(_TRUNCATED) or _ERROR_POSITION.search(python_message):
+                    return _may_be_truncated(python_error, buffer, start)
+            return False
+        position = int(match.group(1))
+    return position >= len(buffer) - _TAIL
+
+
+def _read_more(reader, index, max_item_size):
+    # Doubles what is buffered of the element, so a long element is decoded a logarithmic number of times
+    pending = len(reader.buffer) - reader.pos
+    if max_item_size is not None and pending > max_item_size:
+        raise ItemTooLarge(index, max_item_size)
+    wanted = 2 * pending
+    if max_item_size is not None:
+        wanted = min(wanted, max_item_size + 1)
+    read = reader.read()
+    while read and len(reader.buffer) - reader.pos < wanted:
+        read = reader.read()
+    return len(reader.buffer) - reader.pos > pending
+
+
+def _check_end(reader):
+    reader.skip_whitespace()
+    if reader.pos < len(reader.buffer):
+        raise ValueError("Extra data at position {}".format(reader.pos))
@@ -1,238 +1,502 @@
-import six
-from __builtin__ import unicode, long
+import re
+import datetime
+import itertools
 from decimal import Decimal
 
+import six
+
+from . import dates
+from .cache import LRUCache
+from .choices import ChoicesFromFile
+from .errors import ErrorDetail
+
+
+class _Invalid(object):
+    def __repr__(self):
+        return "INVALID"
+
+
+# Returned by a rule when the value does not pass it
+INVALID = _Invalid()
+
+_INT_PATTERN = re.compile(r"\d+$")
+_NUMBER_TYPES = six.integer_types + (Decimal,)
+
+_RULES = {}
+
+
+def register_rule(rule_class):
+    """Register a Rule subclass under its ``name`` so fields can refer to it by name."""
+    assert isinstance(rule_class, type) and issubclass(rule_class, Rule), \
+        """rule must be a subclass of Rule"""
+    assert rule_class.name, """rule must define a name"""
+    _RULES[rule_class.name] = rule_class
+    return rule_class
+
+
+def get_rule(name):
+    assert name in _RULES, """unknown rule {!r}""".format(name)
+    return _RULES[name]
+
+
+def build_rule(rule, value=None):
+    if isinstance(rule, Rule):
+        return rule
+    if isinstance(rule, type) and issubclass(rule, Rule):
+        return rule(value)
+    return get_rule(rule)(value)
+
+
+class Rule(object):
+    """A validation rule compiled once per field.
+
+    Subclasses do their expensive setup in ``__init__`` and implement
+    ``__call__(data)``, returning the (possibly converted) value or INVALID.
+    ``get_error`` is only called for values that failed, and the message is
+    only formatted when the error is rendered.
+    """
+
+    __slots__ = ("value",)
+
+    name = None
+    message = "This field is not valid"
+    # Async rules define ``async def __call__`` and are only checked by is_valid_async()
+    is_async = False
+
+    def __init__(self, value=None):
+        self.value = value
+
+    def __call__(self, data):
+        raise NotImplementedError
+
+    def __reduce__(self):
+        # Rules are rebuilt from their value, so compiled state never has to be pickled
+        return self.__class__, (self.value,)
+
+    def get_message(self, data):
+        return self.message.format(data_type=type(data).__name__, data=data, value=self.value)
+
+    def get_error(self, data):
+        return ErrorDetail(self.name or type(self).__name__, rule=self, value=data)
+
+    def error_params(self):
+        if self.value is None:
+            return {}
+        return {"value": self.value}
+
+    def get_params(self, data):
+        # Most rules report their options only, whatever the failing value
+        return self.error_params()
+
+
+class _StaticMessageRule(Rule):
+    __slots__ = ("_message", "_error")
+
+    def __init__(self, value=None):
+        super(_StaticMessageRule, self).__init__(value)
+        self._message = self.message.format(**self.message_params())
+        # The message does not depend on the data, so one error object serves every failure
+        self._error = ErrorDetail(self.name, rule=self)
+
+    def message_params(self):
+        return {}
+
+    def get_message(self, data):
+        return self._message
+
+    def get_error(self, data):
+        return self._error
+
+
+@register_rule
+class NotNullRule(_StaticMessageRule):
+    __slots__ = ()
+
+    name = "not_null"
+    message = "This field cannot be null"
+
+    def __call__(self, data):
+        if data is not None:
+            return data
+        return INVALID
+
+
+@register_rule
+class NotBlankRule(_StaticMessageRule):
+    __slots__ = ()
+
+    name = "not_blank"
+    message = "This field cannot be blank"
+
+    def __call__(self, data):
+        if data != "":
+            return data
+        return INVALID
+
+
+@register_rule
+class IntRule(Rule):
+    __slots__ = ()
+
+    name = "int"
+    message = "This field must be integer but get {data_type}"
+
+    def __call__(self, data):
+        if isinstance(data, int):
+            return data
+        if isinstance(data, _NUMBER_TYPES):
+            return int(data)
+        if isinstance(data, six.string_types):
+            if _INT_PATTERN.match(data):
+                return int(data)
+        if data is None:
+            return data
+        return INVALID
+
+
+@register_rule
+class FloatRule(Rule):
+    __slots__ = ()
+
+    name = "float"
+    message = "This field must be float  {data_type}"
+
+    def __call__(self, data):
+        if isinstance(data, float):
+            return data
+        if isinstance(data, _NUMBER_TYPES):
+            return float(data)
+        if data is None:
+            return data
+        return INVALID
+
+
+@register_rule
+class StringRule(Rule):
+    __slots__ = ()
+
+    name = "string"
+    message = "This field must be string but get {data_type}"
+
+    def __call__(self, data):
+        if isinstance(data, six.string_types) or data is None:
+            return data
+        return INVALID
+
+
+@register_rule
+class MaxLenRule(_StaticMessageRule):
+    __slots__ = ()
+
+    name = "max_len"
+    message = "This field must be larger than {len} characters"
+
+    def message_params(self):
+        return {"len": self.value}
+
+    def __call__(self, data):
+        if data is None or len(data) <= self.value:
+            return data
+        return INVALID
+
+
+@register_rule
+class MinLenRule(_StaticMessageRule):
+    __slots__ = ()
+
+    name = "min_len"
+    message = "This field must be smaller than {len} characters"
+
+    def message_params(self):
+        return {"len": self.value}
+
+    def __call__(self, data):
+        if data is None or len(data) >= self.value:
+            return data
+        return INVALID
+
+
+@register_rule
+class MaxValueRule(_StaticMessageRule):
+    __slots__ = ()
+
+    name = "max_value"
+    message = "This field must be larger than {len}"
+
+    def message_params(self):
+        return {"len": self.value}
+
+    def __call__(self, data):
+        if data is None or data <= self.value:
+            return data
+        return INVALID
+
+
+@register_rule
+class MinValueRule(_StaticMessageRule):
+    __slots__ = ()
+
+    name = "min_value"
+    message = "This field must be smaller than {len}"
+
+    def message_params(self):
+        return {"len": self.value}
+
+    def __call__(self, data):
+        if data is None or data >= self.value:
+            return data
+        return INVALID
+
+
+# Messages and error params of an "in" rule list at most this many choices
+MAX_LISTED_CHOICES = 20
+
+
+@register_rule
+class InRule(_StaticMessageRule):
+    __slots__ = ("choices",)
+
+    name = "in"
+    message = "This field must be choice from ({choices})"
+
+    def __init__(self, value=None):
+        super(InRule, self).__init__(value)
+        if isinstance(value, (frozenset, ChoicesFromFile)):
+            self.choices = value
+            return
+        try:
+            self.choices = frozenset(value)
+        except TypeError:
+            self.choices = value
+
+    def _listed(self):
+        # The first choices, and whether there are more
+        listed = list(itertools.islice(self.value, MAX_LISTED_CHOICES + 1))
+        return listed[:MAX_LISTED_CHOICES], len(listed) > MAX_LISTED_CHOICES
+
+    def message_params(self):
+        listed, more = self._listed()
+        choices = ",".join(choice if isinstance(choice, six.string_types) else str(choice) for choice in listed)
+        return {"choices": choices + ",..." if more else choices}
+
+    def error_params(self):
+        listed, more = self._listed()
+        if more:
+            return {"choices": listed, "truncated": True}
+        return {"choices": listed}
+
+    def __call__(self, data):
+        try:
+            if data in self.choices:
+                return data
+        except TypeError:
+            # Unhashable data is in no set of hashable choices
+            pass
+        return INVALID
+
+
+@register_rule
+class RegexRule(_StaticMessageRule):
+    __slots__ = ("match",)
+
+    name = "regex"
+    message = "This field must be valid in pattern ({pattern})"
+
+    def __init__(self, value=None):
+        super(RegexRule, self).__init__(value)
+        self.match = re.compile(value).match
+
+    def message_params(self):
+        return {"pattern": self.value}
+
+    def error_params(self):
+        return {"pattern": self.value}
+
+    def __call__(self, data):
+        if data is None or self.match(data):
+            return data
+        return INVALID
+
+
+class _DateRuleBase(Rule):
+    __slots__ = ("format", "convert", "iso", "_cache")
+
+    convert_option = None
+    default_format = None
+
+    def __init__(self, value=None):
+        super(_DateRuleBase, self).__init__(value)
+        self.format = value['format']
+        self.convert = value[self.convert_option]
+        self.iso = self.format == self.default_format
+        cache_size = value.get('cache_size')
+        self._cache = LRUCache(cache_size) if cache_size else None
+
+    def get_message(self, data):
+        if isinstance(data, six.string_types):
+            data = data.strip()
+        return self.message.format(date_format=self.format, data=data)
+
+    def error_params(self):
+        return {"format": self.format}
+
+    def __call__(self, data):
+        if isinstance(data, six.string_types):
+            data = data.strip()
+            cache = self._cache
+            if cache is None:
+                return self.parse(data)
+            result = cache.get(data)
+            if result is None:
+                result = self.parse(data)
+                cache.set(data, result)
+            return result
+        return self.convert_value(data)
+
+    def parse(self, data):
+        raise NotImplementedError
+
+    def convert_value(self, data):
+        raise NotImplementedError
+
+
+@register_rule
+class DateRule(_DateRuleBase):
+    __slots__ = ()
+
+    name = "date"
+    message = "This field must be valid date (format='{date_format}') but given data is {data}"
+    convert_option = 'convert_to_date'
+    default_format = dates.DEFAULT_DATE_FORMAT
+
+    def parse(self, data):
+        try:
+            value = dates.parse_iso_date(data) if self.iso else None
+            if value is None:
+                value = dates.parse_date(data, self.format)
+            elif not self.convert and data[0] != "0":
+                # Canonical input already is its own rendering; strftime does not
+                # zero pad years below 1000 on every platform
+                return data
+            return value if self.convert else value.strftime(self.format)
+        except ValueError:
+            return INVALID
+
+    def convert_value(self, data):
+        if isinstance(data, datetime.datetime):
+            data = data.date()
+        elif not isinstance(data, datetime.date):
+            return INVALID
+        if self.convert:
+            return data
+        try:
+            return data.strftime(self.format)
+        except ValueError:
+            return INVALID
+
+
+@register_rule
+class DateTimeRule(_DateRuleBase):
+    __slots__ = ("allow_timezone",)
+
+    name = "datetime"
+    message = "This field must be valid datetime (format='{date_format}') but given data is {data}"
+    convert_option = 'convert_to_datetime'
+    default_format = dates.DEFAULT_DATETIME_FORMAT
+
+    def __init__(self, value=None):
+        super(DateTimeRule, self).__init__(value)
+        self.allow_timezone = value.get('allow_timezone', False)
+
+    def parse(self, data):
+        try:
+            value = dates.parse_iso_datetime(data) if self.iso else None
+            if value is None:
+                value = dates.parse_datetime(data, self.format, self.allow_timezone)
+            elif not self.convert and data[0] != "0":
+                return data
+            return value if self.convert else self.render(value)
+        except ValueError:
+            return INVALID
+
+    def convert_value(self, data):
+        if not isinstance(data, datetime.datetime):
+            if not isinstance(data, datetime.date):
+                return INVALID
+            data = datetime.datetime(data.year, data.month, data.day)
+        if self.convert:
+            return data
+        try:
+            return self.render(data)
+        except ValueError:
+            return INVALID
+
+    def render(self, value):
+        text = value.strftime(self.format)
+        if self.allow_timezone and value.tzinfo is not None:
+            text += dates.format_offset(value.utcoffset())
+        return text
+
+
+@register_rule
+class BooleanRule(Rule):
+    __slots__ = ()
+
+    name = "boolean"
+    message = "This field must be boolean bug given  {data_type}"
+
+    def __call__(self, data):
+        if isinstance(data, bool):
+            return data
+        return INVALID
+
+
+@register_rule
+class ListRule(Rule):
+    __slots__ = ()
+
+    name = "list"
+    message = "This field must be list bug given  {data_type}"
+
+    def __call__(self, data):
+        if isinstance(data, list):
+            return data
+        return INVALID
+
 
 class Validator(object):
-    NOT_NULL = 'not_null'
-    NOT_BLANK = 'not_blank'
-    INT = "int"
-    FLOAT = "float"
-    STRING = "string"
-    REGEX = "regex"
-    DATE = "date"
-    DATETIME = "datetime"
-    MAX_LEN = "max_len"
-    MIN_LEN = "min_len"
-    MAX_VALUE = "max_value"
-    MIN_VALUE = "min_value"
-    IN = "in"
-    BOOLEAN = "boolean"
-    LIST = "list"
-
-    _MESSAGES = {
-        NOT_NULL: "This field cannot be null",
-        NOT_BLANK: "This field cannot be blank",
-        INT: "This field must be integer but get {data_type}",
-        FLOAT: "This field must be float  {data_type}",
-        STRING: "This field must be string but get {data_type}",
-        MAX_LEN: "This field must be larger than {len} characters",
-        MIN_LEN: "This field must be smaller than {len} characters",
-        MAX_VALUE: "This field must be larger than {len}",
-        MIN_VALUE: "This field must be smaller than {len}",
-        IN: "This field must be choice from ({choices})",
-        REGEX: "This field must be valid in pattern ({pattern})",
-        DATE: "This field must be valid date (format='{date_format}') but given data is {data}",
-        DATETIME: "This field must be valid datetime (format='{date_format}') but given data is {data}",
-        BOOLEAN: "This field must be boolean bug given  {data_type}",
-        LIST: "This field must be list bug given  {data_type}"
-    }
+    __slots__ = ("data", "_rule", "error")
+
+    NOT_NULL = NotNullRule.name
+    NOT_BLANK = NotBlankRule.name
+    INT = IntRule.name
+    FLOAT = FloatRule.name
+    STRING = StringRule.name
+    REGEX = RegexRule.name
+    DATE = DateRule.name
+    DATETIME = DateTimeRule.name
+    MAX_LEN = MaxLenRule.name
+    MIN_LEN = MinLenRule.name
+    MAX_VALUE = MaxValueRule.name
+    MIN_VALUE = MinValueRule.name
+    IN = InRule.name
+    BOOLEAN = BooleanRule.name
+    LIST = ListRule.name
+
+    _MESSAGES = dict((name, rule.message) for name, rule in _RULES.items())
 
     def __init__(self, data, validator, value=None):
         self.data = data
-        self._validator = "check_{}".format(validator)
-        self._value = value
+        self._rule = build_rule(validator, value)
         self.error = ""
 
     def get_message(self):
         return self.error
 
     def validate(self):
-        return getattr(self, self._validator)()
-
-    def check_not_null(self):
-        if self.data is not None:
-            return True
-        self.error = self._MESSAGES[self.NOT_NULL]
-        return False
-
-    def check_not_blank(self):
-        if self.data != "":
-            return True
-        self.error = self._MESSAGES[self.NOT_BLANK]
-        return False
-
-    def check_int(self):
-        if isinstance(self.data, int):
-            return True
-        if type(self.data) is long:
-            self.data = int(self.data)
-            return True
-        if type(self.data) is Decimal:
-            self.data = int(self.data)
-            return True
-        if isinstance(self.data, (str, unicode)):
-            import re
-            if re.match(r"\d+", self.data):
-                self.data = int(self.data)
-                return True
-        if self.data is None:
-            return True
-        self.error = self._MESSAGES[self.INT].format(data_type=type(self.data).__name__)
-        return False
-
-    def check_float(self):
-        if isinstance(self.data, float):
-            return True
-        if type(self.data) is Decimal:
-            self.data = float(self.data)
-            return True
-        if isinstance(self.data, int):
-            self.data = float(self.data)
-            return True
-        if self.data is None:
-            return True
-        self.error = self._MESSAGES[self.FLOAT].format(data_type=type(self.data).__name__)
-        return False
-
-    def check_string(self):
-        if isinstance(self.data, (str, unicode)):
-            return True
-        if self.data is None:
-            return True
-
-        self.error = self._MESSAGES[self.STRING].format(data_type=type(self.data).__name__)
-        return False
-
-    def check_max_len(self):
-        if len(self.data) <= self._value:
-            return True
-        self.error = self._MESSAGES[self.MAX_LEN].format(len=self._value)
-        return False
-
-    def check_min_len(self):
-        if len(self.data) >= self._value:
-            return True
-        self.error = self._MESSAGES[self.MIN_LEN].format(len=self._value)
-        return False
-
-    def check_max_value(self):
-        if self.data <= self._value:
-            return True
-        self.error = self._MESSAGES[self.MAX_VALUE].format(len=self._value)
-        return False
-
-    def check_min_value(self):
-        if self.data >= self._value:
-            return True
-        self.error = self._MESSAGES[self.MIN_VALUE].format(len=self._value)
-        return False
-
-    def check_in(self):
-        if self.data in self._value:
-            return True
-        self.error = self._MESSAGES[self.IN].format(choices=",".join(self._value))
-        return False
-
-    def check_regex(self):
-        import re
-        if re.match(self._value, self.data):
-            return True
-        self.error = self._MESSAGES[self.REGEX].format(pattern=self._value)
-        return False
-
-    def check_date(self):
-        if isinstance(self.data, (str, unicode)):
-            self.data = self.data.strip()
-        import datetime
-        if self._value['convert_to_date']:
-            if isinstance(self.data, datetime.datetime):
-                self.data = self.data.date()
-                return True
-            elif isinstance(self.data, datetime.date):
-                return True
-            elif isinstance(self.data, (str, unicode)):
-                try:
-                    self.data = datetime.datetime.strptime(self.data, self._value['format']).date()
-                    return True
-                except Exception as e:
-                    self.error = self._MESSAGES[self.DATE].format(date_format=self._value['format'],
-                                                                  data=self.data)
-                    return False
-        else:
-            if isinstance(self.data, datetime.datetime):
-                self.data = self.data.date().strftime(self._value['format'])
-                return True
-            elif isinstance(self.data, datetime.date):
-                self.data = self.data.strftime(self._value['format'])
-                return True
-            elif isinstance(self.data, (str, unicode)):
-                try:
-                    self.data = datetime.datetime.strptime(
-                        self.data,
-                        self._value['format']
-                    ).date().strftime(self._value['format'])
-                    return True
-                except Exception as e:
-                    self.error = self._MESSAGES[self.DATE].format(date_format=self._value['format'],
-                                                                  data=self.data)
-                    return False
-        self.error = self._MESSAGES[self.DATE].format(date_format=self._value['format'], data=self.data)
-        return False
-
-    def check_datetime(self):
-        if isinstance(self.data, (str, unicode)):
-            self.data = self.data.strip()
-
-        import datetime
-        if self._value['convert_to_datetime']:
-            if isinstance(self.data, datetime.datetime):
-                return True
-            elif isinstance(self.data, datetime.date):
-                self.data = datetime.datetime(self.data.year, self.data.month, self.data.day)
-                return True
-            elif isinstance(self.data, (str, unicode)):
-                try:
-                    self.data = datetime.datetime.strptime(self.data, self._value['format'])
-                    return True
-                except Exception as e:
-                    self.error = self._MESSAGES[self.DATETIME].format(date_format=self._value['format'], data=self.data)
-                    return False
-        else:
-            if isinstance(self.data, datetime.datetime):
-                self.data = self.data.strftime(self._value['format'])
-                return True
-            elif isinstance(self.data, datetime.date):
-                self.data = datetime.datetime(self.data.year, self.data.month, self.data.day).strftime(
-                    self._value['format'])
-                return True
-            elif isinstance(self.data, (str, unicode)):
-                self.data = datetime.datetime.strptime(
-                    self.data,
-                    self._value['format']
-                ).strftime(self._value['format'])
-                try:
-                    self.data = datetime.datetime.strptime(
-                        self.data,
-                        self._value['format']
-                    ).strftime(self._value['format'])
-                    return True
-                except Exception as e:
-                    self.error = self._MESSAGES[self.DATETIME].format(date_format=self._value['format'], data=self.data)
-                    return False
-        self.error = self._MESSAGES[self.DATETIME].format(date_format=self._value['format'], data=self.data)
-        return False
-
-    def check_boolean(self):
-        if isinstance(self.data, bool):
-            return True
-        self.error = self._MESSAGES[self.BOOLEAN].format(data_type=type(self.data).__name__)
-
-        return False
-
-    def check_list(self):
-        if isinstance(self.data, list):
-            return True
-        self.error = self._MESSAGES[self.LIST].format(data_type=type(self.data).__name__)
-
-        return False
+        result = self._rule(self.data)
+        if result is INVALID:
+            self.error = self._rule.get_message(self.data)
+            return False
+        self.data = result
+        return True
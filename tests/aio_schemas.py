@@ -0,0 +1,93 @@
+"""Serializers with async hooks and rules, and their sync twins (Python 3 only)."""
+import asyncio
+
+from request_validator.fields import CharField, IntField
+from request_validator.serializers import Serializer, ValidationError
+from request_validator.validator import INVALID, Rule
+
+
+class FakeDatabase(object):
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.calls = 0
+
+    async def exists(self, key):
+        self.active += 1
+        self.calls += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.001)
+        self.active -= 1
+        return key % 3 != 0
+
+
+database = FakeDatabase()
+
+
+class ExistsRule(Rule):
+    __slots__ = ()
+
+    name = "exists"
+    message = "Unknown id {data}"
+    is_async = True
+
+    async def __call__(self, data):
+        if data is None or await database.exists(data):
+            return data
+        return INVALID
+
+
+class SyncExistsRule(Rule):
+    __slots__ = ()
+
+    name = "exists"
+    message = "Unknown id {data}"
+
+    def __call__(self, data):
+        if data is None or data % 3 != 0:
+            return data
+        return INVALID
+
+
+def _check_owner(attr):
+    if attr and attr.get("owner_id") == 5:
+        raise ValidationError({"owner_id": "banned"})
+    return attr
+
+
+class AsyncOwnerSerializer(Serializer):
+    owner_id = IntField(required=True, rules=[ExistsRule()])
+
+    async def validate(self, attr):
+        await asyncio.sleep(0.001)
+        return _check_owner(attr)
+
+
+class SyncOwnerSerializer(Serializer):
+    owner_id = IntField(required=True, rules=[SyncExistsRule()])
+
+    def validate(self, attr):
+        return _check_owner(attr)
+
+
+class AsyncItemSerializer(Serializer):
+    id = IntField(required=True, min_value=1, rules=[ExistsRule()])
+    name = CharField(max_length=3)
+    owner = AsyncOwnerSerializer(required=False)
+    others = AsyncOwnerSerializer(many=True, required=False)
+    ids = IntField(many=True, rules=[ExistsRule()], min_value=1)
+
+
+class SyncItemSerializer(Serializer):
+    id = IntField(required=True, min_value=1, rules=[SyncExistsRule()])
+    name = CharField(max_length=3)
+    owner = SyncOwnerSerializer(required=False)
+    others = SyncOwnerSerializer(many=True, required=False)
+    ids = IntField(many=True, rules=[SyncExistsRule()], min_value=1)
+
+
+class AsyncHookSerializer(Serializer):
+    n = IntField()
+
+    async def validate(self, attr):
+        return attr
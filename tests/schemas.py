@@ -0,0 +1,165 @@
+"""Serializers and payloads shared by the tests.
+
+They live in a module so worker processes and the command line can import
+them by their dotted path.
+"""
+from __future__ import absolute_import
+
+from request_validator.fields import (BooleanField, CharField, DateField, FloatField, IntField, ListField,
+                                      RegexField)
+from request_validator.serializers import Serializer, ValidationError
+
+
+def with_backend(serializer_class, backend):
+    meta = type("Meta", (object,), {"backend": backend})
+    return type(serializer_class.__name__, (serializer_class,), {"Meta": meta})
+
+
+def outcome(serializer):
+    """Everything a validation run exposes, to compare two runs."""
+    return (serializer.has_error(), serializer.get_errors(), serializer.validate_data(), serializer.data,
+            [detail.as_dict() for detail in serializer.error_details()])
+
+
+class GlossDefSerializer(Serializer):
+    para = CharField()
+    gloss_see_also = CharField(many=True, source="GlossSeeAlso")
+
+
+class GlossEntrySerializer(Serializer):
+    id = IntField(source="ID")
+    sort_as = CharField(source="SortAs")
+    gloss_term = CharField(source="GlossTerm")
+    acronym = CharField(source="Acronym")
+    abbrev = CharField(source="Abbrev", required=True, allow_blank=False)
+    gloss_def = GlossDefSerializer(source="GlossDef")
+    gloss_see = CharField(source="GlossSee")
+
+
+class GlossListSerializer(Serializer):
+    gloss_entry = GlossEntrySerializer(source="GlossEntry")
+
+
+class GlossDivSerializer(Serializer):
+    title = CharField()
+    gloss_list = GlossListSerializer(source="GlossList")
+
+
+class GlossarySerializer(Serializer):
+    title = CharField()
+    gloss_div = GlossDivSerializer(source="GlossDiv")
+
+
+class SampleSerializer(Serializer):
+    glossary = GlossarySerializer()
+
+
+def sample_data(abbrev=""):
+    return {"glossary": {"title": "example glossary", "GlossDiv": {"title": "S", "GlossList": {"GlossEntry": {
+        "ID": 12, "SortAs": "SGML", "GlossTerm": "Standard Generalized Markup Language", "Acronym": "SGML",
+        "Abbrev": abbrev, "GlossDef": {"para": "A meta-markup language.", "GlossSeeAlso": ["GML", "XML"]},
+        "GlossSee": "markup"}}}}}
+
+
+class ItemSerializer(Serializer):
+    id = IntField(required=True, min_value=1)
+    name = CharField(max_length=5, default="x")
+    price = FloatField(required=False)
+    flag = BooleanField(required=True)
+    when = DateField(required=False, default="2020-01-01")
+    kind = CharField(choices=["a", "b"], required=True)
+    code = RegexField(r"[A-Z]{3}$", required=True)
+
+
+class HookedSerializer(Serializer):
+    a = IntField(required=True)
+    b = CharField(default="d")
+
+    def validate(self, attr):
+        if attr and attr.get("a") == 13:
+            raise ValidationError({"a": "unlucky"})
+        if attr and attr.get("a") == 14:
+            raise ValidationError("bad")
+        return attr
+
+
+class OrderSerializer(Serializer):
+    number = CharField(required=True)
+    items = ItemSerializer(many=True, required=True)
+    hooked = HookedSerializer(required=False)
+    tags = CharField(many=True, required=False, default=[])
+
+
+class ForceValidOrderSerializer(Serializer):
+    number = CharField(required=True)
+    items = ItemSerializer(many=True, force_valid=True)
+
+
+class ExtendedOrderSerializer(OrderSerializer):
+    extra = IntField(default=5)
+
+
+GOOD_ITEM = {"id": "12", "name": "ab", "price": 3, "flag": True, "when": "2019-02-03", "kind": "a", "code": "ABC"}
+BAD_ITEM = {"id": 0, "name": "abcdefg", "price": "x", "flag": 1, "when": "2019-13-03", "kind": "c", "code": "abc"}
+SHORT_ITEM = {"id": 3, "flag": False, "kind": "b", "code": "XYZ"}
+
+# (serializer class, data, keyword arguments of the serializer)
+CASES = [
+    (SampleSerializer, sample_data(), {}),
+    (SampleSerializer, sample_data("x"), {}),
+    (ItemSerializer, GOOD_ITEM, {}),
+    (ItemSerializer, BAD_ITEM, {}),
+    (ItemSerializer, SHORT_ITEM, {}),
+    (ItemSerializer, {}, {}),
+    (ItemSerializer, None, {}),
+    (OrderSerializer, {"number": "1", "items": [GOOD_ITEM, BAD_ITEM, SHORT_ITEM], "hooked": {"a": 13},
+                       "tags": ["a", 1]}, {}),
+    (OrderSerializer, {"number": "1", "items": [GOOD_ITEM], "hooked": {"a": 14}}, {}),
+    (OrderSerializer, {"number": "1", "hooked": {"a": "5"}}, {}),
+    (OrderSerializer, {"number": "1", "items": [], "hooked": {"a": 1}, "tags": ["x"]}, {}),
+    (ForceValidOrderSerializer, {"number": "1", "items": [GOOD_ITEM, BAD_ITEM]}, {}),
+    (ExtendedOrderSerializer, {"number": "1", "items": [SHORT_ITEM], "extra": "7"}, {}),
+    (ItemSerializer, [GOOD_ITEM, BAD_ITEM, SHORT_ITEM], {"many": True}),
+    (ItemSerializer, None, {"many": True}),
+    (HookedSerializer, {"a": 13}, {}),
+    (HookedSerializer, {"a": 14, "b": "z"}, {}),
+]
+
+
+class TagSerializer(Serializer):
+    label = CharField(required=True, max_length=5)
+
+
+class RowSerializer(Serializer):
+    id = IntField(required=True, min_value=1)
+    code = RegexField(pattern=r"[A-Z]+$", default="A")
+    day = DateField(cache_size=16, default="2020-01-01", convert_to_date=True)
+    tags = TagSerializer(many=True, required=False)
+    extra = ListField(default=[])
+
+    def validate(self, attr):
+        if attr and attr.get("id") == 13:
+            raise ValidationError("unlucky")
+        return attr
+
+
+class FastRowSerializer(RowSerializer):
+    class Meta:
+        backend = "codegen"
+
+
+def rows(count):
+    choices = ([{"label": "a"}], [{"label": "toolong"}], None, [])
+    return [{"id": (index, 13, 0, "x")[index % 4] if index % 3 else index + 1,
+             "code": "AB" if index % 5 else "ab",
+             "day": "2024-01-02" if index % 7 else "bad",
+             "tags": choices[index % len(choices)]} for index in range(count)] + [None, {}]
+
+
+class CsvRowSerializer(Serializer):
+    name = CharField(required=True)
+    qty = IntField()
+    price = FloatField(source="unit_price")
+    active = BooleanField()
+    note = CharField()
+    tags = CharField(many=True)
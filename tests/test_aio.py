@@ -0,0 +1,76 @@
+from __future__ import absolute_import
+
+import random
+import unittest
+
+import six
+
+from .schemas import outcome
+
+if not six.PY2:
+    import asyncio
+
+    from .aio_schemas import AsyncHookSerializer, AsyncItemSerializer, SyncItemSerializer, database
+
+
+def random_items(count):
+    rnd = random.Random(1)
+    items = [{"id": rnd.choice([1, 2, 3, 0, "x", None]), "name": rnd.choice(["ab", "abcd"]),
+              "owner": rnd.choice([None, {"owner_id": 4}, {"owner_id": 6}, {"owner_id": 5}, {}]),
+              "others": rnd.choice([[{"owner_id": 1}, {"owner_id": 5}], [], None, [{"owner_id": 3}]]),
+              "ids": rnd.choice([[1, 2], [3, 0, "x"], None, "x", [], [None, 6]])} for _ in range(count)]
+    return items + [None, {}]
+
+
+@unittest.skipIf(six.PY2, "asyncio validation needs Python 3")
+class AsyncTest(unittest.TestCase):
+    def test_same_as_sync(self):
+        for item in random_items(30):
+            expected = SyncItemSerializer(data=item)
+            expected.is_valid()
+            serializer = AsyncItemSerializer(data=item)
+            self.assertEqual(asyncio.run(serializer.is_valid_async()), not expected.has_error())
+            self.assertEqual(outcome(serializer), outcome(expected), item)
+            self.assertEqual(serializer.is_all_fields_valid, expected.is_all_fields_valid)
+
+    def test_lists_run_concurrently(self):
+        items = random_items(60)
+        expected = SyncItemSerializer(data=items, many=True)
+        expected.is_valid()
+        database.peak = 0
+        serializer = AsyncItemSerializer(data=items, many=True)
+        asyncio.run(serializer.is_valid_async(concurrency=5))
+        self.assertEqual(outcome(serializer), outcome(expected))
+        self.assertGreater(database.peak, 1)
+        self.assertLessEqual(database.peak, 5)
+
+    def test_error_budget(self):
+        data = [{"n": "x"}] * 5
+        serializer = AsyncHookSerializer(data=data, many=True, max_errors=2)
+        self.assertFalse(asyncio.run(serializer.is_valid_async()))
+        self.assertEqual(len(serializer.errors), 2)
+
+    def test_error_budget_stops_validation(self):
+        items = [{"id": index, "name": "ab", "owner": {"owner_id": 1}} for index in range(1, 61)]
+        for max_errors in (1, 2, 5, 100):
+            expected = SyncItemSerializer(data=items, many=True, max_errors=max_errors)
+            expected.is_valid()
+            database.calls = 0
+            serializer = AsyncItemSerializer(data=items, many=True, max_errors=max_errors)
+            asyncio.run(serializer.is_valid_async())
+            self.assertEqual(outcome(serializer), outcome(expected), max_errors)
+            # Every third id fails; an item checks its id (twice when it fails) and its owner
+            checked = min(len(items), 3 * max_errors + max_errors - 1)
+            self.assertLessEqual(database.calls, 3 * checked, max_errors)
+        self.assertEqual(len(serializer.errors), 20)
+
+        database.calls = 0
+        serializer = AsyncItemSerializer(data=[{"id": 3, "name": "ab", "owner": {"owner_id": 1}}] * 50, many=True,
+                                         max_errors=2)
+        self.assertFalse(asyncio.run(serializer.is_valid_async()))
+        self.assertEqual(len(serializer.errors), 2)
+        self.assertEqual(database.calls, 6)
+
+    def test_sync_validation_is_refused(self):
+        self.assertRaises(AssertionError, AsyncItemSerializer(data={"id": 1}).is_valid)
+        self.assertRaises(AssertionError, lambda: list(AsyncItemSerializer.validate_each([{"id": 1}])))
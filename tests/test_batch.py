@@ -0,0 +1,73 @@
+from __future__ import absolute_import
+
+import random
+import unittest
+
+from request_validator import batch
+from request_validator.fields import BooleanField, CharField, FloatField, IntField, ListField, RegexField
+from request_validator.serializers import Serializer
+
+
+class ColumnSerializer(Serializer):
+    id = IntField(required=True, min_value=1, max_value=10 ** 6)
+    score = FloatField(min_value=0.0, max_value=100.0, allow_null=False)
+    name = CharField(max_length=12, min_length=2, source="full_name")
+    kind = CharField(choices=["a", "b", "c"], default="a")
+    level = IntField(choices=[1, 2, 3], default=1)
+    active = BooleanField(default=False)
+    code = RegexField(pattern=r"[A-Z]{3}$", default="ABC")
+    tags = CharField(many=True, default=None)
+    extra = ListField(default=[])
+
+
+class HookedColumnSerializer(ColumnSerializer):
+    def validate(self, attr):
+        return attr
+
+
+ODD_VALUES = [None, "", "12", 0, -5, 10 ** 7, 2 ** 70, 1.5, True, "zz", "x" * 20, [1], "a\x00", 4, "d", {}, 50,
+              -0.5, 200.0, 2 ** 63]
+
+
+def random_rows(rnd, count):
+    rows = []
+    for _ in range(count):
+        row = {"id": rnd.randint(1, 10 ** 6), "score": rnd.uniform(0, 100), "full_name": "x" * rnd.randint(2, 12),
+               "kind": rnd.choice("abc"), "level": rnd.choice([1, 2, 3]), "active": rnd.choice([True, False]),
+               "code": "ABC", "tags": ["t"]}
+        if rnd.random() < .2:
+            row[rnd.choice(list(row) + ["extra"])] = rnd.choice(ODD_VALUES)
+            if rnd.random() < .2:
+                row.pop(rnd.choice(list(row)), None)
+        rows.append(row)
+    rows += [None, {}, []]
+    rnd.shuffle(rows)
+    return rows
+
+
+@unittest.skipUnless(batch.is_available(), "NumPy is not installed")
+class ColumnarTest(unittest.TestCase):
+    def assertSameAsRows(self, serializer_class, rows):
+        expected = serializer_class(data=rows, many=True)
+        expected.is_valid()
+        serializer = serializer_class(data=rows, many=True, columnar=True)
+        serializer.is_valid()
+        self.assertEqual((serializer.errors, serializer.validate_data(), serializer.data),
+                         (expected.errors, expected.validate_data(), expected.data))
+
+    def test_columns_match_rows(self):
+        rnd = random.Random(0)
+        for count in (10, 300, 1000, 1000):
+            self.assertSameAsRows(ColumnSerializer, random_rows(rnd, count))
+
+    def test_supported_plans(self):
+        self.assertTrue(batch.supports(ColumnSerializer._plan))
+        self.assertFalse(batch.supports(HookedColumnSerializer._plan))
+        self.assertSameAsRows(HookedColumnSerializer, random_rows(random.Random(1), 300))
+
+    def test_defaults_are_copied_per_row(self):
+        rows = [{"id": index + 1, "score": 1.0} for index in range(batch.MIN_COLUMNAR_ROWS)]
+        serializer = ColumnSerializer(data=rows, many=True, columnar=True)
+        self.assertTrue(serializer.is_valid())
+        serializer.data[0]["extra"].append(1)
+        self.assertEqual(serializer.data[1]["extra"], [])
@@ -0,0 +1,66 @@
+from __future__ import absolute_import
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import six
+
+from benchmarks import runner
+from benchmarks.cases import CASES, CODEGEN, PLAN
+
+
+class BenchmarkCasesTest(unittest.TestCase):
+    def test_cases_validate_as_expected(self):
+        for name, build, valid in CASES:
+            for backend in (PLAN, CODEGEN):
+                run, operations = build(backend)
+                self.assertEqual(run(), valid, (name, backend))
+                self.assertGreater(operations, 0)
+
+    def test_measure(self):
+        run, operations = dict((name, build) for name, build, _ in CASES)["flat5"](PLAN)
+        result = runner.measure(run, operations, min_time=0.01)
+        self.assertGreater(result["ops"], 0)
+        self.assertLessEqual(result["p50"], result["p99"])
+        if runner.tracemalloc is not None:
+            self.assertGreater(result["peak"], 0)
+
+    def test_compare(self):
+        baseline = {"ops": 1000.0, "peak": 1000}
+        self.assertEqual(runner.compare({"ops": 950.0, "peak": 1050}, baseline, 0.1), [])
+        self.assertEqual(len(runner.compare({"ops": 800.0, "peak": 1200}, baseline, 0.1)), 2)
+        self.assertEqual(runner.compare({"ops": 1000.0, "peak": None}, baseline, 0.1), [])
+
+    def test_select_cases(self):
+        self.assertEqual([name for name, _, _ in runner.select_cases(["regex"], PLAN)], ["regex[plan]"])
+        self.assertEqual(len(list(runner.select_cases())), 2 * len(CASES))
+
+
+class BenchmarkCommandTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.stdout = sys.stdout
+        sys.stdout = six.StringIO()
+
+    def tearDown(self):
+        sys.stdout = self.stdout
+        shutil.rmtree(self.directory)
+
+    def test_baseline(self):
+        path = os.path.join(self.directory, "baseline.json")
+        self.assertEqual(runner.main(["flat5", "--backend", "plan", "--min-time", "0.01", "--save", path]), 0)
+        with open(path) as stream:
+            baseline = json.load(stream)
+        self.assertEqual(sorted(baseline), sorted(["flat5[plan]", "flat50[plan]", "flat50_invalid[plan]"]))
+
+        self.assertEqual(runner.main(["flat5", "--backend", "plan", "--min-time", "0.01", "--compare", path,
+                                      "--tolerance", "100"]), 0)
+        for result in baseline.values():
+            result["ops"] *= 1000
+        with open(path, "w") as stream:
+            json.dump(baseline, stream)
+        self.assertEqual(runner.main(["flat5", "--backend", "plan", "--min-time", "0.01", "--compare", path]), 1)
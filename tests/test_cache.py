@@ -0,0 +1,125 @@
+from __future__ import absolute_import
+
+import pickle
+import time
+import unittest
+
+from request_validator.cache import LRUCache, content_key
+from request_validator.fields import CharField, IntField, ListField
+from request_validator.serializers import Serializer
+
+
+class CountSerializer(Serializer):
+    n = IntField(max_value=3, required=True)
+
+
+class CachedSerializer(Serializer):
+    a = CharField(choices=[u"x", u"y"], required=True)
+    b = CountSerializer(many=True, required=False)
+    one = IntField(source="1")
+    items = ListField(default=[])
+    hook_calls = 0
+
+    class Meta:
+        cache = LRUCache(16)
+
+    def validate(self, attr):
+        CachedSerializer.hook_calls += 1
+        return attr
+
+
+def result(serializer):
+    return serializer.get_errors(), serializer.data, [detail.path for detail in serializer.error_details()]
+
+
+class ResultCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = CachedSerializer.Meta.cache
+        self.cache.clear()
+        self.cache.hits = self.cache.misses = self.cache.evictions = 0
+
+    def validate(self, data, **options):
+        serializer = CachedSerializer(data=data)
+        valid = serializer.is_valid(**options)
+        return valid, result(serializer)
+
+    def test_repeated_payloads_hit(self):
+        good = {u"a": u"x", u"b": [{u"n": 1}]}
+        bad = {u"a": u"z", u"b": [{u"n": 1}, {u"n": 9}]}
+        first = self.validate(good), self.validate(bad)
+        calls = CachedSerializer.hook_calls
+        self.assertEqual((self.validate(good), self.validate(bad)), first)
+        self.assertEqual(self.validate({u"b": [{u"n": 1}], u"a": u"x"}), first[0])
+        self.assertEqual(CachedSerializer.hook_calls, calls)
+        self.assertEqual(self.cache.stats(), {"hits": 3, "misses": 2, "evictions": 0, "size": 2, "maxsize": 16})
+
+    def test_cached_results_are_copies(self):
+        data = {u"a": u"z", u"b": [{u"n": 9}]}
+        serializer = CachedSerializer(data=data)
+        serializer.is_valid()
+        serializer.data["a"] = u"changed"
+        serializer.get_errors()["b"][0]["n"].append(u"changed")
+        self.assertEqual(self.validate(data), (False, (
+            {"a": ["This field must be choice from (x,y)"], "b": [{"n": ["This field must be larger than 3"]}]},
+            {"a": None, "b": [], "one": None, "items": []}, [("a",), ("b", 0, "n")])))
+
+    def test_keys_keep_types_apart(self):
+        text_key = self.validate({u"a": u"x", u"1": u"no"})
+        self.assertFalse(text_key[0])
+        self.assertEqual(self.validate({u"a": u"x", 1: u"no"}), (True, ({}, {
+            "a": u"x", "b": [], "one": None, "items": []}, [])))
+        self.assertEqual(self.validate({u"a": u"x", u"1": u"no"}), text_key)
+
+        as_list = self.validate({u"a": u"x", u"items": [1]})
+        self.assertTrue(as_list[0])
+        self.assertEqual(self.validate({u"a": u"x", u"items": (1,)})[0], False)
+        self.assertEqual(self.validate({u"a": u"x", u"items": [1]}), as_list)
+
+        self.assertIsNone(content_key({1: 5}))
+        self.assertIsNone(content_key([(1,)]))
+        self.assertIsNone(content_key({u"a": object()}))
+        self.assertNotEqual(content_key({u"n": 1}), content_key({u"n": True}))
+        self.assertNotEqual(content_key({u"n": 1}), content_key({u"n": 1.0}))
+
+    def test_options_that_skip_the_cache(self):
+        data = {u"a": u"x"}
+        self.validate(data)
+        calls = CachedSerializer.hook_calls
+        self.validate(data, use_cache=False)
+        self.validate(data, only=["a"])
+        self.validate(data, partial=True)
+        self.assertEqual(CachedSerializer.hook_calls, calls + 3)
+        self.validate(data, fail_fast=True)
+        self.assertEqual(self.cache.stats()["hits"], 0)
+
+    def test_raw_bodies(self):
+        serializer = CachedSerializer(data={u"a": u"x"})
+        serializer.is_valid(raw=b'{"a": "x"}')
+        serializer = CachedSerializer(data={u"a": u"x"})
+        serializer.is_valid(raw=b'{"a": "x"}')
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+
+class LRUCacheTest(unittest.TestCase):
+    def test_eviction(self):
+        cache = LRUCache(2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.set("c", 3)
+        self.assertNotIn("b", cache)
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 0, "evictions": 1, "size": 2, "maxsize": 2})
+
+    def test_ttl(self):
+        cache = LRUCache(2, ttl=0.01)
+        cache.set("a", 1)
+        self.assertEqual(cache.get("a"), 1)
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.evictions, 1)
+
+    def test_pickled_copies_start_empty(self):
+        cache = LRUCache(5, ttl=3)
+        cache.set("a", 1)
+        copy = pickle.loads(pickle.dumps(cache))
+        self.assertEqual((copy.maxsize, copy.ttl, len(copy)), (5, 3, 0))
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+import io
+import os
+import pickle
+import random
+import shutil
+import tempfile
+import unittest
+
+from request_validator.choices import ChoicesFromFile
+from request_validator.fields import CharField, IntField
+from request_validator.serializers import Serializer
+from request_validator.validator import InRule
+
+
+class ChoicesFromFileTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        rnd = random.Random(2)
+        self.words = sorted(set(u"w{:05d}".format(rnd.randrange(10 ** 5)) for _ in range(3000)) | {u"zébra", u"w"},
+                            key=lambda word: word.encode("utf-8"))
+        self.path = self.write("choices.txt", self.words)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, name, words):
+        path = os.path.join(self.directory, name)
+        with io.open(path, "w", encoding="utf-8", newline="\n") as stream:
+            stream.write(u"".join(word + u"\n" for word in words))
+        return path
+
+    def test_same_as_a_set(self):
+        choices = ChoicesFromFile(self.path)
+        expected = set(self.words)
+        candidates = self.words + [u"w{:05d}".format(number) for number in range(0, 10 ** 5, 37)]
+        candidates += [u"", u"zzz", u"a", u"w0", u"zébr", u"zébraa", u"a\nb", u"w\n"]
+        for candidate in candidates:
+            self.assertEqual(candidate in choices, candidate in expected, candidate)
+        self.assertIn(u"zébra".encode("utf-8"), choices)
+        self.assertNotIn(5, choices)
+        self.assertNotIn(None, choices)
+        self.assertEqual(list(choices), self.words)
+
+    def test_empty_file(self):
+        choices = ChoicesFromFile(self.write("empty.txt", []))
+        self.assertNotIn(u"x", choices)
+        self.assertEqual(list(choices), [])
+
+    def test_pickle(self):
+        copy = pickle.loads(pickle.dumps(ChoicesFromFile(self.path)))
+        self.assertEqual((copy.path, copy.encoding), (self.path, "utf-8"))
+        self.assertIn(self.words[10], copy)
+
+    def test_field(self):
+        field = CharField(choices=ChoicesFromFile(self.path))
+        serializer_class = type("NameSerializer", (Serializer,), {"name": field})
+        self.assertTrue(serializer_class(data={"name": self.words[5]}).is_valid())
+        serializer = serializer_class(data={"name": u"nope"})
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(serializer.errors, {"name": [u"This field must be choice from ({},...)".format(
+            u",".join(self.words[:20]))]})
+
+
+class InRuleTest(unittest.TestCase):
+    def test_sets(self):
+        class KindSerializer(Serializer):
+            kind = CharField(choices=frozenset(["a"]))
+            n = IntField(choices={1, 2, 3})
+
+        self.assertTrue(KindSerializer(data={"kind": "a", "n": 2}).is_valid())
+        serializer = KindSerializer(data={"kind": "c", "n": [1]})
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(serializer.errors, {"kind": ["This field must be choice from (a)"], "n": [
+            "This field must be integer but get list", "This field must be choice from (1,2,3)"]})
+
+    def test_unhashable_values(self):
+        rule = InRule([1, 2])
+        self.assertEqual(rule(2), 2)
+        self.assertIsNot(rule([1]), 2)
+        self.assertIsNot(rule({}), 2)
+
+    def test_long_lists_are_truncated(self):
+        rule = InRule(list(range(100)))
+        detail = rule.get_error(500)
+        self.assertEqual(detail.message, "This field must be choice from ({},...)".format(
+            ",".join(str(number) for number in range(20))))
+        self.assertEqual(detail.params, {"choices": list(range(20)), "truncated": True})
+        self.assertEqual(InRule([1, 2]).get_error(5).params, {"choices": [1, 2]})
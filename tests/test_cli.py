@@ -0,0 +1,92 @@
+from __future__ import absolute_import
+
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import six
+
+from request_validator import cli
+
+from .schemas import CsvRowSerializer, ItemSerializer
+
+CSV_ROWS = u"""name,qty,unit_price,active,note,tags
+a,1,2.5,true,,"[""x""]"
+b,,1,no,hello,
+,x,y,maybe,,[1
+"""
+
+
+class CommandTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.stderr = sys.stderr
+        sys.stderr = six.StringIO()
+
+    def tearDown(self):
+        sys.stderr = self.stderr
+        shutil.rmtree(self.directory)
+
+    def write(self, name, text):
+        path = os.path.join(self.directory, name)
+        with io.open(path, "w", encoding="utf-8") as stream:
+            stream.write(text)
+        return path
+
+    def read_lines(self, name):
+        with io.open(os.path.join(self.directory, name), encoding="utf-8") as stream:
+            return [json.loads(line) for line in stream]
+
+    def run_command(self, serializer_class, paths, *options):
+        argv = ["{}.{}".format(serializer_class.__module__, serializer_class.__name__)] + list(paths) + [
+            "--output", os.path.join(self.directory, "valid.ndjson"),
+            "--errors", os.path.join(self.directory, "errors.ndjson")] + list(options)
+        return cli.main(argv)
+
+    def test_ndjson(self):
+        lines = [json.dumps({"id": 1, "flag": True, "kind": "a", "code": "ABC"}), "", "{not json",
+                 json.dumps({"id": 0, "flag": True, "kind": "a", "code": "ABC"}), "[1]"]
+        path = self.write("items.ndjson", u"\n".join(lines) + u"\n")
+        for jobs in ("1", "2"):
+            self.assertEqual(self.run_command(ItemSerializer, [path], "--jobs", jobs, "--chunk-size", "2"), 1)
+            self.assertEqual(self.read_lines("valid.ndjson"), [
+                {"id": 1, "name": "x", "price": None, "flag": True, "when": "2020-01-01", "kind": "a",
+                 "code": "ABC"}])
+            errors = self.read_lines("errors.ndjson")
+            self.assertEqual([(error["file"], error["line"]) for error in errors], [(path, 3), (path, 4), (path, 5)])
+            self.assertIn("non_field_error", errors[0]["errors"])
+            self.assertEqual(errors[1]["errors"], {"id": ["This field must be smaller than 1"]})
+            self.assertEqual(errors[2]["errors"], {"non_field_error": "Expected a JSON object"})
+
+    def test_valid_files_exit_with_zero(self):
+        path = self.write("items.ndjson", json.dumps({"id": 1, "flag": True, "kind": "a", "code": "ABC"}) + u"\n")
+        self.assertEqual(self.run_command(ItemSerializer, [path], "--jobs", "1"), 0)
+        self.assertIn("1 records (1 valid, 0 invalid)", sys.stderr.getvalue())
+
+    def test_csv_cells_are_converted_by_field(self):
+        path = self.write("rows.csv", CSV_ROWS)
+        self.assertEqual(self.run_command(CsvRowSerializer, [path], "--jobs", "1"), 1)
+        self.assertEqual(self.read_lines("valid.ndjson"), [
+            {"name": "a", "qty": 1, "price": 2.5, "active": True, "note": None, "tags": ["x"]},
+            {"name": "b", "qty": None, "price": 1.0, "active": False, "note": "hello", "tags": None}])
+        errors = self.read_lines("errors.ndjson")
+        self.assertEqual(errors[0]["line"], 4)
+        self.assertEqual(sorted(errors[0]["errors"]), ["active", "name", "price", "qty", "tags"])
+
+    def test_unknown_serializer(self):
+        with self.assertRaises(SystemExit):
+            cli.main(["tests.schemas.missing", self.write("a.ndjson", u"")])
+        self.assertRaises(ImportError, cli.import_serializer, "tests.schemas.rows")
+
+
+class CsvRecordTest(unittest.TestCase):
+    def test_converters(self):
+        converters = cli.csv_converters(CsvRowSerializer)
+        self.assertEqual(sorted(converters), ["active", "price", "tags", "unit_price"])
+        record = cli.csv_record({"name": "a", "qty": "", "unit_price": "1e3", "active": "YES", "tags": "[1,",
+                                 "note": None}, converters)
+        self.assertEqual(record, {"name": "a", "unit_price": 1000.0, "active": True, "tags": "[1,"})
@@ -0,0 +1,96 @@
+from __future__ import absolute_import
+
+import random
+import unittest
+
+from request_validator.codegen import GeneratedPlan, generate_source
+from request_validator.fields import CharField, IntField
+from request_validator.serializers import Serializer, ValidationError
+
+from .schemas import CASES, OrderSerializer, outcome, with_backend
+
+
+class TagSerializer(Serializer):
+    label = CharField(max_length=5)
+
+
+class CountSerializer(Serializer):
+    n = IntField(max_value=50, required=True)
+    m = IntField(default=7)
+    tags = TagSerializer(many=True, required=False)
+
+
+class DocumentSerializer(Serializer):
+    a = CharField(choices=["x", "y", "boom"], required=True)
+    b = CountSerializer(many=True)
+    c = CountSerializer(required=False)
+    e = IntField(default=5, source="E")
+
+    def validate(self, data):
+        if isinstance(data, dict) and data.get("a") == "boom":
+            raise ValidationError({"a": "hook says no", "zz": "x"})
+        return data
+
+
+def random_count(rnd):
+    data = {}
+    if rnd.random() < .9:
+        data["n"] = rnd.choice([1, 13, 60, "q", None, 2.0, True])
+    if rnd.random() < .3:
+        data["m"] = rnd.choice([1, "z"])
+    if rnd.random() < .3:
+        data["tags"] = [{"label": rnd.choice(["ok", "toolongx", 3])} for _ in range(rnd.randint(0, 3))]
+    return data
+
+
+def random_document(rnd):
+    data = {}
+    if rnd.random() < .9:
+        data["a"] = rnd.choice(["x", "q", "boom"])
+    if rnd.random() < .9:
+        data["b"] = [random_count(rnd) for _ in range(rnd.randint(0, 4))]
+    if rnd.random() < .5:
+        data["c"] = random_count(rnd) if rnd.random() < .9 else rnd.choice([None, "x", []])
+    if rnd.random() < .3:
+        data["E"] = rnd.choice([1, "w"])
+    return data
+
+
+_generated = {}
+
+
+class CodegenTest(unittest.TestCase):
+    def assertSameOutcome(self, serializer_class, data, kwargs=None, **options):
+        kwargs = kwargs or {}
+        generated_class = _generated.get(serializer_class)
+        if generated_class is None:
+            generated_class = _generated[serializer_class] = with_backend(serializer_class, "codegen")
+        expected = serializer_class(data=data, **kwargs)
+        expected.is_valid(**options)
+        serializer = generated_class(data=data, **kwargs)
+        serializer.is_valid(**options)
+        self.assertEqual(outcome(serializer), outcome(expected), data)
+
+    def test_backend_is_selected_by_meta(self):
+        self.assertNotIsInstance(OrderSerializer._plan, GeneratedPlan)
+        self.assertIsInstance(with_backend(OrderSerializer, "codegen")._plan, GeneratedPlan)
+
+    def test_generated_source(self):
+        source = generate_source(with_backend(OrderSerializer, "codegen"))
+        self.assertIn("def ", source)
+        compile(source, "<generated>", "exec")
+
+    def test_cases_match_the_plan(self):
+        for serializer_class, data, kwargs in CASES:
+            self.assertSameOutcome(serializer_class, data, kwargs)
+
+    def test_fail_fast_matches_the_plan(self):
+        for serializer_class, data, kwargs in CASES:
+            self.assertSameOutcome(serializer_class, data, kwargs, fail_fast=True)
+
+    def test_random_documents_match_the_plan(self):
+        rnd = random.Random(1)
+        for _ in range(300):
+            data = random_document(rnd)
+            self.assertSameOutcome(DocumentSerializer, data)
+            self.assertSameOutcome(DocumentSerializer, [data, random_document(rnd)], {"many": True})
@@ -0,0 +1,141 @@
+from __future__ import absolute_import
+
+import json
+import pickle
+import random
+import unittest
+
+import six
+
+from request_validator.constraints import Constraints
+from request_validator.fields import CharField, IntField
+from request_validator.observe import StatsCollector
+from request_validator.serializers import Serializer
+
+if not six.PY2:
+    import asyncio
+
+
+class NodeSerializer(Serializer):
+    id = IntField(required=True, source="ID")
+    parent_id = IntField()
+    name = CharField()
+
+
+class LineSerializer(Serializer):
+    order = IntField()
+    line = IntField()
+    parent_order = IntField()
+    parent_line = IntField()
+
+
+class TreeSerializer(Serializer):
+    nodes = NodeSerializer(many=True, unique_by="id", references={"parent_id": "id"})
+    lines = LineSerializer(many=True, required=False, unique_by=("order", "line"),
+                           references={("parent_order", "parent_line"): ("order", "line")})
+
+
+class FastTreeSerializer(TreeSerializer):
+    class Meta:
+        backend = "codegen"
+
+
+TREE = {"nodes": [{"ID": 1}, {"ID": 2, "parent_id": 1}, {"ID": 1, "name": 5}, {"ID": 3, "parent_id": 9}, "x",
+                  {"ID": [1]}, {"parent_id": None}],
+        "lines": [{"order": 1, "line": 1}, {"order": 1, "line": 1},
+                  {"order": 1, "line": 2, "parent_order": 1, "parent_line": 3}]}
+
+
+def result(serializer, valid):
+    return valid, json.dumps(serializer.errors, sort_keys=True), serializer.validate_data()
+
+
+def expected_errors(items):
+    """``{index: [(code, error key)]}`` of ``unique_by="id", references={"parent_id": "id"}``, found naively."""
+    def key(item, name):
+        if not isinstance(item, dict):
+            return None
+        value = item["ID"] if name == "id" and "ID" in item else item.get(name)
+        # Unhashable values are left to the validation of the field
+        return None if isinstance(value, list) else value
+
+    errors = {}
+    for index, item in enumerate(items):
+        value = key(item, "id")
+        if value is not None and any(key(other, "id") == value for other in items[:index]):
+            errors.setdefault(index, []).append(("unique", "id"))
+    ids = [key(item, "id") for item in items]
+    for index, item in enumerate(items):
+        value = key(item, "parent_id")
+        if value is not None and value not in ids:
+            errors.setdefault(index, []).append(("reference", "parent_id"))
+    return errors
+
+
+class ConstraintsTest(unittest.TestCase):
+    def test_errors_next_to_element_errors(self):
+        serializer = TreeSerializer(data=TREE)
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(serializer.errors, {
+            "nodes": [{"id": ["This item has the same id as item 0"],
+                       "name": ["This field must be string but get int"]},
+                      {"parent_id": ["parent_id must be the id of an item in this list"]},
+                      {"id": ["This field is required"]}, {"id": ["This field must be integer but get list"]},
+                      {"id": ["This field is required"]}],
+            "lines": [{"non_field_error": ["This item has the same order, line as item 0"]},
+                      {"non_field_error": [
+                          "parent_order, parent_line must be the order, line of an item in this list"]}]})
+        details = [detail.as_dict() for detail in serializer.error_details() if detail.code in ("unique", "reference")]
+        self.assertEqual([(detail["path"], detail["params"]) for detail in details], [
+            (["nodes", 2, "id"], {"fields": ["id"], "index": 0}),
+            (["nodes", 3, "parent_id"], {"fields": ["parent_id"], "references": ["id"]}),
+            (["lines", 1, "non_field_error"], {"fields": ["order", "line"], "index": 0}),
+            (["lines", 2, "non_field_error"],
+             {"fields": ["parent_order", "parent_line"], "references": ["order", "line"]})])
+
+    def test_every_path_agrees(self):
+        results = []
+        for serializer_class in (TreeSerializer, FastTreeSerializer):
+            serializer = serializer_class(data=TREE)
+            results.append(result(serializer, serializer.is_valid()))
+            serializer = serializer_class(data=TREE)
+            results.append(result(serializer, serializer.is_valid(observer=StatsCollector())))
+            serializer = serializer_class(data=TREE)
+            results.append(result(serializer, serializer.revalidate()))
+            if not six.PY2:
+                serializer = serializer_class(data=TREE)
+                results.append(result(serializer, asyncio.run(serializer.is_valid_async())))
+        for found in results[1:]:
+            self.assertEqual(found, results[0])
+
+    def test_revalidate(self):
+        previous = TreeSerializer(data=TREE)
+        previous.revalidate()
+        serializer = TreeSerializer(data={"nodes": [{"ID": 1}, {"ID": 2, "parent_id": 1}]})
+        self.assertTrue(serializer.revalidate(previous))
+        changed = TreeSerializer(data={"nodes": [{"ID": 1}, {"ID": 1, "parent_id": 1}]})
+        self.assertFalse(changed.revalidate(serializer, [("nodes", 1, "ID")]))
+        self.assertEqual(changed.errors, {"nodes": [{"id": ["This item has the same id as item 0"]}]})
+
+    def test_same_as_naive_check(self):
+        rnd = random.Random(4)
+        constraints = TreeSerializer.fields()["nodes"]._constraints
+        for _ in range(300):
+            items = []
+            for _ in range(rnd.randint(0, 8)):
+                item = rnd.choice([{}, {"ID": rnd.randint(1, 6)}, {"id": rnd.randint(1, 6)}, {"ID": None}, "x"])
+                if isinstance(item, dict) and rnd.random() < .5:
+                    item["parent_id"] = rnd.choice([None, rnd.randint(1, 8), [1]])
+                items.append(item)
+            found = dict((index, [(detail.code, key) for key, details in sorted(errors.items()) for detail in details])
+                         for index, errors in (constraints.check(items) or {}).items())
+            self.assertEqual(found, expected_errors(items), items)
+
+    def test_options(self):
+        self.assertRaises(AssertionError, NodeSerializer, many=True, unique_by="ID")
+        self.assertRaises(AssertionError, NodeSerializer, many=True, references={"parent_id": ("id", "name")})
+        self.assertRaises(AssertionError, NodeSerializer, many=True, references=["parent_id"])
+        copy = pickle.loads(pickle.dumps(Constraints(LineSerializer, ("order", "line"),
+                                                     {("parent_order", "parent_line"): ("order", "line")})))
+        self.assertEqual(copy.unique_by, ("order", "line"))
+        self.assertEqual(len(copy.references), 1)
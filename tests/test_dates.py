@@ -0,0 +1,88 @@
+from __future__ import absolute_import
+
+import datetime
+import random
+import unittest
+
+from request_validator.dates import get_timezone
+from request_validator.fields import DateField, DateTimeField
+from request_validator.serializers import Serializer
+from request_validator.validator import INVALID, DateRule, DateTimeRule
+
+
+class EventSerializer(Serializer):
+    day = DateField(convert_to_date=True, cache_size=4)
+    created = DateTimeField(convert_to_datetime=True, allow_timezone=True)
+    text_day = DateField()
+
+
+def strptime(data, format, convert, date=False):
+    # What the rules did before the ISO fast path
+    try:
+        value = datetime.datetime.strptime(data.strip(), format)
+    except ValueError:
+        return INVALID
+    if date:
+        value = value.date()
+    return value if convert else value.strftime(format)
+
+
+def samples():
+    rnd = random.Random(1)
+    parts = ["2019", "1999", "-", "01", "1", "13", "29", "31", "02", "T", " ", "12", ":", "00", "60", "5", "Z",
+             "+03:30", "x"]
+    values = set(["2019-02-03", " 2019-02-03 ", "2019-2-3", "2019-02-29", "2020-02-29", "2019-02-03T04:05:06",
+                  "2019-02-03T4:5:6", "2019-02-03T24:00:00", "2019-02-03T23:59:60", "1999-12-31T23:59:59"])
+    for _ in range(3000):
+        values.add("".join(rnd.choice(parts) for _ in range(rnd.randint(1, 8))))
+    return sorted(values)
+
+
+class DatesTest(unittest.TestCase):
+    def test_iso_formats_match_strptime(self):
+        for convert in (False, True):
+            for cache_size in (None, 4):
+                date_rule = DateRule({"format": "%Y-%m-%d", "convert_to_date": convert, "cache_size": cache_size})
+                datetime_rule = DateTimeRule({"format": "%Y-%m-%dT%H:%M:%S", "convert_to_datetime": convert,
+                                              "cache_size": cache_size})
+                for value in samples():
+                    self.assertEqual(date_rule(value), strptime(value, "%Y-%m-%d", convert, date=True), value)
+                    self.assertEqual(datetime_rule(value), strptime(value, "%Y-%m-%dT%H:%M:%S", convert), value)
+
+    def test_custom_formats_use_strptime(self):
+        rule = DateRule({"format": "%d/%m/%Y", "convert_to_date": True})
+        self.assertEqual(rule("03/02/2019"), datetime.date(2019, 2, 3))
+        self.assertIs(rule("2019-02-03"), INVALID)
+
+    def test_timezones(self):
+        rule = DateTimeRule({"format": "%Y-%m-%dT%H:%M:%S", "convert_to_datetime": True, "allow_timezone": True})
+        self.assertEqual(rule("2019-02-03T04:05:06+03:30"),
+                         datetime.datetime(2019, 2, 3, 4, 5, 6, tzinfo=get_timezone(210)))
+        self.assertEqual(rule("2019-02-03T04:05:06Z").utcoffset(), datetime.timedelta(0))
+        self.assertEqual(rule("2019-02-03T04:05:06-0800").utcoffset(), datetime.timedelta(hours=-8))
+        self.assertIsNone(rule("2019-02-03T04:05:06").tzinfo)
+        self.assertIs(rule("2019-02-03T04:05:06+25:00"), INVALID)
+
+        text = DateTimeRule({"format": "%Y-%m-%dT%H:%M:%S", "convert_to_datetime": False, "allow_timezone": True})
+        self.assertEqual(text("2019-02-03T04:05:06+03:30"), "2019-02-03T04:05:06+03:30")
+        self.assertEqual(text("2019-02-03T04:05:06Z"), "2019-02-03T04:05:06+00:00")
+
+    def test_fields(self):
+        serializer = EventSerializer(data={"day": "2019-02-03", "created": "2019-02-03T04:05:06Z",
+                                           "text_day": datetime.date(2019, 2, 3)})
+        self.assertTrue(serializer.is_valid())
+        self.assertEqual(serializer.data["day"], datetime.date(2019, 2, 3))
+        self.assertEqual(serializer.data["text_day"], "2019-02-03")
+
+        serializer = EventSerializer(data={"day": "2019-02-30", "created": "x"})
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(serializer.get_errors()["day"], [
+            "This field must be valid date (format='%Y-%m-%d') but given data is 2019-02-30"])
+
+    def test_cache_is_bounded(self):
+        rule = DateRule({"format": "%Y-%m-%d", "convert_to_date": True, "cache_size": 2})
+        for day in range(1, 10):
+            self.assertEqual(rule("2019-02-0{}".format(day)), datetime.date(2019, 2, day))
+        self.assertEqual(len(rule._cache), 2)
+        self.assertIs(rule("2019-02-31"), INVALID)
+        self.assertIs(rule("2019-02-31"), INVALID)
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+import json
+import unittest
+
+from request_validator import decode
+from request_validator.cache import LRUCache
+from request_validator.fields import CharField, IntField
+from request_validator.serializers import Serializer
+
+from .schemas import BAD_ITEM, GOOD_ITEM, ItemSerializer, OrderSerializer, outcome
+
+DOCUMENTS = [
+    {"number": "1", "items": [GOOD_ITEM, BAD_ITEM], "junk": [1, {"q": "]}\"["}, [[]]], "more": "x\\\"y"},
+    {"number": u"é" * 10, "items": [], "hooked": {"a": 13}, "z": 1e5, "t": True, "n": None},
+    {},
+]
+
+
+class SmallBodySerializer(Serializer):
+    a = CharField(required=True)
+
+    class Meta:
+        max_body_size = 8
+        json_decoder = "json"
+
+
+class CachedBodySerializer(Serializer):
+    a = IntField(max_value=3, required=True)
+
+    class Meta:
+        cache = LRUCache(4)
+
+
+class FromJsonTest(unittest.TestCase):
+    def test_same_as_decoded_data(self):
+        for document in DOCUMENTS:
+            text = json.dumps(document)
+            expected = OrderSerializer(data=json.loads(text))
+            expected.is_valid()
+            for raw in (text.encode("utf-8"), json.dumps(document, indent=2), bytearray(text.encode("utf-8")),
+                        memoryview(text.encode("utf-8"))):
+                serializer = OrderSerializer.from_json(raw)
+                serializer.is_valid()
+                self.assertEqual(outcome(serializer), outcome(expected), raw)
+
+        serializer = ItemSerializer.from_json(json.dumps([GOOD_ITEM, BAD_ITEM]), many=True)
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(len(serializer.errors), 1)
+
+    def test_invalid_json(self):
+        for raw in (b'{"a": 1,}', b'{"a" 1}', b'{"a": [1, 2}', b'{"a": "abc', b'{"a": 1} x', b'{a: 1}', b'[1'):
+            self.assertRaises(ValueError, OrderSerializer.from_json, raw)
+
+    def test_body_size(self):
+        with self.assertRaises(decode.BodyTooLarge) as context:
+            SmallBodySerializer.from_json(b'{"a": "xyz"}')
+        self.assertEqual((context.exception.size, context.exception.limit), (12, 8))
+        SmallBodySerializer.from_json(b'{"a": 1}')
+        self.assertRaises(decode.BodyTooLarge, OrderSerializer.from_json, b" " * 10, max_size=5)
+        OrderSerializer.from_json(b" " * 10 + b"{}", max_size=None)
+
+        # Text counts in UTF-8 bytes
+        self.assertEqual(decode.body_size(u"é" * 3), 6)
+        self.assertEqual(decode.body_size(u"abc"), 3)
+        self.assertRaises(decode.BodyTooLarge, decode.check_size, u"é" * 3, 5)
+        decode.check_size(u"é" * 3, 6)
+        decode.check_size(u"é" * 3, 12)
+
+    def test_decoders(self):
+        self.assertIs(decode.get_loader("json"), json.loads)
+        if decode.orjson is not None:
+            self.assertIs(decode.get_loader("orjson"), decode.orjson.loads)
+            self.assertIs(decode.get_loader(), decode.orjson.loads)
+        else:
+            self.assertRaises(ImportError, decode.get_loader, "orjson")
+        if decode.ujson is None:
+            self.assertRaises(ImportError, decode.get_loader, "ujson")
+        self.assertRaises(AssertionError, decode.get_loader, "yaml")
+        for name in ("json", "auto"):
+            self.assertEqual(decode.loads(b'{"a": [1, "\\u00e9"]}', name), {"a": [1, u"é"]})
+
+        def make():
+            class BadDecoderSerializer(Serializer):
+                class Meta:
+                    json_decoder = "yaml"
+        self.assertRaises(AssertionError, make)
+
+    def test_cache_keyed_by_body(self):
+        cache = CachedBodySerializer.Meta.cache
+        for _ in range(3):
+            serializer = CachedBodySerializer.from_json(b'{"a": 9}')
+            self.assertFalse(serializer.is_valid())
+            self.assertEqual(serializer.errors, {"a": ["This field must be larger than 3"]})
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
@@ -0,0 +1,78 @@
+from __future__ import absolute_import
+
+import unittest
+
+from request_validator.errors import ErrorDetail
+from request_validator.fields import CharField, IntField
+from request_validator.serializers import Serializer, ValidationError
+from request_validator.validator import INVALID, Rule
+
+
+class CountingRule(Rule):
+    __slots__ = ()
+
+    name = "counting"
+    messages = []
+
+    def __call__(self, data):
+        return data if data is None else INVALID
+
+    def get_message(self, data):
+        self.messages.append(data)
+        return "counted {}".format(data)
+
+
+class CountSerializer(Serializer):
+    n = IntField(max_value=3, required=True)
+
+
+class ReportSerializer(Serializer):
+    a = CharField(choices=["x", "y"], required=True)
+    b = CountSerializer(many=True, required=False)
+    c = CountSerializer(required=False)
+    d = IntField(choices=[1, 2], default=1)
+    e = CharField(rules=[CountingRule()])
+
+    def validate(self, attr):
+        if attr.get("a") == "boom":
+            raise ValidationError("boom")
+        return attr
+
+
+class ErrorDetailsTest(unittest.TestCase):
+    def test_codes_paths_and_params(self):
+        serializer = ReportSerializer(data={"a": "z", "b": [{"n": 1}, {"n": 9}, {}], "c": {}, "d": 5})
+        self.assertFalse(serializer.is_valid())
+        details = sorted((detail.as_dict() for detail in serializer.error_details()),
+                         key=lambda detail: [str(key) for key in detail["path"]])
+        self.assertEqual(details, [
+            {"code": "in", "message": "This field must be choice from (x,y)", "path": ["a"],
+             "params": {"choices": ["x", "y"]}},
+            {"code": "max_value", "message": "This field must be larger than 3", "path": ["b", 1, "n"],
+             "params": {"value": 3}},
+            {"code": "required", "message": "This field is required", "path": ["b", 2, "n"], "params": {}},
+            {"code": "required", "message": "This field is required", "path": ["c", "n"], "params": {}},
+            {"code": "in", "message": "This field must be choice from (1,2)", "path": ["d"],
+             "params": {"choices": [1, 2]}},
+        ])
+
+    def test_hook_errors(self):
+        serializer = ReportSerializer(data={"a": "boom"})
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(serializer.get_errors()["non_field_error"], "boom")
+        self.assertIn(("invalid", ("non_field_error",)),
+                      [(detail.code, detail.path) for detail in serializer.error_details()])
+
+    def test_messages_are_formatted_when_rendered(self):
+        CountingRule.messages = []
+        serializer = ReportSerializer(data={"a": "x", "c": {"n": 1}, "e": "v"})
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(CountingRule.messages, [])
+        self.assertEqual(serializer.get_errors(), {"e": ["counted v"]})
+        self.assertEqual(CountingRule.messages, ["v"])
+
+    def test_details_compare_to_messages(self):
+        detail = ErrorDetail("required", "This field is required")
+        self.assertEqual(detail, "This field is required")
+        self.assertNotEqual(detail, "other")
+        self.assertEqual(detail.at(("a",)).path, ("a",))
@@ -0,0 +1,44 @@
+from __future__ import absolute_import
+
+import unittest
+
+from .schemas import FastRowSerializer, RowSerializer, rows
+
+
+class FailFastTest(unittest.TestCase):
+    def test_first_error_only(self):
+        for serializer_class in (RowSerializer, FastRowSerializer):
+            for row in rows(300):
+                full = serializer_class(data=row)
+                valid = full.is_valid()
+                serializer = serializer_class(data=row)
+                self.assertEqual(serializer.is_valid(fail_fast=True), valid, row)
+                if valid:
+                    self.assertEqual((serializer.data, serializer.validate_data()),
+                                     (full.data, full.validate_data()))
+                    continue
+                errors = serializer.get_errors()
+                self.assertEqual(len(errors), 1, row)
+                key, value = list(errors.items())[0]
+                self.assertIn(key, full.get_errors())
+                if isinstance(value, list):
+                    self.assertEqual(len(value), 1)
+                    self.assertEqual(value[0], full.get_errors()[key][0])
+
+    def test_error_budget(self):
+        data = rows(300)
+        for serializer_class in (RowSerializer, FastRowSerializer):
+            full = serializer_class(data=data, many=True)
+            full.is_valid()
+            for max_errors in (1, 5, 50):
+                serializer = serializer_class(data=data, many=True, max_errors=max_errors)
+                self.assertFalse(serializer.is_valid())
+                self.assertEqual(serializer.errors, full.errors[:max_errors])
+                self.assertEqual(serializer.data, full.data[:len(serializer.data)])
+
+            serializer = serializer_class(data=data, many=True)
+            self.assertFalse(serializer.is_valid(fail_fast=True))
+            self.assertEqual(len(serializer.errors), 1)
+
+    def test_budget_must_be_positive(self):
+        self.assertRaises(AssertionError, RowSerializer, data=[], many=True, max_errors=0)
@@ -0,0 +1,222 @@
+from __future__ import absolute_import
+
+import copy
+import random
+import unittest
+
+from request_validator.fields import CharField, IntField
+from request_validator.serializers import Serializer, ValidationError
+
+
+class TagSerializer(Serializer):
+    label = CharField(max_length=5)
+
+
+class CountSerializer(Serializer):
+    n = IntField(max_value=50, required=True)
+    m = IntField(default=7)
+    tags = TagSerializer(many=True, required=False)
+
+
+class CheckedCountSerializer(CountSerializer):
+    def validate(self, attr):
+        if isinstance(attr, dict) and attr.get("n") == 13:
+            raise ValidationError("unlucky")
+        return attr
+
+
+class DocumentSerializer(Serializer):
+    a = CharField(choices=["x", "y", "boom"], required=True)
+    b = CountSerializer(many=True)
+    c = CountSerializer(required=False)
+    e = IntField(default=5, source="E")
+    d = CheckedCountSerializer()
+    l = CheckedCountSerializer(many=True)
+
+    def validate(self, attr):
+        if isinstance(attr, dict) and attr.get("a") == "boom":
+            raise ValidationError({"a": "hook says no", "zz": "x"})
+        return attr
+
+
+class FastDocumentSerializer(DocumentSerializer):
+    class Meta:
+        backend = "codegen"
+
+
+class PasswordSerializer(Serializer):
+    password = CharField()
+
+    def validate(self, attr):
+        if attr.get("password") != attr.get("confirm"):
+            raise ValidationError({"confirm": "mismatch"})
+        return attr
+
+
+class AccountSerializer(PasswordSerializer):
+    inner = PasswordSerializer(required=False)
+
+
+class ItemsSerializer(Serializer):
+    items = CountSerializer(many=True)
+
+
+class NamedTagsSerializer(Serializer):
+    name = CharField(required=False)
+    tags = TagSerializer(many=True, required=True)
+    inner = TagSerializer(required=True)
+
+
+class HookedTagsSerializer(NamedTagsSerializer):
+    def validate(self, attr):
+        return attr
+
+
+def result(serializer):
+    return (serializer.has_error(), serializer.get_errors(), serializer.validate_data(), serializer.data,
+            serializer._all_fields_valid, [(detail.code, detail.path) for detail in serializer.error_details()])
+
+
+class Documents(object):
+    def __init__(self, seed):
+        self.rnd = random.Random(seed)
+
+    def count(self):
+        rnd = self.rnd
+        count = {}
+        if rnd.random() < .9:
+            count["n"] = rnd.choice([1, 13, 60, "q", None, 2.0, True])
+        if rnd.random() < .3:
+            count["m"] = rnd.choice([1, "z"])
+        if rnd.random() < .3:
+            count["tags"] = [{"label": rnd.choice(["ok", "toolongx", 3])} for _ in range(rnd.randint(0, 3))]
+        return count
+
+    def document(self):
+        rnd = self.rnd
+        document = {"d": self.count(), "l": [self.count() for _ in range(rnd.randint(0, 3))]}
+        if rnd.random() < .9:
+            document["a"] = rnd.choice(["x", "q", "boom"])
+        if rnd.random() < .9:
+            document["b"] = [self.count() for _ in range(rnd.randint(0, 4))]
+        if rnd.random() < .5:
+            document["c"] = self.count()
+        if rnd.random() < .3:
+            document["E"] = rnd.choice([1, "w"])
+        return document
+
+    def mutate(self, document):
+        """A changed deep copy of ``document`` and the paths that changed."""
+        rnd = self.rnd
+        document = copy.deepcopy(document)
+        paths = []
+        for _ in range(rnd.randint(1, 2)):
+            choice = rnd.random()
+            if choice < .2:
+                document["a"] = rnd.choice(["x", "q", "boom"])
+                paths.append(("a",))
+            elif choice < .4 and document.get("b"):
+                index = rnd.randrange(len(document["b"]))
+                document["b"][index] = self.count()
+                paths.append(("b", index))
+            elif choice < .5:
+                document["b"] = [self.count() for _ in range(rnd.randint(0, 4))]
+                paths.append(("b",))
+            elif choice < .6 and isinstance(document.get("c"), dict):
+                document["c"]["n"] = rnd.choice([1, 13, 60, "q"])
+                paths.append(("c", "n"))
+            elif choice < .7:
+                document["d"] = self.count()
+                paths.append(("d",))
+            elif choice < .8 and document["l"]:
+                index = rnd.randrange(len(document["l"]))
+                document["l"][index]["n"] = rnd.choice([1, 13, 60])
+                paths.append(("l", index, "n"))
+            elif choice < .9:
+                document["E"] = rnd.choice([1, "w", 2])
+                paths.append(("E",))
+            else:
+                document.pop("c", None)
+                paths.append(("c",))
+        return document, paths
+
+
+class RevalidateTest(unittest.TestCase):
+    def test_same_as_is_valid(self):
+        documents = Documents(1)
+        for serializer_class in (DocumentSerializer, FastDocumentSerializer):
+            for _ in range(100):
+                document = documents.document()
+                previous = serializer_class(data=document)
+                previous.revalidate()
+                full = serializer_class(data=document)
+                full.is_valid()
+                self.assertEqual(result(previous), result(full), document)
+                for _ in range(4):
+                    document, paths = documents.mutate(document)
+                    for changed in (None, paths):
+                        serializer = serializer_class(data=document)
+                        serializer.revalidate(previous, changed)
+                        full = serializer_class(data=document)
+                        full.is_valid()
+                        self.assertEqual(result(serializer), result(full), (document, changed))
+                    previous = serializer
+
+    def test_unchanged_data_is_shared(self):
+        document = {"a": "x", "b": [{"n": 1}, {"n": 2}], "c": {"n": 1}, "d": {"n": 1}, "l": []}
+        previous = DocumentSerializer(data=document)
+        self.assertTrue(previous.revalidate())
+        changed = dict(document, b=[{"n": 1}, {"n": 3}])
+        serializer = DocumentSerializer(data=changed)
+        self.assertTrue(serializer.revalidate(previous, [("b", 1)]))
+        self.assertIs(serializer.validate_data()["d"], previous.validate_data()["d"])
+        self.assertEqual(serializer.validate_data()["b"][1], {"n": 3, "m": 7, "tags": []})
+
+    def test_hooks_of_changed_paths(self):
+        document = {"password": "a", "confirm": "a", "inner": {"password": "b", "confirm": "b"}}
+        previous = AccountSerializer(data=document)
+        self.assertTrue(previous.revalidate())
+        document["confirm"] = "x"
+        document["inner"]["confirm"] = "y"
+        serializer = AccountSerializer(data=document)
+        self.assertFalse(serializer.revalidate(previous, [("confirm",), ("inner", "confirm")]))
+        full = AccountSerializer(data=document)
+        full.is_valid()
+        self.assertEqual(result(serializer), result(full))
+        self.assertEqual(serializer.errors, {"confirm": "mismatch", "inner": {"confirm": "mismatch"}})
+
+    def test_list_insertion(self):
+        document = {"items": [{"n": 1}, {"n": "x"}]}
+        previous = ItemsSerializer(data=document)
+        self.assertFalse(previous.revalidate())
+        document["items"].insert(0, {"n": "y"})
+        serializer = ItemsSerializer(data=document)
+        serializer.revalidate(previous, [("items", 0)])
+        full = ItemsSerializer(data=document)
+        full.is_valid()
+        self.assertEqual(result(serializer), result(full))
+        self.assertEqual(len(serializer.errors["items"]), 2)
+
+    def test_empty_documents(self):
+        # Required nested values are only checked in a non-empty document
+        for serializer_class in (NamedTagsSerializer, HookedTagsSerializer):
+            for old, new, changed in (({"name": "x"}, {}, [("name",)]), ({}, {"name": "x"}, [("name",)])):
+                for paths in (None, changed):
+                    previous = serializer_class(data=old)
+                    previous.revalidate()
+                    serializer = serializer_class(data=new)
+                    serializer.revalidate(previous, paths)
+                    full = serializer_class(data=new)
+                    full.is_valid()
+                    self.assertEqual(result(serializer), result(full), (serializer_class, old, new, paths))
+        serializer = NamedTagsSerializer(data={"name": "x"})
+        previous = NamedTagsSerializer(data={})
+        previous.revalidate()
+        self.assertFalse(serializer.revalidate(previous))
+        self.assertEqual(serializer.errors, {"tags": ["This field is required"],
+                                             "inner": {"inner": "This field is required"}})
+
+    def test_previous_of_another_class(self):
+        previous = ItemsSerializer(data={"items": []})
+        previous.revalidate()
+        self.assertRaises(AssertionError, AccountSerializer(data={}).revalidate, previous)
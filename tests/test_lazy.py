@@ -0,0 +1,56 @@
+from __future__ import absolute_import
+
+import datetime
+import unittest
+
+from request_validator.serializers import ValidationError
+
+from .schemas import (BAD_ITEM, GOOD_ITEM, SHORT_ITEM, HookedSerializer, ItemSerializer, OrderSerializer,
+                      RowSerializer, with_backend)
+
+
+class LazyDataTest(unittest.TestCase):
+    def test_same_data_as_is_valid(self):
+        payloads = [(ItemSerializer, GOOD_ITEM), (ItemSerializer, SHORT_ITEM),
+                    (OrderSerializer, {"number": "1", "items": [GOOD_ITEM, SHORT_ITEM], "hooked": {"a": 1}}),
+                    (RowSerializer, {"id": 3, "day": "2024-02-03", "tags": [{"label": "a"}]})]
+        for serializer_class, data in payloads:
+            for backend in ("plan", "codegen"):
+                cls = with_backend(serializer_class, backend)
+                serializer = cls(data=data)
+                self.assertTrue(serializer.is_valid(), serializer.get_errors())
+                self.assertEqual(cls(data=data).lazy_data().to_dict(), serializer.data)
+
+    def test_fields_are_validated_when_read(self):
+        serializer = ItemSerializer(data=BAD_ITEM)
+        serializer.is_valid()
+        errors = serializer.get_errors()
+        mapping = ItemSerializer(data=BAD_ITEM).lazy_data()
+        self.assertEqual(sorted(mapping), sorted(errors))
+        for name in mapping:
+            with self.assertRaises(ValidationError) as context:
+                mapping[name]
+            self.assertEqual(context.exception.details, [{name: errors[name]}])
+
+        mapping = RowSerializer(data={"id": 3, "day": "bad"}).lazy_data()
+        self.assertEqual(mapping["id"], 3)
+        self.assertEqual(repr(mapping), "<ValidatedMapping of RowSerializer: 1 of 5 read>")
+        self.assertRaises(ValidationError, mapping.__getitem__, "day")
+        self.assertRaises(KeyError, mapping.__getitem__, "unknown")
+        self.assertEqual(mapping.get("unknown", 1), 1)
+        self.assertEqual(len(mapping), 5)
+
+        mapping = RowSerializer(data={"id": 3}).lazy_data()
+        self.assertEqual(mapping["day"], datetime.date(2020, 1, 1))
+
+    def test_hook_runs_up_front(self):
+        with self.assertRaises(ValidationError) as context:
+            HookedSerializer(data={"a": 14}).lazy_data()
+        self.assertEqual(context.exception.details, [{"non_field_error": "bad"}])
+
+    def test_nested_mappings(self):
+        mapping = OrderSerializer(data={"number": "1", "items": [], "hooked": {"a": "5"}}).lazy_data()
+        hooked = mapping["hooked"]
+        self.assertEqual(hooked["a"], 5)
+        self.assertEqual(hooked.to_dict(), {"a": 5, "b": "d"})
+        self.assertRaises(ValidationError, OrderSerializer(data={"number": "1"}).lazy_data().__getitem__, "items")
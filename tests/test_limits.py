@@ -0,0 +1,102 @@
+from __future__ import absolute_import
+
+import pickle
+import random
+import unittest
+
+from request_validator import limits
+from request_validator.fields import CharField, ListField
+from request_validator.serializers import Serializer
+
+TOO_LONG = ["This string must not be longer than 5 characters"]
+TOO_DEEP = "The data must not be nested deeper than 4 levels"
+
+
+class NameSerializer(Serializer):
+    name = CharField(source="Name")
+
+
+class DocumentSerializer(Serializer):
+    title = CharField(source="Title")
+    items = NameSerializer(many=True, source="Items")
+    inner = NameSerializer(source="Inner")
+    tags = ListField(source="Tags")
+
+    class Meta:
+        limits = limits.Limits(max_string_length=5, max_list_length=3, max_depth=4)
+
+
+class PlainSerializer(Serializer):
+    title = CharField()
+
+
+def random_value(rnd, depth=0):
+    choice = rnd.random()
+    if depth < 4 and choice < .3:
+        return dict(("k{}".format(index), random_value(rnd, depth + 1)) for index in range(rnd.randint(0, 4)))
+    if depth < 4 and choice < .5:
+        return [random_value(rnd, depth + 1) for _ in range(rnd.randint(0, 4))]
+    return rnd.choice(["", "abc", "abcdefg", 1, None])
+
+
+class LimitsTest(unittest.TestCase):
+    def tearDown(self):
+        limits.set_default(limits.Limits())
+
+    def test_errors_at_field_names(self):
+        for data, errors in [
+            ({"Title": "toolong"}, {"title": TOO_LONG}),
+            ({"Items": [{"Name": "x"}, {"Name": "toolong"}]}, {"items": [{"name": TOO_LONG}]}),
+            ({"Inner": {"Name": "toolong"}}, {"inner": {"name": TOO_LONG}}),
+            ({"Tags": [1, 2, 3, 4]}, {"tags": ["This list must not have more than 3 items"]}),
+            ({"Tags": [["abcdefg"]]}, {"tags": TOO_LONG}),
+            ({"other": "toolong"}, {"non_field_error": TOO_LONG}),
+            ({"Items": [{"Name": [[["x"]]]}]}, {"items": [{"name": [TOO_DEEP]}]}),
+        ]:
+            serializer = DocumentSerializer(data=data)
+            self.assertFalse(serializer.is_valid())
+            self.assertEqual(serializer.errors, errors)
+
+        serializer = DocumentSerializer(data={"Items": [{"Name": "x"}, {"Name": "toolong"}]})
+        serializer.is_valid()
+        self.assertEqual([detail.as_dict() for detail in serializer.error_details()], [
+            {"code": "max_string_length", "message": TOO_LONG[0], "path": ["items", 1, "name"],
+             "params": {"limit": 5}}])
+        data = {"Title": "abc", "Items": [{"Name": "x"}], "Inner": {"Name": "y"}, "Tags": ["abc"]}
+        self.assertTrue(DocumentSerializer(data=data).is_valid())
+
+    def test_lists(self):
+        serializer = NameSerializer(data=[{"Name": "x"}] * 4, many=True)
+        self.assertTrue(serializer.is_valid())
+        limits.set_default(limits.Limits(max_list_length=3, max_nodes=20))
+        serializer = NameSerializer(data=[{"Name": "x"}] * 4, many=True)
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(serializer.errors, ["This list must not have more than 3 items"])
+        self.assertEqual(list(DocumentSerializer.validate_each([{"Title": "toolong"}])),
+                         [({}, {"title": TOO_LONG})])
+
+    def test_default_limits(self):
+        self.assertTrue(PlainSerializer(data={"title": "x" * 100000}).is_valid())
+        limits.set_default(limits.Limits(max_nodes=3))
+        serializer = PlainSerializer(data={"title": "x", "a": [1, 2, 3]})
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(serializer.errors, {"non_field_error": "The data must not have more than 3 values"})
+        self.assertEqual(serializer.error_details()[0].code, "max_nodes")
+        self.assertRaises(AssertionError, limits.set_default, None)
+        self.assertRaises(AssertionError, limits.Limits, max_depth=0)
+
+    def test_fits_agrees_with_check(self):
+        rnd = random.Random(3)
+        for _ in range(500):
+            value = random_value(rnd)
+            if not isinstance(value, (dict, list)):
+                continue
+            limit = limits.Limits(max_depth=rnd.choice([None, 2, 3]), max_nodes=rnd.choice([None, 5, 20]),
+                                  max_list_length=rnd.choice([None, 2, 3]),
+                                  max_string_length=rnd.choice([None, 3, 5]))
+            self.assertEqual(limit.fits(value), limit._locate(value) is None, value)
+
+    def test_pickle(self):
+        copy = pickle.loads(pickle.dumps(limits.Limits(max_depth=3, max_string_length=4)))
+        self.assertEqual((copy.max_depth, copy.max_nodes, copy.max_list_length, copy.max_string_length),
+                         (3, None, None, 4))
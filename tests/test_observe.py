@@ -0,0 +1,95 @@
+from __future__ import absolute_import
+
+import unittest
+
+from request_validator.fields import CharField, IntField
+from request_validator.observe import Observer, StatsCollector
+from request_validator.serializers import Serializer
+
+from .schemas import CASES, OrderSerializer, RowSerializer, outcome, rows, with_backend
+
+
+class CountSerializer(Serializer):
+    n = IntField(max_value=3, required=True)
+
+
+class ObservedSerializer(Serializer):
+    a = CharField(choices=["x", "y"], required=True)
+    b = CountSerializer(many=True)
+
+    class Meta:
+        observer = StatsCollector()
+
+
+class RecordingObserver(Observer):
+    def __init__(self):
+        self.calls = []
+
+    def field(self, root, path, field, duration, errors):
+        self.calls.append(("field", path, bool(errors)))
+
+    def serializer(self, root, path, duration, errors):
+        self.calls.append(("serializer", path, bool(errors)))
+
+    def list_item(self, root, path, duration, errors):
+        self.calls.append(("list_item", path, bool(errors)))
+
+    def hook(self, root, path, duration, errors):
+        self.calls.append(("hook", path, bool(errors)))
+
+
+class ObserverTest(unittest.TestCase):
+    def test_same_results(self):
+        collector = StatsCollector()
+        cases = CASES + [(RowSerializer, rows(40), {"many": True})]
+        for serializer_class, data, kwargs in cases:
+            for backend in ("plan", "codegen"):
+                cls = with_backend(serializer_class, backend)
+                expected = cls(data=data, **kwargs)
+                expected.is_valid()
+                serializer = cls(data=data, **kwargs)
+                self.assertEqual(serializer.is_valid(observer=collector), not expected.has_error())
+                self.assertEqual(outcome(serializer), outcome(expected), (serializer_class, data))
+
+    def test_every_step_is_reported(self):
+        observer = RecordingObserver()
+        OrderSerializer(data={"number": "1", "items": [{}], "hooked": {"a": 13}}).is_valid(observer=observer)
+        calls = observer.calls
+        self.assertEqual(calls[-1], ("serializer", (), True))
+        self.assertIn(("list_item", ("items", 0), True), calls)
+        self.assertIn(("field", ("items", 0, "id"), True), calls)
+        self.assertIn(("hook", ("hooked",), True), calls)
+        self.assertIn(("field", ("number",), False), calls)
+
+    def test_statistics(self):
+        collector = StatsCollector()
+        data = [{"a": "x", "b": [{"n": 1}, {"n": 9}]}, {"a": "q", "b": [{"n": 7}]}]
+        ObservedSerializer(data=data, many=True).is_valid(observer=collector)
+        stats = collector.as_dict()["ObservedSerializer"]
+        self.assertEqual(stats["paths"]["*"]["list_item"]["calls"], 2)
+        self.assertEqual(stats["paths"]["*.b.*.n"]["field"]["calls"], 3)
+        self.assertEqual(stats["paths"]["*.b.*.n"]["field"]["failures"], 2)
+        self.assertEqual(stats["errors"]["*.a"], {"in": 1})
+        self.assertEqual(stats["errors"]["*.b.*.n"], {"max_value": 2})
+
+        text = collector.prometheus()
+        self.assertIn("# TYPE request_validator_calls_total counter", text)
+        self.assertIn('request_validator_errors_total{serializer="ObservedSerializer",path="*.a",code="in"} 1',
+                      text)
+        collector.reset()
+        self.assertEqual(collector.as_dict(), {})
+
+    def test_meta_observer(self):
+        collector = ObservedSerializer.Meta.observer
+        collector.reset()
+        ObservedSerializer(data={"a": "x"}).is_valid()
+        ObservedSerializer(data=[{"a": "y"}], many=True).is_valid()
+        paths = collector.as_dict()["ObservedSerializer"]["paths"]
+        self.assertEqual(paths["a"]["field"]["calls"], 1)
+        self.assertEqual(paths["*.a"]["field"]["calls"], 1)
+        self.assertEqual(paths[""]["serializer"]["calls"], 2)
+
+    def test_unobservable_runs(self):
+        serializer = ObservedSerializer(data={"a": "x"})
+        self.assertRaises(AssertionError, serializer.is_valid, fail_fast=True)
+        self.assertRaises(AssertionError, serializer.is_valid, partial=True)
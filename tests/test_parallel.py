@@ -0,0 +1,65 @@
+from __future__ import absolute_import
+
+import pickle
+import unittest
+
+from request_validator.serializers import MIN_PARALLEL_ROWS, ProcessPoolExecutor
+
+from .schemas import FastRowSerializer, RowSerializer, rows
+
+
+def result(serializer):
+    return serializer.errors, serializer.validate_data(), serializer.data
+
+
+@unittest.skipIf(ProcessPoolExecutor is None, "concurrent.futures is not installed")
+class ParallelTest(unittest.TestCase):
+    data = rows(MIN_PARALLEL_ROWS * 2)
+
+    def test_workers_match_one_process(self):
+        for serializer_class in (RowSerializer, FastRowSerializer):
+            expected = serializer_class(data=self.data, many=True)
+            expected.is_valid()
+            serializer = serializer_class(data=self.data, many=True, workers=3)
+            serializer.is_valid()
+            self.assertEqual(result(serializer), result(expected))
+
+            expected = serializer_class(data=self.data, many=True, force_valid=True)
+            expected.is_valid()
+            serializer = serializer_class(data=self.data, many=True, force_valid=True, workers=2)
+            serializer.is_valid()
+            self.assertEqual(result(serializer), result(expected))
+
+    def test_executor(self):
+        expected = RowSerializer(data=self.data, many=True)
+        expected.is_valid()
+        executor = ProcessPoolExecutor(2)
+        try:
+            serializer = RowSerializer(self.data, many=True, executor=executor)
+            serializer.is_valid()
+            self.assertEqual(result(serializer), result(expected))
+        finally:
+            executor.shutdown()
+
+    def test_error_budget(self):
+        expected = RowSerializer(data=self.data, many=True)
+        expected.is_valid()
+        serializer = RowSerializer(data=self.data, many=True, max_errors=3, workers=2)
+        serializer.is_valid()
+        self.assertEqual(serializer.errors, expected.errors[:3])
+
+
+class PickleTest(unittest.TestCase):
+    def test_plans_and_list_serializers(self):
+        for serializer_class in (RowSerializer, FastRowSerializer):
+            plan = pickle.loads(pickle.dumps(serializer_class._plan))
+            self.assertIs(type(plan), type(serializer_class._plan))
+            for step, expected in zip(plan.steps, serializer_class._plan.steps):
+                self.assertIs(step.kind, expected.kind)
+                self.assertEqual(step.name, expected.name)
+
+            serializer = pickle.loads(pickle.dumps(serializer_class(data=rows(10), many=True)))
+            expected = serializer_class(data=rows(10), many=True)
+            serializer.is_valid()
+            expected.is_valid()
+            self.assertEqual(result(serializer), result(expected))
@@ -0,0 +1,67 @@
+from __future__ import absolute_import
+
+import itertools
+import unittest
+
+from .schemas import BAD_ITEM, GOOD_ITEM, ItemSerializer, OrderSerializer, RowSerializer, with_backend
+
+NAMES = sorted(GOOD_ITEM)
+
+
+def subsets():
+    for size in (0, 1, 2, len(NAMES)):
+        for names in itertools.combinations(NAMES, size):
+            yield names
+
+
+def restrict(values, names):
+    return dict((key, value) for key, value in values.items() if key in names)
+
+
+class PartialTest(unittest.TestCase):
+    def test_only_present_values_are_checked(self):
+        for backend in ("plan", "codegen"):
+            cls = with_backend(ItemSerializer, backend)
+            for item in (GOOD_ITEM, BAD_ITEM):
+                full = cls(data=item)
+                full.is_valid()
+                for names in subsets():
+                    serializer = cls(data=restrict(item, names))
+                    self.assertEqual(serializer.is_valid(partial=True), not restrict(full.get_errors(), names))
+                    self.assertEqual(serializer.get_errors(), restrict(full.get_errors(), names))
+                    self.assertEqual(serializer.validate_data(), restrict(full.validate_data(), names))
+
+    def test_nested_and_lists(self):
+        for backend in ("plan", "codegen"):
+            cls = with_backend(OrderSerializer, backend)
+            serializer = cls(data={"items": [{"id": 0}, {"kind": "a"}], "hooked": {"b": "x"}})
+            self.assertFalse(serializer.is_valid(partial=True))
+            self.assertEqual(serializer.get_errors(), {"items": [{"id": ["This field must be smaller than 1"]}]})
+            self.assertEqual(serializer.validate_data(), {"items": [{"kind": "a"}], "hooked": {"b": "x"}})
+
+            serializer = with_backend(RowSerializer, backend)(data=[{"id": 13}, {"code": "ab"}], many=True)
+            self.assertFalse(serializer.is_valid(partial=True))
+            self.assertEqual(serializer.get_errors(), [{"non_field_error": "unlucky"},
+                                                       {"code": ["This field must be valid in pattern ([A-Z]+$)"]}])
+
+    def test_only_and_exclude(self):
+        for backend in ("plan", "codegen"):
+            cls = with_backend(ItemSerializer, backend)
+            full = cls(data=BAD_ITEM)
+            full.is_valid()
+            for names in subsets():
+                only = cls(data=BAD_ITEM)
+                only.is_valid(only=names)
+                self.assertEqual((only.get_errors(), only.validate_data()),
+                                 (restrict(full.get_errors(), names), restrict(full.validate_data(), names)))
+                exclude = cls(data=BAD_ITEM)
+                exclude.is_valid(exclude=names)
+                rest = set(NAMES).difference(names)
+                self.assertEqual((exclude.get_errors(), exclude.validate_data()),
+                                 (restrict(full.get_errors(), rest), restrict(full.validate_data(), rest)))
+
+    def test_selected_plans(self):
+        self.assertIs(ItemSerializer.select_plan(["id", "kind"]), ItemSerializer.select_plan(("kind", "id")))
+        self.assertIsNot(ItemSerializer.select_plan(["id"]), ItemSerializer.select_plan(exclude=["id"]))
+        self.assertRaises(AssertionError, ItemSerializer.select_plan, ["id", "unknown"])
+        self.assertRaises(AssertionError, ItemSerializer(data={}).is_valid, partial=True, fail_fast=True)
@@ -0,0 +1,63 @@
+from __future__ import absolute_import
+
+import unittest
+
+from request_validator.fields import CharField, IntField
+from request_validator.plan import FIELD, LIST, MISSING, SERIALIZER, Plan
+from request_validator.serializers import Serializer
+
+from .schemas import ExtendedOrderSerializer, ItemSerializer, OrderSerializer, SampleSerializer, sample_data
+
+
+class SourcedSerializer(Serializer):
+    id = IntField(source="ID")
+    name = CharField(default="none")
+
+
+class PlanTest(unittest.TestCase):
+    def test_plan_is_built_with_the_class(self):
+        plan = OrderSerializer._plan
+        self.assertIsInstance(plan, Plan)
+        self.assertEqual([step.name for step in plan.steps], ["number", "items", "hooked", "tags"])
+        self.assertEqual([step.kind for step in plan.steps], [FIELD, LIST, SERIALIZER, FIELD])
+        self.assertIs(plan.steps_by_name["hooked"].plan, OrderSerializer.fields()["hooked"]._plan)
+
+    def test_inherited_fields_come_first(self):
+        names = [step.name for step in ExtendedOrderSerializer._plan.steps]
+        self.assertEqual(names, ["number", "items", "hooked", "tags", "extra"])
+
+    def test_lookup_reads_the_source_first(self):
+        step = SourcedSerializer._plan.steps_by_name["id"]
+        self.assertEqual(step.lookup({"ID": 1, "id": 2}), 1)
+        self.assertEqual(step.lookup({"id": 2}), 2)
+        self.assertIs(step.lookup({}), MISSING)
+
+    def test_sample_errors_and_data(self):
+        serializer = SampleSerializer(data=sample_data())
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(serializer.get_errors(), {"glossary": {"gloss_div": {"gloss_list": {"gloss_entry": {
+            "abbrev": ["This field cannot be blank"]}}}}})
+        entry = serializer.validate_data()["glossary"]["gloss_div"]["gloss_list"]["gloss_entry"]
+        self.assertEqual(entry["id"], 12)
+        self.assertEqual(entry["gloss_def"], {"para": "A meta-markup language.", "gloss_see_also": ["GML", "XML"]})
+
+    def test_required_fields_and_defaults(self):
+        serializer = ItemSerializer(data={"id": "3", "flag": True, "kind": "a", "code": "ABC"})
+        self.assertTrue(serializer.is_valid())
+        self.assertEqual(serializer.data, {"id": 3, "name": "x", "price": None, "flag": True,
+                                           "when": "2020-01-01", "kind": "a", "code": "ABC"})
+
+        serializer = ItemSerializer(data={"id": "3"})
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(serializer.get_errors(), {"flag": ["This field is required"],
+                                                   "kind": ["This field is required"],
+                                                   "code": ["This field is required"]})
+
+    def test_fields_are_not_changed_by_validation(self):
+        field = SourcedSerializer.fields()["id"]
+        state = dict((name, getattr(field, name, None)) for name in field.__slots__)
+        SourcedSerializer(data={"ID": "x"}).is_valid()
+        SourcedSerializer(data={"ID": 5}).is_valid()
+        self.assertIs(SourcedSerializer.fields()["id"], field)
+        self.assertEqual(dict((name, getattr(field, name, None)) for name in field.__slots__), state)
+
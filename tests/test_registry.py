@@ -0,0 +1,65 @@
+from __future__ import absolute_import
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import six
+
+from request_validator import codegen, registry
+
+from .schemas import FastRowSerializer, RowSerializer, outcome, rows, with_backend
+
+
+class RegistryTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.preloaded = dict(codegen._preloaded)
+
+    def tearDown(self):
+        codegen._preloaded.clear()
+        codegen._preloaded.update(self.preloaded)
+        shutil.rmtree(self.directory)
+
+    def test_registered(self):
+        classes = registry.registered()
+        self.assertIn(RowSerializer, classes)
+        self.assertIn(FastRowSerializer, classes)
+        self.assertEqual(classes, sorted(classes, key=lambda cls: (cls.__module__, cls.__name__)))
+        self.assertEqual(registry.warm_up(["tests.schemas"], freeze=False), registry.registered())
+
+    def test_snapshot(self):
+        serializer_class = with_backend(RowSerializer, "codegen")
+        serializer_class.select_plan(["id", "code"])
+        path = os.path.join(self.directory, "snapshot")
+        saved = registry.save_snapshot(path)
+        self.assertGreaterEqual(saved, 2)
+        self.assertEqual(os.listdir(self.directory), ["snapshot"])
+
+        codegen._preloaded.clear()
+        self.assertEqual(registry.load_snapshot(path), saved)
+        loaded = with_backend(RowSerializer, "codegen")
+        code = six.get_function_code(loaded._plan.run)
+        self.assertIs(code, codegen._preloaded[codegen.code_key(code.co_filename, loaded._plan.source)])
+        for data in rows(30):
+            expected = serializer_class(data=data)
+            expected.is_valid()
+            serializer = loaded(data=data)
+            serializer.is_valid()
+            self.assertEqual(outcome(serializer), outcome(expected))
+            serializer = loaded(data=data)
+            serializer.is_valid(only=["id", "code"])
+            expected = serializer_class(data=data)
+            expected.is_valid(only=["id", "code"])
+            self.assertEqual(outcome(serializer), outcome(expected))
+
+    def test_unusable_snapshots(self):
+        path = os.path.join(self.directory, "snapshot")
+        self.assertEqual(registry.load_snapshot(path), 0)
+        with open(path, "wb") as stream:
+            stream.write(b"request_validator snapshot other 0\n")
+        self.assertEqual(registry.load_snapshot(path), 0)
+        with open(path, "wb") as stream:
+            stream.write(registry._HEADER + b"\x00garbage")
+        self.assertEqual(registry.load_snapshot(path), 0)
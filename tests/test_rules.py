@@ -0,0 +1,71 @@
+from __future__ import absolute_import
+
+import pickle
+import unittest
+
+from request_validator.fields import CharField, IntField, RegexField
+from request_validator.serializers import Serializer
+from request_validator.validator import INVALID, RegexRule, Rule, build_rule, get_rule, register_rule
+
+
+@register_rule
+class EvenRule(Rule):
+    __slots__ = ()
+
+    name = "test_even"
+    message = "This field must be even but get {data}"
+
+    def __call__(self, data):
+        if data is None or data % 2 == 0:
+            return data
+        return INVALID
+
+
+class PrefixRule(Rule):
+    __slots__ = ()
+
+    name = "test_prefix"
+    message = "This field must start with {value}"
+
+    def __call__(self, data):
+        if data is None or data.startswith(self.value):
+            return data
+        return INVALID
+
+
+class RuleSerializer(Serializer):
+    by_name = IntField(rules=["test_even"])
+    by_class = IntField(rules=[EvenRule])
+    by_instance = CharField(rules=[PrefixRule("ab")])
+
+
+class RulesTest(unittest.TestCase):
+    def test_registered_rules_are_found_by_name(self):
+        self.assertIs(get_rule("test_even"), EvenRule)
+        self.assertIsInstance(build_rule("test_even"), EvenRule)
+        rule = PrefixRule("x")
+        self.assertIs(build_rule(rule), rule)
+        self.assertRaises(AssertionError, get_rule, "test_unknown")
+        self.assertRaises(AssertionError, register_rule, object)
+
+    def test_custom_rules_run_after_the_type_rules(self):
+        serializer = RuleSerializer(data={"by_name": "4", "by_class": 2, "by_instance": "abc"})
+        self.assertTrue(serializer.is_valid())
+        self.assertEqual(serializer.data, {"by_name": 4, "by_class": 2, "by_instance": "abc"})
+
+        serializer = RuleSerializer(data={"by_name": 3, "by_class": "x", "by_instance": "zz"})
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(serializer.get_errors(), {
+            "by_name": ["This field must be even but get 3"],
+            "by_class": ["This field must be integer but get str"],
+            "by_instance": ["This field must start with ab"],
+        })
+        self.assertEqual(sorted(detail.code for detail in serializer.error_details()),
+                         ["int", "test_even", "test_prefix"])
+
+    def test_regex_is_compiled_once(self):
+        field = RegexField(r"[a-z]+$")
+        rule = [check for check in field._checks if isinstance(check, RegexRule)][0]
+        self.assertIs(rule(u"abc"), u"abc")
+        self.assertIs(rule(u"ABC"), INVALID)
+        self.assertIs(pickle.loads(pickle.dumps(rule))(u"ABC"), INVALID)
@@ -0,0 +1,44 @@
+from __future__ import absolute_import
+
+import pickle
+import unittest
+
+from request_validator.errors import ErrorDetail
+from request_validator.fields import CharField, DateField, IntField, RegexField
+from request_validator.serializers import Serializer
+
+from .schemas import BAD_ITEM, GOOD_ITEM, ItemSerializer, OrderSerializer, outcome
+
+
+class SlotsTest(unittest.TestCase):
+    def test_no_instance_dict(self):
+        fields = [IntField(min_value=1, choices=[1, 2]), CharField(max_length=3, many=True),
+                  DateField(format="%Y"), RegexField(r"\d+$")]
+        for field in fields:
+            self.assertFalse(hasattr(field, "__dict__"), field)
+            for rule in field._rules:
+                self.assertFalse(hasattr(rule, "__dict__"), rule)
+        self.assertFalse(hasattr(ErrorDetail("required", "This field is required"), "__dict__"))
+        self.assertFalse(hasattr(Serializer(data={}), "__dict__"))
+        self.assertFalse(hasattr(Serializer(data=[], many=True), "__dict__"))
+
+    def test_pickle_every_protocol(self):
+        data = {"number": "1", "items": [GOOD_ITEM, BAD_ITEM, GOOD_ITEM, BAD_ITEM], "hooked": {"a": 13}}
+        serializer = OrderSerializer(data=data)
+        serializer.is_valid()
+        items = ItemSerializer(data=[GOOD_ITEM, BAD_ITEM, BAD_ITEM], many=True)
+        items.is_valid()
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            copy = pickle.loads(pickle.dumps(serializer, protocol))
+            self.assertEqual(outcome(copy), outcome(serializer), protocol)
+
+            copy = pickle.loads(pickle.dumps(items, protocol))
+            self.assertEqual(outcome(copy), outcome(items), protocol)
+            self.assertEqual(copy._errors.indices, [1, 2])
+
+            detail = pickle.loads(pickle.dumps(ErrorDetail("max_value", "too big", value=3).at(("a", 1)), protocol))
+            self.assertEqual((detail.code, detail.message, detail.path), ("max_value", "too big", ("a", 1)))
+
+            field = pickle.loads(pickle.dumps(IntField(min_value=2, source="x"), protocol))
+            self.assertEqual(field._source, "x")
+            self.assertEqual(field.collect_errors(1), ["This field must be smaller than 2"])
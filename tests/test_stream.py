@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+import io
+import json
+import random
+import unittest
+
+import six
+
+from request_validator.fields import IntField, ListField
+from request_validator.serializers import Serializer
+from request_validator.stream import ItemTooLarge, iter_array
+
+
+class ElementSerializer(Serializer):
+    id = IntField(required=True)
+    tags = ListField(default=[])
+
+
+class CountingReader(io.BytesIO):
+    def __init__(self, data):
+        super(CountingReader, self).__init__(data)
+        self.consumed = 0
+
+    def read(self, size=-1):
+        chunk = super(CountingReader, self).read(size)
+        self.consumed += len(chunk)
+        return chunk
+
+
+def random_value(rnd, depth=0):
+    choice = rnd.randint(0, 7 if depth < 3 else 4)
+    if choice == 0:
+        return rnd.randint(-10 ** 20, 10 ** 20)
+    if choice == 1:
+        return rnd.random() * 1e10
+    if choice == 2:
+        return u"".join(rnd.choice(u"ab\"\\é中\U0001f600 ,]") for _ in range(rnd.randint(0, 9)))
+    if choice == 3:
+        return rnd.choice([True, False, None])
+    if choice == 4:
+        return 12345678
+    if choice in (5, 6):
+        return [random_value(rnd, depth + 1) for _ in range(rnd.randint(0, 4))]
+    return dict((u"k{}".format(index), random_value(rnd, depth + 1)) for index in range(rnd.randint(0, 4)))
+
+
+def dumps(value, **kwargs):
+    text = json.dumps(value, **kwargs)
+    return text.decode("utf-8") if isinstance(text, bytes) else six.text_type(text)
+
+
+class IterArrayTest(unittest.TestCase):
+    def test_round_trip(self):
+        rnd = random.Random(1)
+        for _ in range(100):
+            document = [random_value(rnd) for _ in range(rnd.randint(0, 30))]
+            text = dumps(document, ensure_ascii=rnd.random() < .5, indent=rnd.choice([None, 1]))
+            for chunk_size in (1, 2, 3, 7, 64, 100000):
+                self.assertEqual(list(iter_array(io.BytesIO(text.encode("utf-8")), chunk_size)), document)
+                self.assertEqual(list(iter_array(io.StringIO(text), chunk_size)), document)
+
+    def test_invalid_documents(self):
+        for text in (u"", u"[", u"[1,", u"[1 2]", u"{}", u"[1]x", u"[1,]", u"[tru]", u"[1, x]", u'["ab'):
+            for chunk_size in (1, 2, 64):
+                with self.assertRaises(ValueError):
+                    list(iter_array(io.StringIO(text), chunk_size))
+
+    def test_syntax_errors_are_raised_when_read(self):
+        stream = CountingReader(b"[1, {\"a\": x}, " + b"1, " * 100000 + b"1]")
+        with self.assertRaises(ValueError):
+            list(iter_array(stream, 64))
+        self.assertLess(stream.consumed, 1024)
+
+    def test_elements_over_the_limit(self):
+        text = dumps([1, u"x" * 1000, 2])
+        with self.assertRaises(ItemTooLarge) as raised:
+            list(iter_array(io.StringIO(text), 16, max_item_size=500))
+        self.assertEqual(raised.exception.index, 1)
+        self.assertEqual(raised.exception.limit, 500)
+        self.assertEqual(list(iter_array(io.StringIO(text), 16, max_item_size=2000)), [1, u"x" * 1000, 2])
+
+    def test_large_elements_in_small_chunks(self):
+        element = {u"text": u"é" * (2 * 1024 * 1024)}
+        stream = io.BytesIO(dumps([element, 1], ensure_ascii=False).encode("utf-8"))
+        self.assertEqual(list(iter_array(stream, 1024)), [element, 1])
+
+
+class IterValidateTest(unittest.TestCase):
+    def test_elements_match_a_list(self):
+        text = dumps([{"id": 1}, {"id": "x"}, {}, {"id": 3, "tags": [1]}, None])
+        data = json.loads(text)
+        expected = ElementSerializer(data=data, many=True)
+        expected.is_valid()
+        rows = list(ElementSerializer.iter_validate(io.BytesIO(text.encode("utf-8")), 3))
+        self.assertEqual([row[0] for row in rows], list(range(len(data))))
+        self.assertEqual([row[1] for row in rows if row[1]], expected.validate_data())
+        self.assertEqual([row[2] for row in rows if row[2]], list(expected.errors))
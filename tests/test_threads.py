@@ -0,0 +1,45 @@
+from __future__ import absolute_import
+
+import threading
+import unittest
+
+from .schemas import BAD_ITEM, GOOD_ITEM, SHORT_ITEM, OrderSerializer, outcome
+
+
+class SharedSchemaTest(unittest.TestCase):
+    def test_threads_share_one_schema(self):
+        payloads = [{"number": "1", "items": [item] * 3} for item in (GOOD_ITEM, BAD_ITEM, SHORT_ITEM)]
+        expected = []
+        for payload in payloads:
+            serializer = OrderSerializer(data=payload)
+            serializer.is_valid()
+            expected.append(outcome(serializer))
+        failures = []
+
+        def work(offset):
+            for index in range(300):
+                position = (index + offset) % len(payloads)
+                serializer = OrderSerializer(data=payloads[position])
+                serializer.is_valid()
+                if outcome(serializer) != expected[position]:
+                    failures.append(position)
+
+        threads = [threading.Thread(target=work, args=(offset,)) for offset in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(failures, [])
+
+    def test_mutable_defaults_are_not_shared(self):
+        first = OrderSerializer(data={"number": "1", "items": []})
+        first.is_valid()
+        first.data["tags"].append("x")
+        second = OrderSerializer(data={"number": "1", "items": []})
+        second.is_valid()
+        self.assertEqual(second.data["tags"], [])
+        self.assertEqual(OrderSerializer.fields()["tags"]._default, [])
+
+    def test_fields_are_resolved_with_the_class(self):
+        self.assertIn("_fields_dict", OrderSerializer.__dict__)
+        self.assertIs(OrderSerializer.fields(), OrderSerializer.fields())
@@ -0,0 +1,120 @@
+from __future__ import absolute_import
+
+import unittest
+
+from request_validator.fields import CharField, IntField, OneOfField
+from request_validator.observe import StatsCollector
+from request_validator.serializers import Serializer, SerializerMetaclass
+
+
+class ClickSerializer(Serializer):
+    type = CharField(required=True)
+    x = IntField(required=True)
+    y = IntField(required=False, default=0)
+
+
+class KeySerializer(Serializer):
+    type = CharField(required=True)
+    key = CharField(required=True, max_length=1)
+
+
+class CountedSerializer(Serializer):
+    n = IntField(required=True, max_value=3)
+    calls = 0
+
+    def validate(self, attr):
+        CountedSerializer.calls += 1
+        return attr
+
+
+def event_batch(backend):
+    """A new serializer class, so the counts of its fields start at zero."""
+    choices = {"click": ClickSerializer, "key": KeySerializer}
+    return SerializerMetaclass("EventBatchSerializer", (Serializer,), dict(
+        id=IntField(required=True),
+        event=OneOfField(choices, discriminator="type", required=False),
+        events=OneOfField(choices, discriminator="type", many=True, required=False),
+        any=OneOfField([KeySerializer, ClickSerializer], required=False, allow_null=False),
+        Meta=type("Meta", (object,), {"backend": backend})))
+
+
+GOOD = {"id": 1, "event": {"type": "click", "x": 1}, "events": [{"type": "key", "key": "a"}, {"type": "click", "x": 2}],
+        "any": {"type": "q", "x": 5}}
+BAD = {"id": 1, "event": {"type": "nope"}, "events": [{"type": "key", "key": "ab"}, {"x": 2}, 5], "any": {"type": "q"}}
+DOCUMENTS = [GOOD, BAD, {"id": 1, "event": None, "events": None, "any": None}, {"id": 1, "events": "x", "event": [1]}]
+
+
+def results(serializer_class):
+    found = []
+    for document in DOCUMENTS:
+        for options in ({}, {"fail_fast": True}, {"partial": True}, {"observer": StatsCollector()}):
+            serializer = serializer_class(data=document)
+            found.append((serializer.is_valid(**options), serializer.errors, serializer.data,
+                          [detail.as_dict() for detail in serializer.error_details()]))
+        serializer = serializer_class(data=document)
+        found.append((serializer.revalidate(), serializer.errors, serializer.data))
+        serializer = serializer_class(data=[document] * 3, many=True)
+        found.append((serializer.is_valid(), serializer.errors, serializer.data))
+    return found
+
+
+class OneOfFieldTest(unittest.TestCase):
+    def test_plan_and_codegen_agree(self):
+        plan, generated = event_batch("plan"), event_batch("codegen")
+        self.assertEqual(results(plan), results(generated))
+        for name in ("event", "events", "any"):
+            self.assertEqual(plan.fields()[name].counts(), generated.fields()[name].counts())
+
+    def test_dispatch(self):
+        serializer_class = event_batch("plan")
+        serializer = serializer_class(data=GOOD)
+        self.assertTrue(serializer.is_valid())
+        self.assertEqual(serializer.data["events"], [{"type": "key", "key": "a"}, {"type": "click", "x": 2, "y": 0}])
+        self.assertEqual(serializer.data["any"], {"type": "q", "x": 5, "y": 0})
+
+        serializer = serializer_class(data=BAD)
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(serializer.errors, {
+            "event": {"type": ['"nope" is not a known type']},
+            "events": [{"key": ["This field must be larger than 1 characters"]}, {"type": ["This field is required"]},
+                       ["This field must be object but get int"]],
+            "any": ["This field matches none of (KeySerializer,ClickSerializer)"]})
+        self.assertEqual([detail.path for detail in serializer.error_details()
+                          if detail.path[0] == "events"], [("events", 0, "key"), ("events", 1, "type"), ("events", 2)])
+
+    def test_counts(self):
+        serializer_class = event_batch("codegen")
+        for document in (GOOD, BAD):
+            serializer_class(data=document).is_valid()
+        fields = serializer_class.fields()
+        self.assertEqual(fields["event"].counts(), {"choices": {"click": 1, "key": 0}, "unmatched": 1})
+        self.assertEqual(fields["events"].counts(), {"choices": {"click": 1, "key": 2}, "unmatched": 2})
+        self.assertEqual(fields["any"].counts(),
+                         {"choices": {"KeySerializer": 0, "ClickSerializer": 1}, "unmatched": 1})
+        fields["any"].reset_counts()
+        self.assertEqual(fields["any"].counts()["unmatched"], 0)
+
+    def test_invalid_values_are_validated_once(self):
+        for backend in ("plan", "codegen"):
+            serializer_class = SerializerMetaclass("CountedBatchSerializer", (Serializer,), dict(
+                one=OneOfField({"n": CountedSerializer}, discriminator="kind", required=False),
+                many=OneOfField({"n": CountedSerializer}, discriminator="kind", many=True, required=False),
+                untagged=OneOfField([CountedSerializer], required=False),
+                Meta=type("Meta", (object,), {"backend": backend})))
+            data = {"one": {"kind": "n", "n": 9}, "many": [{"kind": "n", "n": 9}, {"kind": "n", "n": 1}],
+                    "untagged": {"n": "x"}}
+            for options in ({}, {"fail_fast": True}, {"observer": StatsCollector()}):
+                CountedSerializer.calls = 0
+                serializer = serializer_class(data=data)
+                self.assertFalse(serializer.is_valid(**options))
+                self.assertEqual(CountedSerializer.calls, 1 if options.get("fail_fast") else 4, options)
+            self.assertEqual(serializer.errors, {
+                "one": {"n": ["This field must be larger than 3"]},
+                "many": [{"n": ["This field must be larger than 3"]}],
+                "untagged": ["This field matches none of (CountedSerializer)"]})
+            self.assertEqual(sorted(detail.path for detail in serializer.error_details()),
+                             [("many", 0, "n"), ("one", "n"), ("untagged",)])
+
+    def test_choices(self):
+        self.assertRaises(AssertionError, OneOfField, {"a": KeySerializer})
+        self.assertRaises(AssertionError, OneOfField, [KeySerializer], discriminator="type")